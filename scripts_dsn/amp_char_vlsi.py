@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import os
+import asyncio
 
 import yaml
 import numpy as np
 import scipy.interpolate as interp
-import scipy.optimize as sciopt
 import matplotlib.pyplot as plt
 # noinspection PyUnresolvedReferences
 from mpl_toolkits.mplot3d import Axes3D
@@ -13,9 +13,10 @@ from matplotlib import cm, rc
 from matplotlib import ticker
 
 from bag.core import BagProject
-from bag.io.sim_data import load_sim_results, save_sim_results, load_sim_file
+from bag.io.sim_data import load_sim_results, save_sim_results
 
 from serdes_ec.layout.analog.amplifier import DiffAmp
+from serdes_ec.simulation.store import open_sim_file, save_sim_file, get_index_fname
 
 
 def gen_lay_sch(prj, specs, fg_load_list):
@@ -49,40 +50,48 @@ def gen_lay_sch(prj, specs, fg_load_list):
     return name_list
 
 
-def simulate(prj, name_list, sim_params):
-    impl_lib = sim_params['impl_lib']
-    save_root = sim_params['save_root']
-    tb_lib = sim_params['tb_lib']
-    tb_cell = sim_params['tb_cell']
-    env_list = sim_params['env_list']
-    vload_list = sim_params['vload_list']
-    sim_view = sim_params['sim_view']
-    params = sim_params['params']
+# pipeline stages, in order.
+STAGES = ('lvs', 'rcx', 'tb', 'sim')
+
+
+class BagRunner(object):
+    """Runs the characterization pipeline stages with BAG.
 
-    for name in name_list:
-        print('DUT: ', name)
-        dut_cell = name
-        impl_cell = name + '_TB'
-        save_fname = os.path.join(save_root, '%s.hdf5' % name)
+    LVS, RCX and simulation run asynchronously.  Testbench creation talks to the
+    layout/schematic database and is serialized by the pipeline.
+    """
 
-        print('run lvs')
-        lvs_passed, lvs_log = prj.run_lvs(impl_lib, dut_cell)
+    def __init__(self, prj, sim_params):
+        self._prj = prj
+        self._sim_params = sim_params
+
+    async def run_lvs(self, lib_name, dut_cell, impl_cell, save_fname):
+        lvs_passed, lvs_log = await self._prj.async_run_lvs(lib_name, dut_cell)
         if not lvs_passed:
-            raise ValueError('LVS failed...')
-        print('run rcx')
-        rcx_passed, rcx_log = prj.run_rcx(impl_lib, dut_cell)
+            raise ValueError('LVS failed, log file: %s' % lvs_log)
+
+    async def run_rcx(self, lib_name, dut_cell, impl_cell, save_fname):
+        rcx_passed, rcx_log = await self._prj.async_run_rcx(lib_name, dut_cell)
         if not rcx_passed:
-            raise ValueError('RCX failed...')
+            raise ValueError('RCX failed, log file: %s' % rcx_log)
+
+    async def run_tb(self, lib_name, dut_cell, impl_cell, save_fname):
+        tb_lib = self._sim_params['tb_lib']
+        tb_cell = self._sim_params['tb_cell']
+
+        dsn = self._prj.create_design_module(tb_lib, tb_cell)
+        dsn.design(dut_lib=lib_name, dut_cell=dut_cell)
+        dsn.implement_design(lib_name, top_cell_name=impl_cell)
 
-        print('make tb')
-        dsn = prj.create_design_module(tb_lib, tb_cell)
-        dsn.design(dut_lib=impl_lib, dut_cell=dut_cell)
-        dsn.implement_design(impl_lib, top_cell_name=impl_cell)
+    async def run_sim(self, lib_name, dut_cell, impl_cell, save_fname):
+        env_list = self._sim_params['env_list']
+        vload_list = self._sim_params['vload_list']
+        sim_view = self._sim_params['sim_view']
+        params = self._sim_params['params']
 
-        print('update testbench')
-        tb = prj.configure_testbench(impl_lib, impl_cell)
+        tb = self._prj.configure_testbench(lib_name, impl_cell)
         tb.set_simulation_environments(env_list)
-        tb.set_simulation_view(impl_lib, dut_cell, sim_view)
+        tb.set_simulation_view(lib_name, dut_cell, sim_view)
 
         for key, val in params.items():
             tb.set_parameter(key, val)
@@ -90,37 +99,213 @@ def simulate(prj, name_list, sim_params):
         tb.add_output('outac', """getData("/outac", ?result 'ac)""")
 
         tb.update_testbench()
-        print('run simulation')
-        save_dir = tb.run_simulation()
-        print('load data')
+        save_dir = await tb.async_run_simulation()
         data = load_sim_results(save_dir)
-        print('save_data')
-        save_sim_results(data, save_fname)
+        if self._sim_params.get('compressed', True):
+            save_sim_file(data, save_fname)
+        else:
+            save_sim_results(data, save_fname)
+
+
+class CommandRunner(object):
+    """Runs the characterization pipeline stages with local shell commands.
+
+    This is used to test the pipeline without the CAD tools.  Each command is a format
+    string that can use lib_name, dut_cell, impl_cell, and save_fname; a stage passes if
+    its command returns 0.  The simulation command must write save_fname, which is a
+    temporary file that is renamed when the DUT finishes.
+
+    Parameters
+    ----------
+    cmd_table : Dict[str, str]
+        dictionary from stage name to command.  Missing stages are skipped.
+    """
+
+    def __init__(self, cmd_table):
+        self._cmd_table = cmd_table
+
+    async def _run_cmd(self, stage, **kwargs):
+        cmd = self._cmd_table.get(stage, None)
+        if cmd is None:
+            return
+        proc = await asyncio.create_subprocess_shell(cmd.format(**kwargs),
+                                                     stdout=asyncio.subprocess.PIPE,
+                                                     stderr=asyncio.subprocess.STDOUT)
+        output, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise ValueError('%s command failed with return code %d:\n%s' %
+                             (stage, proc.returncode, output.decode()))
+
+    async def run_lvs(self, lib_name, dut_cell, impl_cell, save_fname):
+        await self._run_cmd('lvs', lib_name=lib_name, dut_cell=dut_cell, impl_cell=impl_cell,
+                            save_fname=save_fname)
+
+    async def run_rcx(self, lib_name, dut_cell, impl_cell, save_fname):
+        await self._run_cmd('rcx', lib_name=lib_name, dut_cell=dut_cell, impl_cell=impl_cell,
+                            save_fname=save_fname)
+
+    async def run_tb(self, lib_name, dut_cell, impl_cell, save_fname):
+        await self._run_cmd('tb', lib_name=lib_name, dut_cell=dut_cell, impl_cell=impl_cell,
+                            save_fname=save_fname)
+
+    async def run_sim(self, lib_name, dut_cell, impl_cell, save_fname):
+        await self._run_cmd('sim', lib_name=lib_name, dut_cell=dut_cell, impl_cell=impl_cell,
+                            save_fname=save_fname)
+
+
+def _read_journal(fname):
+    if os.path.isfile(fname):
+        with open(fname, 'r') as f:
+            journal = yaml.load(f)
+        if journal:
+            return journal
+    return dict(done=[], error=None)
+
+
+def _write_journal(fname, journal):
+    with open(fname, 'w') as f:
+        yaml.dump(journal, f, default_flow_style=False)
+
+
+async def _run_dut(runner, impl_lib, save_root, name, sem_table):
+    dut_cell = name
+    impl_cell = name + '_TB'
+    save_fname = os.path.join(save_root, '%s.hdf5' % name)
+    # simulation results are written to a temporary file, and renamed when complete, so
+    # a partial file left by a crash is never mistaken for finished results.
+    tmp_fname = save_fname + '.part'
+    journal_fname = os.path.join(save_root, '%s.journal.yaml' % name)
+
+    if os.path.isfile(save_fname):
+        print('%s: results exist, skipping.' % name)
+        return
+
+    journal = _read_journal(journal_fname)
+    done = journal['done']
+    for stage in STAGES:
+        if stage in done:
+            continue
+        async with sem_table[stage]:
+            print('%s: run %s' % (name, stage))
+            try:
+                await getattr(runner, 'run_' + stage)(impl_lib, dut_cell, impl_cell, tmp_fname)
+            except Exception as ex:
+                journal['error'] = '%s: %s' % (stage, ex)
+                _write_journal(journal_fname, journal)
+                raise
+        done.append(stage)
+        journal['error'] = None
+        _write_journal(journal_fname, journal)
+
+    if not os.path.isfile(tmp_fname):
+        raise ValueError('%s: simulation finished but %s is not found.' % (name, tmp_fname))
+    # move the sidecar index first, so the final result file always comes with its index.
+    tmp_index_fname = get_index_fname(tmp_fname)
+    if os.path.isfile(tmp_index_fname):
+        os.replace(tmp_index_fname, get_index_fname(save_fname))
+    os.replace(tmp_fname, save_fname)
+    print('%s: done' % name)
+
+
+async def _run_pipeline(runner, name_list, impl_lib, save_root, max_jobs):
+    sem_table = {stage: asyncio.Semaphore(max_jobs[stage]) for stage in STAGES}
+    coro_list = [_run_dut(runner, impl_lib, save_root, name, sem_table) for name in name_list]
+    return await asyncio.gather(*coro_list, return_exceptions=True)
+
+
+def simulate(prj, name_list, sim_params, runner=None):
+    """Run LVS, RCX, and simulation on all DUTs concurrently.
+
+    Each DUT goes through the pipeline stages independently, and the number of concurrent
+    jobs of each stage is bounded by sim_params['max_jobs'].  The completed stages of
+    each DUT are recorded in a journal file next to its HDF5 file, so a rerun skips DUTs
+    with existing results and resumes other DUTs at the failed stage.  A failed DUT does
+    not stop other DUTs.
+
+    Returns
+    -------
+    err_table : Dict[str, Exception]
+        dictionary from failed DUT names to their errors.
+    """
+    impl_lib = sim_params['impl_lib']
+    save_root = sim_params['save_root']
+    max_jobs = dict(lvs=4, rcx=4, tb=1, sim=4)
+    max_jobs.update(sim_params.get('max_jobs', {}))
+    if runner is None:
+        runner = BagRunner(prj, sim_params)
+
+    os.makedirs(save_root, exist_ok=True)
+    results = asyncio.run(_run_pipeline(runner, name_list, impl_lib, save_root, max_jobs))
+
+    err_table = {name: ex for name, ex in zip(name_list, results) if isinstance(ex, Exception)}
+    for name, ex in err_table.items():
+        print('%s failed: %s' % (name, ex))
+    print('%d of %d DUTs finished.' % (len(name_list) - len(err_table), len(name_list)))
+    return err_table
 
 
 def compute_gain_and_w3db(f_vec, out_arr):
-    out_arr = np.abs(out_arr)
-    gain = out_arr[0]
+    gain, f3db, _, _ = compute_ac_metrics(f_vec, out_arr)
+    return float(gain), float(f3db)
+
+
+def compute_ac_metrics(f_vec, out_arr):
+    """Compute AC metrics of many amplifier transfer functions at once.
+
+    Crossing frequencies are found by locating the first frequency point below the
+    threshold in every trace, then interpolating linearly in dB versus log frequency
+    between that point and the previous one.
+
+    Parameters
+    ----------
+    f_vec : np.ndarray
+        the frequency vector.
+    out_arr : np.ndarray
+        the complex output array.  The last axis corresponds to f_vec, all other axes
+        (for example, corner and vload) are batch dimensions.
+
+    Returns
+    -------
+    gain : np.ndarray
+        the DC gain magnitude.
+    f3db : np.ndarray
+        the -3dB frequency.  Equal to the last frequency if the gain never drops by 3dB.
+    fugf : np.ndarray
+        the unity gain frequency.  NaN if the gain never crosses 1.
+    peaking : np.ndarray
+        the peak gain above the DC gain, in dB.
+    """
+    out_abs = np.abs(out_arr)
+    gain = out_abs[..., 0]
 
     # convert
-    out_log = 20 * np.log10(out_arr)
-    gain_log_3db = 20 * np.log10(gain) - 3
-
-    # find first index at which gain goes below gain_log 3db
-    diff_arr = out_log - gain_log_3db
-    idx_arr = np.argmax(diff_arr < 0)
+    out_log = 20 * np.log10(out_abs)
+    gain_log = out_log[..., 0]
     freq_log = np.log10(f_vec)
-    freq_log_max = freq_log[idx_arr]
 
-    fun = interp.interp1d(freq_log, diff_arr, kind='cubic', copy=False,
-                          assume_sorted=True)
-    try:
-        # noinspection PyTypeChecker
-        f3db = 10.0**(sciopt.brentq(fun, freq_log[0], freq_log_max))
-    except ValueError:
-        f3db = f_vec[-1]
+    f3db = _get_first_crossing(freq_log, out_log - (gain_log - 3)[..., np.newaxis])
+    f3db = np.where(np.isnan(f3db), f_vec[-1], f3db)
+    fugf = _get_first_crossing(freq_log, out_log)
+    fugf[gain_log <= 0] = np.nan
+    peaking = np.amax(out_log, axis=-1) - gain_log
+    return gain, f3db, fugf, peaking
+
 
-    return gain, f3db
+def _get_first_crossing(freq_log, diff_arr):
+    """Returns the frequency at which diff_arr first goes below 0, or NaN if not found."""
+    # find first index at which diff_arr goes below 0
+    below = diff_arr < 0
+    idx1 = np.argmax(below, axis=-1)[..., np.newaxis]
+    idx0 = np.maximum(idx1 - 1, 0)
+    found = np.take_along_axis(below, idx1, axis=-1)[..., 0] & (idx1[..., 0] > 0)
+
+    y0 = np.take_along_axis(diff_arr, idx0, axis=-1)[..., 0]
+    y1 = np.take_along_axis(diff_arr, idx1, axis=-1)[..., 0]
+    x0 = freq_log[idx0[..., 0]]
+    x1 = freq_log[idx1[..., 0]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x0 + (x1 - x0) * y0 / (y0 - y1)
+    return np.where(found, 10.0**x_cross, np.nan)
 
 
 def plot_mat(fig_idx, zlabel, mat, xvec, yvec):
@@ -157,20 +342,13 @@ def plot_gain_bw(specs, sim_params, fg_load_list, env):
     bw_mat = np.empty((len(fg_load_list), len(vload_list)))
     for fg_idx, fg_load in enumerate(fg_load_list):
         fname = os.path.join(save_root, '%s_fg%d.hdf5' % (base_name, fg_load))
-        results = load_sim_file(fname)
-
-        swp_pars = results['sweep_params'][vname]
-        corners = results['corner']
-        corner_idx = swp_pars.index('corner')
-        env_idx = np.argwhere(corners == env)[0][0]
-        data = np.take(results[vname], env_idx, axis=corner_idx)
-        vload_idx = swp_pars.index('vload')
-        vload_vec = results['vload']
-        for idx in range(vload_vec.size):
-            outac = np.take(data, idx, axis=vload_idx)
-            gain, f3db = compute_gain_and_w3db(results['freq'], outac)
-            gain_mat[fg_idx, idx] = gain
-            bw_mat[fg_idx, idx] = f3db
+        results = open_sim_file(fname)
+
+        # only read the given corner
+        data, swp_pars = results.get_slice(vname, corner=env)
+        # move frequency to the last axis and vload to the first axis
+        data = np.moveaxis(data, [swp_pars.index('vload'), swp_pars.index('freq')], [0, -1])
+        gain_mat[fg_idx, :], bw_mat[fg_idx, :], _, _ = compute_ac_metrics(results['freq'], data)
 
     plot_mat(1, '$A_v$ (V/V)', gain_mat, fg_load_list, vload_list)
     plot_mat(2, '$f_{3db}$ (Hz)', bw_mat, fg_load_list, vload_list)
@@ -194,6 +372,8 @@ def run_main(prj):
         env_list=['tt', 'ff_hot', 'ss_cold'],
         vload_list=np.linspace(0.15, 0.45, 13, endpoint=True).tolist(),
         sim_view='av_extracted',
+        max_jobs=dict(lvs=4, rcx=4, tb=1, sim=4),
+        compressed=True,
         params=dict(
             vincm=0.78,
             vdd=0.9,
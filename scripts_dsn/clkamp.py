@@ -14,11 +14,29 @@ def characterize_linearity(prj):
     sim.create_designs(tb_type='tb_pss_dc', extract=False)
 
 
-def load_sim_data(prj, tb_type):
+def characterize_linearity_adaptive(prj, max_iter=10):
+    specs_fname = 'specs_design/clkamp.yaml'
+
+    sim = ClkAmpChar(prj, specs_fname)
+    sim.setup_linearity()
+    sim.setup_adaptive()
+
+    for _ in range(max_iter):
+        sim.create_designs(tb_type='tb_pss_dc', extract=False)
+        sim.run_simulations('tb_pss_dc')
+        if sim.refine_adaptive() == 0:
+            break
+
+    return sim.get_adaptive_interpolator('gain')
+
+
+def load_sim_data(prj, tb_type, lazy=False):
     specs_fname = 'data/clkamp/specs.yaml'
 
     sim = ClkAmpChar(prj, specs_fname)
     combo_list_list = list(sim.get_combinations_iter())
+    if lazy:
+        return sim.get_sim_results_lazy(tb_type, combo_list_list[0])
     return sim.get_sim_results(tb_type, combo_list_list[0])
 
 
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+import math
 
 import numpy as np
 import scipy.interpolate as interp
@@ -13,23 +13,18 @@ from matplotlib import cm
 from matplotlib import ticker
 
 from bag.core import BagProject
-from bag.util.search import FloatBinaryIterator
-from bag.io.sim_data import load_sim_results, save_sim_results, load_sim_file
+from bag.io.sim_data import load_sim_results, save_sim_results
+
+from serdes_ec.simulation.store import open_sim_file, save_sim_file
 
 
 def plot_vstar(result, tper, vdd, cload, bias_vec, ck_amp, rel_err, dc_params, vstar_params):
-    npts = bias_vec.size
-    vstar_vec = np.empty(npts)
-    gain_vec = np.empty(npts)
-    offset_vec = np.empty(npts)
-    voutcm_vec = np.empty(npts)
-    for idx, ck_bias in enumerate(bias_vec):
-        in_vec, out_vec, cm_vec = get_dc_tf(result, tper, ck_amp, ck_bias, **dc_params)
-        vstar, err, gain, offset = get_vstar(in_vec, out_vec, rel_err, **vstar_params)
-        voutcm_vec[idx] = vdd - (cm_vec[cm_vec.size // 2] / cload)
-        vstar_vec[idx] = vstar
-        gain_vec[idx] = gain / cload
-        offset_vec[idx] = offset / cload
+    in_vec, out_mat, cm_mat = get_dc_tf_batch(result, tper, ck_amp, bias_vec, **dc_params)
+    voutcm_vec = vdd - (cm_mat[:, cm_mat.shape[1] // 2] / cload)
+
+    vstar_vec, _, gain_vec, offset_vec = get_vstar_batch(in_vec, out_mat, rel_err, **vstar_params)
+    gain_vec /= cload
+    offset_vec /= cload
 
     bias_vec *= 1e3
     vstar_vec *= 1e3
@@ -54,44 +49,114 @@ def plot_vstar(result, tper, vdd, cload, bias_vec, ck_amp, rel_err, dc_params, v
 
 
 def get_vstar(in_vec, out_vec, rel_err, tol=1e-3, num=21, method='cubic'):
-    fun = interp.interp1d(in_vec, out_vec, kind=method, copy=False, fill_value='extrapolate',
-                          assume_sorted=True)
+    vstar, err, gain, offset = get_vstar_batch(in_vec, out_vec, rel_err, tol=tol, num=num,
+                                               method=method)
+    return float(vstar), float(err), float(gain), float(offset)
+
+
+def get_vstar_batch(in_vec, out_arr, rel_err, tol=1e-3, num=21, method='cubic'):
+    """Compute V* of many transfer curves sharing the same input vector.
+
+    V* is the largest input amplitude such that the maximum deviation from the
+    least-squares line fit over [-V*, V*] is within rel_err of the output swing.  For
+    every curve, V* is found by bisection between the first positive input and the
+    maximum input, with the same steps as FloatBinaryIterator.  All curves are bisected
+    at once; the line fit uses the closed-form least-squares solution, since the fit
+    points are symmetric around zero.
+
+    Parameters
+    ----------
+    in_vec : np.ndarray
+        the input vector, sorted and symmetric around zero.
+    out_arr : np.ndarray
+        the output array.  The last axis corresponds to in_vec, all other axes
+        (for example, corners and bias points) are batch dimensions.
+    rel_err : float
+        the maximum relative error.
+    tol : float
+        the bisection tolerance.
+    num : int
+        number of fit points.
+    method : str
+        the interpolation method, one of 'linear', 'quadratic', or 'cubic'.
+
+    Returns
+    -------
+    vstar : np.ndarray
+        the V* array.  NaN if no valid V* is found.
+    err : np.ndarray
+        the relative error at V*.
+    gain : np.ndarray
+        the line fit slope at V*.
+    offset : np.ndarray
+        the line fit offset at V*.
+    """
+    spline_order = {'linear': 1, 'quadratic': 2, 'cubic': 3}.get(method, None)
+    if spline_order is None:
+        raise ValueError('Unsupported interpolation method: %s' % method)
+
+    out_arr = np.asarray(out_arr, dtype=float)
+    batch_shape = out_arr.shape[:-1]
+    out_mat = out_arr.reshape(-1, in_vec.size)
+    nbatch = out_mat.shape[0]
+
+    # piecewise polynomial coefficients of all curves on each input interval, computed
+    # from the same spline interp1d uses.
+    spl = interp.make_interp_spline(in_vec, out_mat.T, k=spline_order, axis=0)
+    bp = np.union1d(in_vec, spl.t[spline_order:spl.t.size - spline_order])
+    coeffs = np.stack([spl(bp[:-1], nu=spline_order - idx) / math.factorial(spline_order - idx)
+                       for idx in range(spline_order + 1)])  # shape: (k + 1, nintv, nbatch)
+    batch_idx = np.arange(nbatch)[:, np.newaxis]
+
     mid_idx = in_vec.size // 2
     vmin = in_vec[mid_idx + 1]
     vmax = in_vec[-1]
 
-    bin_iter = FloatBinaryIterator(vmin, vmax, tol=tol)
-    while bin_iter.has_next():
-        vtest = bin_iter.get_next()
-
-        x_vec = np.linspace(-vtest, vtest, num, endpoint=True)
-        b_vec = fun(x_vec)
-        a_mat = np.column_stack((x_vec, np.ones(num)))
-        x, _, _, _ = np.linalg.lstsq(a_mat, b_vec)
-        rel_err_cur = np.amax(np.abs(np.dot(a_mat, x) - b_vec)) / (x[0] * vtest)
-
-        if rel_err_cur <= rel_err:
-            bin_iter.save_info((vtest, rel_err_cur, x[0], x[1]))
-            bin_iter.up()
-        else:
-            bin_iter.down()
-
-    return bin_iter.get_last_save_info()
+    # unit fit points: x_vec = vtest * u_vec
+    u_vec = np.linspace(-1, 1, num, endpoint=True)
+    u_sq_sum = np.sum(u_vec ** 2)
+
+    # bisection state, relative to vmin
+    low = np.zeros(nbatch)
+    high = np.full(nbatch, vmax - vmin)
+    cur = high / 2
+    vstar = np.full(nbatch, np.nan)
+    err = np.full(nbatch, np.nan)
+    gain = np.full(nbatch, np.nan)
+    offset = np.full(nbatch, np.nan)
+    while high[0] - low[0] > tol:
+        vtest = cur + vmin
+        x_mat = vtest[:, np.newaxis] * u_vec
+        # evaluate all curves at their own fit points
+        intv_idx = np.clip(np.searchsorted(bp, x_mat, side='right') - 1, 0, bp.size - 2)
+        dx = x_mat - bp[intv_idx]
+        b_mat = np.zeros(x_mat.shape)
+        for cidx in range(coeffs.shape[0]):
+            b_mat = b_mat * dx + coeffs[cidx, intv_idx, batch_idx]
+
+        # closed-form least-squares line fit
+        slope = np.sum(x_mat * b_mat, axis=1) / (u_sq_sum * vtest ** 2)
+        inter = np.mean(b_mat, axis=1)
+        res = np.amax(np.abs(slope[:, np.newaxis] * x_mat + inter[:, np.newaxis] - b_mat),
+                      axis=1)
+        rel_err_cur = res / (slope * vtest)
+
+        good = rel_err_cur <= rel_err
+        vstar[good] = vtest[good]
+        err[good] = rel_err_cur[good]
+        gain[good] = slope[good]
+        offset[good] = inter[good]
+        low = np.where(good, cur, low)
+        high = np.where(good, high, cur)
+        cur = (low + high) / 2
+
+    return (vstar.reshape(batch_shape), err.reshape(batch_shape),
+            gain.reshape(batch_shape), offset.reshape(batch_shape))
 
 
 def get_dc_tf(result, tper, ck_amp, ck_bias, num_k=7, sim_env='tt', method='linear', plot=False):
-    indm_vec = result['indm']
-
-    n = indm_vec.size
-    dm_vec = np.empty(n)
-    cm_vec = np.empty(n)
-    for idx, indm in enumerate(indm_vec):
-        ip_wv, in_wv, tstep = get_transient(result, idx, tper, ck_amp, ck_bias, num_k=num_k,
-                                            sim_env=sim_env, method=method, plot=False)
-        p_charge = integ.romb(ip_wv, dx=tstep)
-        n_charge = integ.romb(in_wv, dx=tstep)
-        dm_vec[idx] = n_charge - p_charge
-        cm_vec[idx] = (n_charge + p_charge) / 2
+    indm_vec, dm_vec, cm_vec = get_dc_tf_batch(result, tper, ck_amp, ck_bias, num_k=num_k,
+                                               sim_env=sim_env, method=method)
 
     if plot:
         vstar, _, gain, offset = get_vstar(indm_vec, dm_vec, 0.05)
@@ -112,26 +177,89 @@ def get_dc_tf(result, tper, ck_amp, ck_bias, num_k=7, sim_env='tt', method='line
     return indm_vec, dm_vec, cm_vec
 
 
-def get_transient(result, in_idx, tper, ck_amp, ck_bias, num_k=7, sim_env='tt', method='linear',
-                  plot=False):
-    ioutp = result['ioutp']  # type: np.ndarray
-    ioutn = result['ioutn']  # type: np.ndarray
-    swp_pars = result['sweep_params']['ioutp']  # type: List
+def get_dc_tf_batch(result, tper, ck_amp, ck_bias, num_k=7, sim_env='tt', method='linear'):
+    """Compute the output charge transfer functions of many clock waveforms at once.
+
+    The output currents over all (indm, bias) points are interpolated at the tail
+    waveforms of all clocks in one call, then integrated along the time axis with a
+    single romb call.
+
+    Parameters
+    ----------
+    result : Dict[str, Any]
+        the simulation result dictionary.
+    tper : Union[float, np.ndarray]
+        the clock period.
+    ck_amp : Union[float, np.ndarray]
+        the clock amplitude.
+    ck_bias : Union[float, np.ndarray]
+        the clock bias.
+    num_k : int
+        the waveform has 2 ** num_k + 1 samples.
+    sim_env : str
+        the simulation corner.
+    method : str
+        the current interpolation method.
+
+    Returns
+    -------
+    indm_vec : np.ndarray
+        the differential input vector.
+    dm_arr : np.ndarray
+        the differential output charge.  tper, ck_amp, and ck_bias are broadcasted
+        together, and the last axis corresponds to indm_vec.
+    cm_arr : np.ndarray
+        the common-mode output charge, same shape as dm_arr.
+    """
+    indm_vec = result['indm']
+    bias = result['bias']
+    ioutp, ioutn = _get_iout(result, sim_env)
 
+    tper, ck_amp, ck_bias = np.broadcast_arrays(tper, ck_amp, ck_bias)
+    if np.any(ck_bias - ck_amp < bias[0]) or np.any(ck_bias + ck_amp > bias[-1]):
+        print('WARNING: clock waveform exceed simulation range.')
+
+    # the tail waveform samples only depend on the clock phase, and the time step is
+    # proportional to the clock period.
+    num = 2 ** num_k + 1
+    phase = np.linspace(0, 2 * np.pi, num, endpoint=False)
+    tail_wv = np.maximum(bias[0], ck_bias[..., np.newaxis] -
+                         ck_amp[..., np.newaxis] * np.cos(phase))
+    tstep = tper / num
+
+    # interpolate both currents for all inputs in one shot.
+    fun = interp.interp1d(bias, np.stack((ioutp, ioutn)), kind=method, copy=False,
+                          fill_value='extrapolate', assume_sorted=True)
+    # shape: (2, num_indm) + clock shape + (num,)
+    iout_wv = fun(tail_wv)
+    # romb is linear in dx, so integrate with unit step and scale by tstep.
+    charge = np.moveaxis(integ.romb(iout_wv, dx=1.0, axis=-1), 1, -1) * tstep[..., np.newaxis]
+    p_charge, n_charge = charge[0], charge[1]
+    return indm_vec, n_charge - p_charge, (n_charge + p_charge) / 2
+
+
+def _get_iout(result, sim_env):
+    """Returns the output current matrices, with shape (num_indm, num_bias)."""
     if 'corner' in result:
-        corners = result['corner']
-        corner_idx = swp_pars.index('corner')
-        env_idx = np.argwhere(corners == sim_env)[0][0]
-        var0 = swp_pars[1] if corner_idx == 0 else swp_pars[0]
-        ioutp = np.take(ioutp, env_idx, axis=corner_idx)
-        ioutn = np.take(ioutn, env_idx, axis=corner_idx)
+        # only read the given corner
+        ioutp, swp_pars = result.get_slice('ioutp', corner=sim_env)
+        ioutn, _ = result.get_slice('ioutn', corner=sim_env)
     else:
-        var0 = swp_pars[0]
+        ioutp, swp_pars = result.get_slice('ioutp')
+        ioutn, _ = result.get_slice('ioutn')
+    var0 = swp_pars[0]
 
     if var0 != 'indm':
         ioutp = ioutp.transpose()
         ioutn = ioutn.transpose()
 
+    return ioutp, ioutn
+
+
+def get_transient(result, in_idx, tper, ck_amp, ck_bias, num_k=7, sim_env='tt', method='linear',
+                  plot=False):
+    ioutp, ioutn = _get_iout(result, sim_env)
+
     bias = result['bias']
     ioutp = ioutp[in_idx, :]
     ioutn = ioutn[in_idx, :]
@@ -167,16 +295,10 @@ def get_transient(result, in_idx, tper, ck_amp, ck_bias, num_k=7, sim_env='tt',
 def plot_data_2d(result, name, sim_env=None):
     """Get interpolation function and plot/query."""
 
-    swp_pars = result['sweep_params'][name]
-    data = result[name]
-
     if sim_env is not None:
-        corners = result['corner']
-        corner_idx = swp_pars.index('corner')
-        env_idx = np.argwhere(corners == sim_env)[0][0]
-        data = np.take(data, env_idx, axis=corner_idx)
-        swp_pars = swp_pars[:]
-        del swp_pars[corner_idx]
+        data, swp_pars = result.get_slice(name, corner=sim_env)
+    else:
+        data, swp_pars = result.get_slice(name)
 
     xvec = result[swp_pars[0]]
     yvec = result[swp_pars[1]]
@@ -199,7 +321,7 @@ def plot_data_2d(result, name, sim_env=None):
 
 
 def simulate(prj, save_fname, tb_lib, tb_cell, dut_lib, dut_cell, impl_lib, impl_cell, env_list,
-             sim_view):
+             sim_view, compressed=True):
     vck_amp = 0.4
     vdd = 0.9
     vstar_max = 0.3
@@ -238,7 +360,10 @@ def simulate(prj, save_fname, tb_lib, tb_cell, dut_lib, dut_cell, impl_lib, impl
     print('load data')
     data = load_sim_results(save_dir)
     print('save_data')
-    save_sim_results(data, save_fname)
+    if compressed:
+        save_sim_file(data, save_fname)
+    else:
+        save_sim_results(data, save_fname)
 
 
 def run_main(prj):
@@ -275,11 +400,12 @@ def run_main(prj):
         dut_cell='INTEG_AMP',
         env_list=['tt', 'ff_hot', 'ss_cold'],
         sim_view='av_extracted',
+        compressed=True,
     )
 
     # simulate(prj, **sim_params)
 
-    result = load_sim_file(save_fname)
+    result = open_sim_file(save_fname)
     # plot_data_2d(result, 'ioutp', sim_env='tt')
     # get_transient(result, 15, tper, ck_amp, ck_bias, **kwargs)
     # get_dc_tf(result, tper, ck_amp, ck_bias, plot=True, **dc_params)
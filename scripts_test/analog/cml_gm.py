@@ -8,6 +8,7 @@ from bag.core import BagProject
 
 from serdes_ec.layout.analog.passives import CMLResLoad
 from serdes_ec.layout.analog.cml import CMLGmPMOS
+from serdes_ec.layout.gds import generate_cell
 
 
 def run_main(prj):
@@ -20,7 +21,7 @@ def run_main(prj):
         impl_lib = dep_specs['impl_lib']
         grid_specs = dep_specs['routing_grid']
 
-        tdb = prj.make_template_db(impl_lib, grid_specs)
+        tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=False)
         dep = tdb.new_template(params=dep_specs['params'], temp_cls=CMLResLoad)
         save_info = dict(output_tracks=dep.output_tracks,
                          tot_width=dep.bound_box.width_unit,
@@ -36,7 +37,7 @@ def run_main(prj):
         specs = yaml.load(f)
 
     specs['params'].update(save_info)
-    prj.generate_cell(specs, CMLGmPMOS, debug=True)
+    generate_cell(prj, specs, CMLGmPMOS, debug=True)
     # prj.generate_cell(div_specs, CMLCorePMOS, gen_sch=True, debug=True)
 
 
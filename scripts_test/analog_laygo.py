@@ -8,6 +8,7 @@ from bag.core import BagProject
 
 from abs_templates_ec.laygo.core import LaygoBase
 
+from serdes_ec.layout.gds import get_gds_options, batch_layout
 from serdes_ec.layout.qdr_hybrid.amp import IntegAmp
 
 if TYPE_CHECKING:
@@ -69,6 +70,8 @@ def generate(prj, specs, use_cybagoa=False):
     params = specs['params']
     laygo_params = specs['laygo_params']
 
+    # GDS export needs the layout content in python.
+    use_cybagoa = use_cybagoa and not get_gds_options()[0]
     temp_db = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=use_cybagoa)
 
     name_list = [impl_cell, impl_cell + '_LAYGO']
@@ -79,7 +82,7 @@ def generate(prj, specs, use_cybagoa=False):
 
     temp_list = [temp1, temp2]
     print('creating layout')
-    temp_db.batch_layout(prj, temp_list, name_list)
+    batch_layout(prj, temp_db, temp_list, name_list)
     print('layout done')
 
 
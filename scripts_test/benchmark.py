@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+"""Layout generator benchmark suite.
+
+Each benchmark case creates the layout master of a generator from its test specification
+file, without writing anything to the layout database, and records wall time, CPU time,
+peak memory, master count and layout content counts.  Every case runs in its own
+subprocess so peak memory is measured independently.
+
+Usage::
+
+    # run all benchmarks and compare against the baseline
+    python scripts_test/benchmark.py
+    # run selected benchmarks and save the results as the new baseline
+    python scripts_test/benchmark.py tapx_column sin_clk_divider --update
+    # allow 50% run time increase
+    python scripts_test/benchmark.py -t time=1.5
+
+Run from the BAG working directory, same as the other test scripts.  The benchmarks need
+BAG and a technology setup, so they only run on hosts with a PDK.  If BAG is not installed
+or BAG_CONFIG_PATH is not set, the whole suite is skipped and the exit code is 0.  A
+benchmark whose specification file is missing is skipped.
+"""
+
+from typing import Dict, Any, List, Tuple, Optional
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import importlib.util
+import subprocess
+from collections import OrderedDict
+
+import yaml
+
+# benchmark name -> (specification file, generator class, setup function name)
+# the setup function, if given, is called with the BAG project and specification dictionary
+# before the benchmark starts.
+BENCHMARKS = OrderedDict([
+    ('cml_amp', ('specs_test/serdes_ec/analog/cml_amp.yaml',
+                 'serdes_ec.layout.analog.cml.CMLAmpPMOS', None)),
+    ('diffamp', ('specs_test/serdes_ec/analog/diffamp.yaml',
+                 'serdes_ec.layout.analog.amplifier.DiffAmp', None)),
+    ('buffer_array', ('specs_test/serdes_ec/digital/buffer_array.yaml',
+                      'serdes_ec.layout.digital.buffer.BufferArray', None)),
+    ('cml_load', ('specs_test/serdes_ec/passives/cml_load.yaml',
+                  'serdes_ec.layout.analog.passives.CMLResLoad', None)),
+    ('ctle', ('specs_test/serdes_ec/passives/ctle.yaml',
+              'serdes_ec.layout.analog.passives.PassiveCTLE', None)),
+    ('integ_amp', ('specs_test/serdes_ec/qdr_hybrid/integ_amp.yaml',
+                   'serdes_ec.layout.qdr_hybrid.amp.IntegAmp', None)),
+    ('strongarm', ('specs_test/serdes_ec/qdr_hybrid/strongarm.yaml',
+                   'serdes_ec.layout.laygo.strongarm.SenseAmpStrongArm', None)),
+    ('sin_clk_divider', ('specs_test/serdes_ec/qdr_hybrid/sin_clk_divider.yaml',
+                         'serdes_ec.layout.laygo.divider.SinClkDivider', 'setup_sin_clk_divider')),
+    ('tap1_summer', ('specs_test/serdes_ec/qdr_hybrid/tap1_summer.yaml',
+                     'serdes_ec.layout.qdr_hybrid.tap1.Tap1Summer', None)),
+    ('tap1_summer_row', ('specs_test/serdes_ec/qdr_hybrid/tap1_summer_row.yaml',
+                         'serdes_ec.layout.qdr_hybrid.tap1.Tap1SummerRow', None)),
+    ('tap1_column', ('specs_test/serdes_ec/qdr_hybrid/tap1_column.yaml',
+                     'serdes_ec.layout.qdr_hybrid.tap1.Tap1Column', None)),
+    ('tap1_column_dry', ('specs_test/serdes_ec/qdr_hybrid/tap1_column.yaml',
+                         'serdes_ec.layout.qdr_hybrid.tap1.Tap1Column', 'setup_dry_run')),
+    ('tapx_summer', ('specs_test/serdes_ec/qdr_hybrid/tapx_summer.yaml',
+                     'serdes_ec.layout.qdr_hybrid.tapx.TapXSummer', None)),
+    ('tapx_summer_ffe', ('specs_test/serdes_ec/qdr_hybrid/tapx_summer_ffe.yaml',
+                         'serdes_ec.layout.qdr_hybrid.tapx.TapXSummer', None)),
+    ('tapx_column', ('specs_test/serdes_ec/qdr_hybrid/tapx_column.yaml',
+                     'serdes_ec.layout.qdr_hybrid.tapx.TapXColumn', None)),
+    ('tapx_column_dry', ('specs_test/serdes_ec/qdr_hybrid/tapx_column.yaml',
+                         'serdes_ec.layout.qdr_hybrid.tapx.TapXColumn', 'setup_dry_run')),
+    ('tapx_column_ffe', ('specs_test/serdes_ec/qdr_hybrid/tapx_column_ffe.yaml',
+                         'serdes_ec.layout.qdr_hybrid.tapx.TapXColumn', None)),
+    ('highpass_column', ('specs_test/serdes_ec/qdr_hybrid/highpass_column.yaml',
+                         'serdes_ec.layout.qdr_hybrid.offset.HighPassColumn', None)),
+    ('senseamp_column', ('specs_test/serdes_ec/qdr_hybrid/senseamp_column.yaml',
+                         'serdes_ec.layout.qdr_hybrid.sampler.SenseAmpColumn', None)),
+    ('retimer_column', ('specs_test/serdes_ec/qdr_hybrid/retimer_column.yaml',
+                        'serdes_ec.layout.qdr_hybrid.sampler.RetimerColumn', None)),
+    ('datapath', ('specs_test/serdes_ec/qdr_hybrid/datapath.yaml',
+                  'serdes_ec.layout.qdr_hybrid.datapath.RXDatapath', None)),
+    ('frontend', ('specs_test/serdes_ec/qdr_hybrid/frontend.yaml',
+                  'serdes_ec.layout.qdr_hybrid.top.RXFrontend', None)),
+    ('rx_top', ('specs_test/serdes_ec/qdr_hybrid/top.yaml',
+                'serdes_ec.layout.qdr_hybrid.top.RXTop', None)),
+    ('ser32', ('specs_test/serdes_ec/tx/ser32.yaml',
+               'serdes_ec.layout.tx.ser.Serializer32', None)),
+    ('tx_datapath', ('specs_test/serdes_ec/tx/datapath.yaml',
+                     'serdes_ec.layout.tx.datapath.TXDatapath', None)),
+])
+
+# default maximum ratio of result to baseline for each metric.
+DEFAULT_THRESHOLDS = OrderedDict([
+    ('time', 1.25),
+    ('cpu_time', 1.25),
+    ('peak_rss_kb', 1.25),
+    ('num_masters', 1.0),
+    ('num_shapes', 1.0),
+    ('num_vias', 1.0),
+    ('num_insts', 1.0),
+])
+
+DEFAULT_BASELINE = 'benchmark_baseline.yaml'
+
+
+def setup_sin_clk_divider(prj, specs):
+    # type: (Any, Dict[str, Any]) -> None
+    """Add the row layout and track information from Tap1Summer to the divider parameters."""
+    from serdes_ec.layout.qdr_hybrid.tap1 import Tap1Summer
+
+    with open('specs_test/serdes_ec/qdr_hybrid/tap1_summer.yaml', 'r') as f:
+        sum_specs = yaml.load(f)
+
+    tdb = prj.make_template_db(sum_specs['impl_lib'], sum_specs['routing_grid'])
+    summer = tdb.new_template(params=sum_specs['params'], temp_cls=Tap1Summer)
+    specs['params'].update(row_layout_info=summer.lat_row_info, tr_info=summer.div_tr_info)
+
+
+def setup_dry_run(prj, specs):
+    # type: (Any, Dict[str, Any]) -> None
+    """Only compute the floorplan, for comparison against the full run."""
+    specs['params']['dry_run'] = True
+
+
+def get_skip_reason():
+    # type: () -> str
+    """Returns the reason the benchmarks cannot run on this host, or empty string if they can."""
+    if importlib.util.find_spec('bag') is None:
+        return 'BAG is not installed'
+    if not os.environ.get('BAG_CONFIG_PATH', ''):
+        return 'BAG_CONFIG_PATH is not set, no technology setup is available'
+    return ''
+
+
+def get_class(cls_path):
+    # type: (str) -> type
+    """Returns the class with the given fully qualified name."""
+    mod_name, cls_name = cls_path.rsplit('.', 1)
+    return getattr(importlib.import_module(mod_name), cls_name)
+
+
+def run_benchmark(prj, name):
+    # type: (Any, str) -> Dict[str, Any]
+    """Create the layout master of the given benchmark, and returns the measured results.
+
+    The template database is never written to the layout database, so only layout
+    generation is measured.
+    """
+    from serdes_ec.layout.profile import LAYOUT_COUNT_NAMES, get_layout_counts, get_max_rss
+
+    spec_fname, cls_path, setup_fun = BENCHMARKS[name]
+    with open(spec_fname, 'r') as f:
+        specs = yaml.load(f)
+    temp_cls = get_class(cls_path)
+    if setup_fun is not None:
+        globals()[setup_fun](prj, specs)
+
+    rss0 = get_max_rss()
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    temp_db = prj.make_template_db(specs['impl_lib'], specs['routing_grid'])
+    temp_db.new_template(params=specs['params'], temp_cls=temp_cls)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    rss = get_max_rss() - rss0
+
+    masters = list(getattr(temp_db, '_master_lookup', {}).values())
+    counts = [0] * len(LAYOUT_COUNT_NAMES)
+    for master in masters:
+        counts = [a + b for a, b in zip(counts, get_layout_counts(master))]
+
+    ans = OrderedDict([
+        ('time', wall),
+        ('cpu_time', cpu),
+        ('peak_rss_kb', rss),
+        ('num_masters', len(masters)),
+    ])
+    ans.update(zip(LAYOUT_COUNT_NAMES, counts))
+    return ans
+
+
+def run_in_subprocess(name):
+    # type: (str) -> Optional[Dict[str, Any]]
+    """Run the given benchmark in a new python process.
+
+    Returns None if the benchmark fails.
+    """
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', name],
+                          stdout=subprocess.PIPE, universal_newlines=True)
+    if proc.returncode != 0:
+        print('%s: failed with return code %d.' % (name, proc.returncode))
+        return None
+    # the result is always the last line; generators may print to stdout.
+    return json.loads(proc.stdout.strip().splitlines()[-1], object_pairs_hook=OrderedDict)
+
+
+def compare_results(results, baseline, thresholds):
+    # type: (Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, float]) -> List[str]
+    """Compare benchmark results against the baseline.
+
+    Returns
+    -------
+    err_list : List[str]
+        list of regression messages.  Empty if no regression is found.
+    """
+    err_list = []
+    for name, res in results.items():
+        base = baseline.get(name, None)
+        if base is None:
+            print('%s: no baseline found, skipping.' % name)
+            continue
+        for key, max_ratio in thresholds.items():
+            val = res.get(key, None)
+            base_val = base.get(key, None)
+            if val is None or base_val is None:
+                continue
+            if val > base_val * max_ratio and val > base_val:
+                err_list.append('%s: %s = %.4g exceeds baseline %.4g (max ratio = %.4g)' %
+                                (name, key, val, base_val, max_ratio))
+    return err_list
+
+
+def parse_thresholds(arg_list):
+    # type: (List[str]) -> Dict[str, float]
+    """Parse threshold overrides of the form metric=ratio."""
+    thresholds = DEFAULT_THRESHOLDS.copy()
+    for arg in arg_list:
+        key, val = arg.split('=', 1)
+        if key not in thresholds:
+            raise ValueError('Unknown metric: %s' % key)
+        thresholds[key] = float(val)
+    return thresholds
+
+
+def print_results(results):
+    # type: (Dict[str, Dict[str, Any]]) -> None
+    keys = list(DEFAULT_THRESHOLDS.keys())
+    name_len = max(len('name'), max((len(name) for name in results), default=0))
+    print(' '.join(['name'.ljust(name_len)] + [key.rjust(12) for key in keys]))
+    for name, res in results.items():
+        val_list = [('%.4g' % res[key]).rjust(12) for key in keys]
+        print(' '.join([name.ljust(name_len)] + val_list))
+
+
+def parse_options():
+    # type: () -> Tuple[argparse.Namespace, argparse.ArgumentParser]
+    parser = argparse.ArgumentParser(description='Run layout generator benchmarks.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run.  Defaults to all.')
+    parser.add_argument('-b', '--baseline', default=DEFAULT_BASELINE,
+                        help='baseline result file.')
+    parser.add_argument('-u', '--update', action='store_true', default=False,
+                        help='save results to the baseline file instead of comparing.')
+    parser.add_argument('-t', '--threshold', action='append', default=[],
+                        help='maximum result/baseline ratio of a metric, as metric=ratio.')
+    parser.add_argument('-l', '--list', action='store_true', default=False,
+                        help='list all benchmarks and exit.')
+    parser.add_argument('--single', default='', help=argparse.SUPPRESS)
+    return parser.parse_args(), parser
+
+
+def run_main():
+    # type: () -> int
+    args, parser = parse_options()
+
+    if args.single:
+        from bag.core import BagProject
+
+        res = run_benchmark(BagProject(), args.single)
+        print(json.dumps(res))
+        return 0
+
+    if args.list:
+        for name, (spec_fname, cls_path, _) in BENCHMARKS.items():
+            print('%s: %s (%s)' % (name, cls_path, spec_fname))
+        return 0
+
+    names = args.names or list(BENCHMARKS.keys())
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error('Unknown benchmark: %s' % name)
+    thresholds = parse_thresholds(args.threshold)
+
+    skip_reason = get_skip_reason()
+    if skip_reason:
+        print('skipping benchmarks: %s.' % skip_reason)
+        return 0
+
+    results = OrderedDict()
+    failed = []
+    for name in names:
+        spec_fname = BENCHMARKS[name][0]
+        if not os.path.isfile(spec_fname):
+            print('%s: specification file %s not found, skipping.' % (name, spec_fname))
+            continue
+        print('running benchmark %s' % name)
+        res = run_in_subprocess(name)
+        if res is None:
+            failed.append(name)
+        else:
+            results[name] = res
+
+    print_results(results)
+
+    if args.update:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = yaml.load(f) or {}
+        baseline.update({name: dict(res) for name, res in results.items()})
+        with open(args.baseline, 'w') as f:
+            yaml.dump(baseline, f, default_flow_style=False)
+        print('baseline saved to %s' % args.baseline)
+        return 1 if failed else 0
+
+    if not os.path.isfile(args.baseline):
+        print('baseline file %s not found, run with --update to create it.' % args.baseline)
+        return 1
+    with open(args.baseline, 'r') as f:
+        baseline = yaml.load(f) or {}
+
+    err_list = compare_results(results, baseline, thresholds)
+    err_list.extend(('%s: benchmark failed.' % name for name in failed))
+    for msg in err_list:
+        print(msg)
+    if err_list:
+        print('%d regressions found.' % len(err_list))
+        return 1
+    print('no regressions found.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_main())
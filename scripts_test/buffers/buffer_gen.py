@@ -7,6 +7,7 @@ import yaml
 from bag.core import BagProject
 
 from serdes_ec.layout.digital.buffer import BufferArray
+from serdes_ec.layout.gds import get_gds_options, batch_layout
 
 
 def run_main(prj, gen_lay=True, gen_sch=False, debug=False):
@@ -23,7 +24,10 @@ def run_main(prj, gen_lay=True, gen_sch=False, debug=False):
     impl_lib = specs['impl_lib']
     grid_specs = specs['routing_grid']
 
-    tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=True)
+    # GDS export only writes layout, and needs the layout content in python.
+    use_gds = bool(get_gds_options()[0])
+    gen_sch = gen_sch and not use_gds
+    tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=not use_gds)
     name_list = []
     lay_list = []
     sch_list = []
@@ -48,7 +52,7 @@ def run_main(prj, gen_lay=True, gen_sch=False, debug=False):
 
     if gen_lay:
         print('creating layouts')
-        tdb.batch_layout(prj, lay_list, name_list, debug=debug)
+        batch_layout(prj, tdb, lay_list, name_list, debug=debug)
     if gen_sch:
         print('creating schematics')
         prj.batch_schematic(impl_lib, sch_list, name_list, debug=debug)
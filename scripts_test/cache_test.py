@@ -5,6 +5,8 @@ import yaml
 from bag.core import BagProject
 from bag.layout.template import TemplateBase, CachedTemplate
 
+from serdes_ec.layout.gds import generate_cell
+
 
 class CacheTest(TemplateBase):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
@@ -41,4 +43,4 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, CacheTest, debug=True)
+    generate_cell(bprj, block_specs, CacheTest, debug=True)
@@ -5,6 +5,7 @@ import yaml
 from bag.core import BagProject
 
 from serdes_ec.layout.digital.buffer import BufferArray
+from serdes_ec.layout.gds import generate_cell
 
 
 if __name__ == '__main__':
@@ -20,5 +21,5 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, BufferArray, debug=True)
+    generate_cell(bprj, block_specs, BufferArray, debug=True)
     # StdCellWrapper.generate_cells(bprj, block_specs, gen_sch=True, run_lvs=True)
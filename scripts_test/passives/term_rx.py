@@ -7,6 +7,7 @@ import yaml
 from bag.core import BagProject
 
 from serdes_ec.layout.analog.passives import TermRX
+from serdes_ec.layout.gds import generate_cell
 
 
 def run_main(prj):
@@ -16,7 +17,7 @@ def run_main(prj):
     with open(os.path.join(root_dir, spec_fname), 'r') as f:
         specs = yaml.load(f)
 
-    prj.generate_cell(specs, TermRX, debug=True)
+    generate_cell(prj, specs, TermRX, debug=True)
     # prj.generate_cell(specs, TermRX, gen_sch=True, debug=True)
 
 
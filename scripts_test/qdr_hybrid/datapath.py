@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.datapath import RXDatapath
 
 
@@ -21,4 +22,4 @@ if __name__ == '__main__':
         bprj = local_dict['bprj']
 
     # bprj.generate_cell(block_specs, RXDatapath, debug=True)
-    bprj.generate_cell(block_specs, RXDatapath, gen_sch=True, debug=True)
+    generate_cell(bprj, block_specs, RXDatapath, gen_sch=True, debug=True)
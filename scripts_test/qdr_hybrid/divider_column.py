@@ -6,6 +6,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.tapx import TapXSummer
 from serdes_ec.layout.qdr_hybrid.sampler import DividerColumn
 
@@ -20,7 +21,7 @@ def run_main(prj):
         impl_lib = sum_specs['impl_lib']
         grid_specs = sum_specs['routing_grid']
 
-        tdb = prj.make_template_db(impl_lib, grid_specs)
+        tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=False)
         summer = tdb.new_template(params=sum_specs['params'], temp_cls=TapXSummer)
         div_info = dict(sum_row_info=summer.sum_row_info,
                         lat_row_info=summer.lat_row_info,
@@ -42,7 +43,7 @@ def run_main(prj):
         div_specs = yaml.load(f)
 
     div_specs['params'].update(div_info)
-    prj.generate_cell(div_specs, DividerColumn, debug=True)
+    generate_cell(prj, div_specs, DividerColumn, debug=True)
     # prj.generate_cell(div_specs, DividerColumn, gen_sch=True, debug=True)
 
 
@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.top import RXFrontend
 
 
@@ -21,4 +22,4 @@ if __name__ == '__main__':
         bprj = local_dict['bprj']
 
     # bprj.generate_cell(block_specs, RXFrontend, debug=True)
-    bprj.generate_cell(block_specs, RXFrontend, gen_lay=False, gen_sch=True, debug=True)
+    generate_cell(bprj, block_specs, RXFrontend, gen_lay=False, gen_sch=True, debug=True)
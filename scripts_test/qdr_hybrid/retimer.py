@@ -6,6 +6,8 @@ from bag.core import BagProject
 
 from digital_ec.layout.stdcells.core import StdCellWrapper
 
+from serdes_ec.layout.gds import get_gds_options, generate_cell
+
 
 if __name__ == '__main__':
     with open('specs_test/serdes_ec/qdr_hybrid/retimer.yaml', 'r') as f:
@@ -20,5 +22,8 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    StdCellWrapper.generate_cells(bprj, block_specs, debug=True)
+    if get_gds_options()[0]:
+        generate_cell(bprj, block_specs, StdCellWrapper, debug=True)
+    else:
+        StdCellWrapper.generate_cells(bprj, block_specs, debug=True)
     # StdCellWrapper.generate_cells(bprj, block_specs, gen_sch=True, run_lvs=True)
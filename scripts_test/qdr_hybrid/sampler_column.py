@@ -6,6 +6,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.tap1 import Tap1Summer
 from serdes_ec.layout.qdr_hybrid.sampler import SamplerColumn
 
@@ -20,7 +21,7 @@ def run_main(prj):
         impl_lib = sum_specs['impl_lib']
         grid_specs = sum_specs['routing_grid']
 
-        tdb = prj.make_template_db(impl_lib, grid_specs)
+        tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=False)
         summer = tdb.new_template(params=sum_specs['params'], temp_cls=Tap1Summer)
         sampler_info = dict(sum_row_info=summer.sum_row_info,
                             lat_row_info=summer.lat_row_info,
@@ -38,7 +39,7 @@ def run_main(prj):
 
     samp_specs['params'].update(sampler_info)
 
-    prj.generate_cell(samp_specs, SamplerColumn, debug=True)
+    generate_cell(prj, samp_specs, SamplerColumn, debug=True)
     # prj.generate_cell(samp_specs, SamplerColumn, gen_sch=True, debug=True)
 
 
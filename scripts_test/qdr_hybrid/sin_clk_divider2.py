@@ -6,6 +6,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.tap1 import Tap1Summer
 from serdes_ec.layout.laygo.divider import SinClkDivider
 
@@ -20,7 +21,7 @@ def run_main(prj):
         impl_lib = sum_specs['impl_lib']
         grid_specs = sum_specs['routing_grid']
 
-        tdb = prj.make_template_db(impl_lib, grid_specs)
+        tdb = prj.make_template_db(impl_lib, grid_specs, use_cybagoa=False)
         summer = tdb.new_template(params=sum_specs['params'], temp_cls=Tap1Summer)
         div_info = dict(row_layout_info=summer.lat_row_info,
                         tr_info=summer.div_tr_info,)
@@ -37,7 +38,7 @@ def run_main(prj):
     div_specs['params'].update(div_info)
 
     # prj.generate_cell(div_specs, SinClkDivider, debug=True)
-    prj.generate_cell(div_specs, SinClkDivider, gen_sch=True, debug=True)
+    generate_cell(prj, div_specs, SinClkDivider, gen_sch=True, debug=True)
 
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.laygo.strongarm import SenseAmpStrongArm
 
 
@@ -22,4 +23,4 @@ if __name__ == '__main__':
 
     # bprj.generate_cell(block_specs, SenseAmpStrongArm)
     # bprj.generate_cell(block_specs, SenseAmpStrongArm, gen_sch=True, run_lvs=True)
-    bprj.generate_cell(block_specs, SenseAmpStrongArm, gen_sch=True)
+    generate_cell(bprj, block_specs, SenseAmpStrongArm, gen_sch=True)
@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.tap1 import Tap1Summer
 
 
@@ -20,5 +21,5 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, Tap1Summer, debug=True)
+    generate_cell(bprj, block_specs, Tap1Summer, debug=True)
     # bprj.generate_cell(block_specs, Tap1Summer, gen_sch=True, debug=True)
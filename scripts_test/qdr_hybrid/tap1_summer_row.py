@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.tap1 import Tap1SummerRow
 
 
@@ -20,5 +21,5 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, Tap1SummerRow, gen_sch=False, run_lvs=False, use_cybagoa=True)
+    generate_cell(bprj, block_specs, Tap1SummerRow, gen_sch=False, run_lvs=False, use_cybagoa=True)
     # bprj.generate_cell(block_specs, Tap1SummerRow, gen_sch=True, run_lvs=True, use_cybagoa=True)
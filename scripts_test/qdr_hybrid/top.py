@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.qdr_hybrid.top import RXTop
 
 if __name__ == '__main__':
@@ -21,7 +22,11 @@ if __name__ == '__main__':
 
     # bprj.generate_cell(block_specs, RXTop, debug=True, save_cache=True)
     # bprj.generate_cell(block_specs, RXTop, debug=True, use_cache=True)
-    bprj.generate_cell(block_specs, RXTop, debug=True)
+    generate_cell(bprj, block_specs, RXTop, debug=True)
+    # from serdes_ec.layout.profile import LayoutProfiler
+    # with LayoutProfiler() as prof:
+    #     bprj.generate_cell(block_specs, RXTop, debug=True)
+    # prof.save('profile/rx_top')
     # bprj.generate_cell(block_specs, RXTop, gen_sch=True, debug=True)
     # bprj.generate_cell(block_specs, RXTop, gen_lay=False, gen_sch=True, debug=True)
     # bprj.generate_cell(block_specs, RXTop, gen_lay=False, gen_sch=True, debug=True, prefix='qdr_')
@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.laygo.strongarm import StrongArmLatch
 
 
@@ -20,4 +21,5 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, StrongArmLatch, gen_sch=False, run_lvs=False, use_cybagoa=True)
+    generate_cell(bprj, block_specs, StrongArmLatch, gen_sch=False, run_lvs=False,
+                  use_cybagoa=True)
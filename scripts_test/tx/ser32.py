@@ -4,6 +4,7 @@ import yaml
 
 from bag.core import BagProject
 
+from serdes_ec.layout.gds import generate_cell
 from serdes_ec.layout.tx.ser import Serializer32
 
 
@@ -20,5 +21,9 @@ if __name__ == '__main__':
         print('loading BAG project')
         bprj = local_dict['bprj']
 
-    bprj.generate_cell(block_specs, Serializer32, debug=True)
+    generate_cell(bprj, block_specs, Serializer32, debug=True)
+    # from serdes_ec.layout.profile import LayoutProfiler
+    # with LayoutProfiler() as prof:
+    #     bprj.generate_cell(block_specs, Serializer32, debug=True)
+    # prof.save('profile/ser32')
     # bprj.generate_cell(block_specs, Serializer32, gen_sch=True, debug=True)
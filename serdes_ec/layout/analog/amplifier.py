@@ -5,11 +5,12 @@
 
 from typing import Dict, Any, Set
 
-from bag.layout.routing import TrackManager
 from bag.layout.template import TemplateDB
 
 from serdes_ec.layout.analog.base import SerdesRXBase, SerdesRXBaseInfo
 
+from ..util import CachedTrackManager
+
 
 class DiffAmp(SerdesRXBase):
     """A single diff amp.
@@ -128,7 +129,7 @@ class DiffAmp(SerdesRXBase):
             dtr_lists[-1][0] = 'foot'
 
         hm_layer = self.mos_conn_layer + 1
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces)
         g_ntr_dict, ds_ntr_dict, tr_indices = {}, {}, {}
         for row_name, gtr_list, dtr_list, dtr_name_list in \
                 zip(row_names, gtr_lists, dtr_lists, dtr_names):
@@ -4,10 +4,12 @@ from typing import TYPE_CHECKING, Optional, Dict, Any, Set, Tuple, List, Union
 
 import abc
 
-from bag.layout.routing import TrackManager
+import numpy as np
 
 from abs_templates_ec.analog_core import AnalogBase, AnalogBaseInfo
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.routing import RoutingGrid, WireArray
     from bag.layout.template import TemplateDB
@@ -294,6 +296,174 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         return results
 
+    def _get_diffamp_tran_info_batch(self, seg_arrs, fg_center, flip_out_sd):
+        # type: (Dict[str, np.ndarray], np.ndarray, bool) -> Tuple[Dict[str, Any], np.ndarray]
+        """Vectorized equivalent of _get_diffamp_tran_info().
+
+        Returns a dictionary from transistor type to (present, fg_diff, up_is_source) arrays,
+        and the need_sep boolean array.
+        """
+        tran_types = ['casc', 'in', 'sw', 'en', 'tail']
+        centers = [True, True, False, False, False]
+
+        fg_cas = seg_arrs['fg_cas']
+        need_sep = (fg_cas > 0) | (not self.abut_analog_mos)
+
+        # get load information
+        tran_info = {}
+        fg_load = seg_arrs['load']
+        has_load = fg_load > 0
+        fg_diff = np.where(has_load, (fg_center - fg_load) // 2, 0)
+        fg_casc = seg_arrs['casc']
+        fg_gm = np.where(fg_casc == 0, seg_arrs['in'], fg_casc)
+        load_up_s = (fg_load >= fg_gm) | ((fg_load - fg_gm) % 4 == 0)
+        if flip_out_sd:
+            load_up_s = ~load_up_s
+        tran_info['load'] = (has_load, fg_diff, load_up_s)
+        fg_prev = np.where(has_load, fg_load, 0)
+        up_s = np.where(has_load, ~load_up_s, flip_out_sd)
+
+        # get nmos transistors information
+        for tran_type, center in zip(tran_types, centers):
+            fg = seg_arrs[tran_type]
+            present = fg > 0
+            if center:
+                cur_diff = (fg_center - fg) // 2
+                flip = (fg_prev > 0) & ((fg - fg_prev) % 4 != 0)
+                cur_up_s = up_s ^ flip
+            else:
+                fg_prev_tot = fg_prev + fg_diff - (~up_s)
+                less = fg_prev < fg
+                fit = fg_prev_tot >= fg
+                cur_diff = np.where(less, np.where(fit, fg_prev_tot - fg, 0), fg_diff)
+                cur_up_s = np.where(less, fit | ((fg_prev_tot - fg) % 2 == 0), up_s)
+
+            if tran_type == 'sw':
+                cur_up_s = ~cur_up_s
+
+            need_sep = need_sep | (present & (cur_diff > 0))
+            tran_info[tran_type] = (present, cur_diff, cur_up_s)
+
+            # compute information for next row
+            fg_diff = np.where(present, cur_diff, fg_diff)
+            fg_prev = np.where(present, fg, fg_prev)
+            up_s = np.where(present, ~cur_up_s, up_s)
+
+        return tran_info, need_sep
+
+    def get_diffamp_info_batch(self, seg_arrs, fg_min=0, fg_dum=0, flip_out_sd=False):
+        # type: (Dict[str, Any], int, int, bool) -> Dict[str, np.ndarray]
+        """Compute DiffAmp number of fingers for many sizings at once.
+
+        This is the vectorized equivalent of get_diffamp_info(), useful for screening
+        the footprint of many candidate sizings.  Transistor row information is not
+        returned.
+
+        Parameters
+        ----------
+        seg_arrs : Dict[str, Any]
+            a dictionary from transistor type to number of segments, with the same keys
+            as the seg_dict argument of get_diffamp_info().  Each value is either a
+            scalar or a 1D integer array, all arrays must broadcast together.
+        fg_min : int
+            minimum number of total fingers.
+        fg_dum : int
+            minimum single-sided number of dummy fingers.
+        flip_out_sd : bool
+            True to draw output on source instead of drain.
+
+        Returns
+        -------
+        info : Dict[str, np.ndarray]
+            the number of fingers dictionary.  Has the fg_tot, fg_single, fg_center,
+            fg_side, fg_sep, fg_dum, fg_tail_tot, and fg_load_tot entries, as described
+            in get_diffamp_info().
+        """
+        shape = np.broadcast(*(np.asarray(val) for val in seg_arrs.values())).shape
+        keys = ('load', 'casc', 'in', 'sw', 'en', 'tail', 'fg_cas', 'tail_cap', 'load_cap',
+                'tail_ref', 'load_ref')
+        seg_arrs = {key: np.broadcast_to(np.asarray(seg_arrs.get(key, 0), dtype=int), shape)
+                    for key in keys}
+
+        # error checking
+        for cap_name in ('tail_cap', 'load_cap'):
+            if np.any(seg_arrs[cap_name] % 4 != 0):
+                raise ValueError('seg_%s must be multiples of 4.' % cap_name)
+        for even_name in ('load', 'casc', 'in', 'tail_ref', 'load_ref'):
+            if np.any(seg_arrs[even_name] % 2 != 0):
+                raise ValueError('seg_%s must be even.' % even_name)
+
+        min_fg_sep = self.min_fg_sep
+        abut = self.abut_analog_mos
+
+        # determine number of center fingers
+        fg_load = seg_arrs['load']
+        fg_center = np.maximum.reduce([fg_load, seg_arrs['casc'], seg_arrs['in']])
+
+        # get source and drain information
+        tran_info, need_sep = self._get_diffamp_tran_info_batch(seg_arrs, fg_center, flip_out_sd)
+        _, fg_diff_load, load_up_s = tran_info['load']
+        load_s_vdd = load_up_s & abut
+        _, fg_diff_tail, tail_up_s = tran_info['tail']
+        tail_s_vss = ~tail_up_s & abut
+
+        # find number of separation fingers
+        fg_sep = np.zeros(shape, dtype=int)
+        # fg_sep from load reference constraint
+        fg_load_ref = seg_arrs['load_ref']
+        fg_load_sep = np.where(load_s_vdd, fg_load_ref, fg_load_ref + 2 * min_fg_sep)
+        fg_sep = np.where(fg_load_ref > 0, np.maximum(fg_sep, fg_load_sep - 2 * fg_diff_load),
+                          fg_sep)
+        # fg_sep from tail reference constraint
+        fg_tail_ref = seg_arrs['tail_ref']
+        fg_sep = np.where(fg_tail_ref > 0,
+                          np.maximum(fg_sep, fg_tail_ref + 2 * (min_fg_sep - fg_diff_tail)),
+                          fg_sep)
+        # fg_sep from need_sep constraint
+        for present, fg_diff, _ in tran_info.values():
+            fg_sep = np.where(need_sep & present, np.maximum(fg_sep, min_fg_sep - 2 * fg_diff),
+                              fg_sep)
+
+        # determine number of side fingers
+        fg_side = np.zeros(shape, dtype=int)
+        # get side fingers for sw and en row
+        for key in ('sw', 'en'):
+            present, fg_diff, _ = tran_info[key]
+            fg_side = np.where(present, np.maximum(fg_side, fg_diff + seg_arrs[key]), fg_side)
+        # get side fingers for tail row.  Take tail decap into account
+        fg_tail_cap = seg_arrs['tail_cap']
+        fg_tail_tot = fg_diff_tail + seg_arrs['tail']
+        fg_tail_tot += np.where(fg_tail_cap > 0,
+                                fg_tail_cap + np.where(tail_s_vss, 0, min_fg_sep), 0)
+        fg_side = np.maximum(fg_side, fg_tail_tot)
+        # get side fingers for load row.  Take load decap into account
+        fg_load_cap = seg_arrs['load_cap']
+        fg_load_tot = fg_diff_load + fg_load
+        fg_load_tot += np.where(fg_load_cap > 0,
+                                fg_load_cap + np.where(load_s_vdd, 0, min_fg_sep), 0)
+        fg_load_tot = np.where(fg_load > 0, fg_load_tot, 0)
+        fg_side = np.maximum(fg_side, fg_load_tot)
+
+        # get total number of fingers and number of dummies on each edge.
+        fg_single = np.maximum(fg_center, fg_side)
+        fg_tot = fg_single * 2 + fg_sep + 2 * fg_dum
+        # add dummies to get to fg_min
+        fg_min_arr = fg_min + (fg_min - fg_tot) % 2
+        add_dum = fg_tot < fg_min
+        fg_dum = np.where(add_dum, (fg_min_arr - fg_tot) // 2, fg_dum)
+        fg_tot = np.where(add_dum, fg_min_arr, fg_tot)
+
+        return dict(
+            fg_tot=fg_tot,
+            fg_single=fg_single,
+            fg_center=fg_center,
+            fg_side=fg_side,
+            fg_sep=fg_sep,
+            fg_dum=fg_dum,
+            fg_tail_tot=fg_tail_tot,
+            fg_load_tot=fg_load_tot,
+        )
+
 
 class SerdesRXBase(AnalogBase, metaclass=abc.ABCMeta):
     """Subclass of AmplifierBase that draws serdes circuits.
@@ -516,7 +686,7 @@ class SerdesRXBase(AnalogBase, metaclass=abc.ABCMeta):
 
         # connect to horizontal wires
         # nets relative index parameters
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces)
         nets = ['outp', 'outn', 'bias_load', 'midp', 'midn', 'bias_casc', 'tail', 'inp', 'inn', 'vddn', 'clk_sw',
                 'foot', 'enable', 'bias_tail']
         rows = ['load', 'load', 'load',      'casc', 'casc', 'casc',      'tail', 'in',  'in',  'sw',   'sw',
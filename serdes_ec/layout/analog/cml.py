@@ -3,18 +3,20 @@
 """This package defines various passives template classes.
 """
 
-from typing import TYPE_CHECKING, Dict, Set, Any, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Set, Any, Tuple, Union, List
 
 from itertools import chain
 
 from bag.util.search import BinaryIterator
 from bag.layout.util import BBox
-from bag.layout.routing.base import TrackID, TrackManager
+from bag.layout.routing.base import TrackID
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_core.base import AnalogBaseInfo, AnalogBase
 
 from .passives import CMLResLoad
+from ..fill import add_max_space_fill
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -123,7 +125,7 @@ class CMLGmPMOS(AnalogBase):
         ym_tr_w = self.grid.get_min_track_width(ym_layer, bot_w=hm_w, **em_specs, unit_mode=True)
 
         # construct track width/space dictionary from EM specs
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         tr_w_dict = {
             'in': {hm_layer: tr_manager.get_width(hm_layer, 'in')},
             'out': {hm_layer: hm_tr_w_out, ym_tr_w: ym_tr_w},
@@ -132,7 +134,7 @@ class CMLGmPMOS(AnalogBase):
             ('in', 'out'): {hm_layer: max(hm_tr_sp_out,
                                           tr_manager.get_space(hm_layer, ('in', 'out')))},
         }
-        tr_manager = TrackManager(self.grid, tr_w_dict, tr_sp_dict, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_w_dict, tr_sp_dict, half_space=True)
 
         pw_list = [w, w, w]
         pth_list = [threshold, threshold, threshold]
@@ -287,6 +289,7 @@ class CMLAmpPMOS(TemplateBase):
         self._sch_params = None
         self._ibias_em_specs = None
         self._in_tid = None
+        self._fill_list = []
 
     @property
     def sch_params(self):
@@ -303,6 +306,11 @@ class CMLAmpPMOS(TemplateBase):
         # type: () -> Tuple[Union[float, int], int]
         return self._in_tid
 
+    @property
+    def fill_list(self):
+        # type: () -> List[Tuple[int, Tuple[int, int, int, int], Union[float, int]]]
+        return self._fill_list
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -314,6 +322,7 @@ class CMLAmpPMOS(TemplateBase):
             tr_spaces='Track spacing dictionary.',
             top_layer='top level layer.',
             ext_mode='output extension mode.',
+            defer_fill='True to record max space fill regions for the parent to draw.',
             show_pins='True to draw pins.',
         )
 
@@ -322,6 +331,7 @@ class CMLAmpPMOS(TemplateBase):
         # type: () -> Dict[str, Any]
         return dict(
             ext_mode=0,
+            defer_fill=False,
             show_pins=True,
         )
 
@@ -330,6 +340,7 @@ class CMLAmpPMOS(TemplateBase):
         top_layer = self.params['top_layer']
         em_specs = self.params['em_specs']
         ext_mode = self.params['ext_mode']
+        defer_fill = self.params['defer_fill']
         show_pins = self.params['show_pins']
 
         if self.grid.get_direction(top_layer) != 'x':
@@ -391,9 +402,10 @@ class CMLAmpPMOS(TemplateBase):
             self.add_pin(name, warrs, label=lbl, show=show_pins)
 
         # do fill
+        fill_list = self._fill_list if defer_fill else None
         ym_layer = vdd_list[0].layer_id
         for lay in range(ym_layer, top_layer + 1):
-            self.do_max_space_fill(lay, fill_box, fill_pitch=3)
+            add_max_space_fill(self, fill_list, lay, fill_box, fill_pitch=3)
 
         # schematic parameters
         self._sch_params = dict(
@@ -418,7 +430,7 @@ class CMLAmpPMOS(TemplateBase):
         gm_params = gm_params.copy()
         res_params = res_params.copy()
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
 
         hm_layer = AnalogBase.get_mos_conn_layer(self.grid.tech_info) + 1
         sub_tr_w = tr_manager.get_width(hm_layer, 'sup')
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 
 
-from typing import TYPE_CHECKING, Dict, Set, Any, List, Union
+from typing import TYPE_CHECKING, Dict, Set, Any, List, Union, Tuple
 
 from itertools import chain, repeat
 
-from bag.layout.routing.base import TrackID, TrackManager
+from bag.layout.routing.base import TrackID
 from bag.layout.util import BBox
 from bag.layout.template import TemplateBase, BlackBoxTemplate
 
@@ -15,6 +15,9 @@ from abs_templates_ec.analog_mos.mos import DummyFillActive
 from analog_ec.layout.passives.capacitor.momcap import MOMCapCore
 from analog_ec.layout.passives.substrate import SubstrateWrapper
 
+from ..fill import add_max_space_fill
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
 
@@ -133,7 +136,7 @@ class PassiveCTLECore(ResArrayBase):
                         connect_up=True, half_blk_x=half_blk_x, half_blk_y=False)
 
         # connect wires
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
 
         vm_w_io = tr_manager.get_width(vm_layer, 'ctle')
         sup_name = 'VDD' if sub_type == 'ntap' else 'VSS'
@@ -351,6 +354,12 @@ class PassiveCTLE(SubstrateWrapper):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
         SubstrateWrapper.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
+        self._fill_list = []
+
+    @property
+    def fill_list(self):
+        # type: () -> List[Tuple[int, Tuple[int, int, int, int], Union[float, int]]]
+        return self._fill_list
 
     @classmethod
     def get_params_info(cls):
@@ -376,6 +385,7 @@ class PassiveCTLE(SubstrateWrapper):
             cap_spx='Space between capacitor and left/right edge, in resolution units.',
             cap_spy='Space between capacitor and cm-port/top/bottom edge, in resolution units.',
             sub_tr_w='substrate track width in number of tracks.  None for default.',
+            defer_fill='True to record max space fill regions for the parent to draw.',
             show_pins='True to draw pin layous.',
         )
 
@@ -389,6 +399,7 @@ class PassiveCTLE(SubstrateWrapper):
             cap_spx=0,
             cap_spy=0,
             sub_tr_w=None,
+            defer_fill=False,
             show_pins=True,
         )
 
@@ -399,6 +410,7 @@ class PassiveCTLE(SubstrateWrapper):
         threshold = self.params['threshold']
         res_type = self.params['res_type']
         sub_tr_w = self.params['sub_tr_w']
+        defer_fill = self.params['defer_fill']
         show_pins = self.params['show_pins']
 
         params = self.params.copy()
@@ -407,9 +419,10 @@ class PassiveCTLE(SubstrateWrapper):
                                               res_type=res_type)
         self.extend_wires(sub_list, lower=0, unit_mode=True)
 
+        fill_list = self._fill_list if defer_fill else None
         self.fill_box = bnd_box = self.bound_box
         for lay in range(1, self.top_layer):
-            self.do_max_space_fill(lay, bnd_box, fill_pitch=1.5)
+            add_max_space_fill(self, fill_list, lay, bnd_box, fill_pitch=1.5)
 
 
 class CMLResLoadCore(ResArrayBase):
@@ -4,11 +4,13 @@
 
 from typing import TYPE_CHECKING, Dict, Any, Set, List
 
-from bag.layout.routing.base import TrackID, WireArray, TrackManager
+from bag.layout.routing.base import TrackID, WireArray
 
 from digital_ec.layout.stdcells.core import StdDigitalTemplate
 from digital_ec.layout.stdcells.inv import InvChain
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
 
@@ -118,7 +120,7 @@ class BufferRow(StdDigitalTemplate):
 
         # draw instances, and export ports
         hm_layer = vm_layer + 1
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         hm_tr_w = tr_manager.get_width(hm_layer, 'buf_sig')
         hm_tr_sp = tr_manager.get_space(hm_layer, ('buf_sig', 'buf_sig'))
         hm_pitch = hm_tr_w + hm_tr_sp
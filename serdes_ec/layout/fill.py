@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines fill templates and methods.
+
+Flat power fill over a large area creates one wire per fill track per layer and one via per
+track intersection, all in the top level cell.  The power fill methods in this module instead
+draw the power fill of a small tile once in a master, array that master with a single
+instance, and only power fill the irregular boundary flat.
+
+This module also supports deferred max space fill.  A template that defers fill records
+its fill regions in a fill_list property instead of drawing them, and the parent template
+draws the fill regions of all its children in a single pass.  Regions that are known to
+contain no wires on the fill layer can be marked as tiled; those are max space filled with
+arrays of fill tile masters, with only the region boundary filled flat.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, Set, List, Tuple, Optional, Union, Sequence
+
+from collections import OrderedDict
+
+from bag.layout.util import BBox
+from bag.layout.template import TemplateBase
+
+if TYPE_CHECKING:
+    from bag.layout.objects import Instance
+    from bag.layout.routing import RoutingGrid, WireArray
+    from bag.layout.template import TemplateDB
+
+    FillInfo = Tuple[int, Tuple[int, int, int, int], Union[float, int], bool]
+
+# largest max space fill tile size class.  A tile of size class k is 2^k quanta wide.
+_max_fill_tile_class = 5
+
+
+def _lcm(a, b):
+    # type: (int, int) -> int
+    x, y = a, b
+    while y:
+        x, y = y, x % y
+    return a // x * b
+
+
+def get_fill_flip(lay_offset, orient_mode):
+    # type: (int, int) -> bool
+    """Returns the power fill flip flag of a layer.
+
+    Parameters
+    ----------
+    lay_offset : int
+        the layer ID offset from the bottom power fill layer.
+    orient_mode : int
+        the fill orientation mode.  Bit 1 flips even layer offsets, bit 0 flips odd layer
+        offsets.
+
+    Returns
+    -------
+    flip : bool
+        the do_power_fill() flip flag.
+    """
+    if lay_offset % 2 == 0:
+        return orient_mode & 2 != 0
+    return orient_mode & 1 != 0
+
+
+class PowerFillTile(TemplateBase):
+    """A power fill tile spanning multiple layers.
+
+    VDD/VSS pins are added on both the bottom and top fill layers, so arrays of this tile
+    can be connected to supply wires below as well as routing above.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs :
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        return dict(
+            fill_config='the fill configuration dictionary.',
+            bot_layer='the bottom fill layer.',
+            top_layer='the top fill layer.',
+            orient_mode='the fill orientation mode.',
+            show_pins='True to show pins.',
+        )
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        return dict(
+            orient_mode=0,
+            show_pins=False,
+        )
+
+    @classmethod
+    def get_tile_size(cls, grid, fill_config, bot_layer, top_layer):
+        # type: (RoutingGrid, Dict[int, Any], int, int) -> Tuple[int, int]
+        """Returns the tile width and height, in resolution units."""
+        blk_w, blk_h = grid.get_fill_size(top_layer, fill_config, unit_mode=True)
+        for lay in range(bot_layer, top_layer):
+            fill_w, fill_h = grid.get_fill_size(lay, fill_config, unit_mode=True)
+            blk_w = _lcm(blk_w, fill_w)
+            blk_h = _lcm(blk_h, fill_h)
+        return blk_w, blk_h
+
+    def get_layout_basename(self):
+        return 'power_fill_tile_m%dm%d' % (self.params['bot_layer'], self.params['top_layer'])
+
+    def draw_layout(self):
+        fill_config = self.params['fill_config']
+        bot_layer = self.params['bot_layer']
+        top_layer = self.params['top_layer']
+        orient_mode = self.params['orient_mode']
+        show_pins = self.params['show_pins']
+
+        blk_w, blk_h = self.get_tile_size(self.grid, fill_config, bot_layer, top_layer)
+        bnd_box = BBox(0, 0, blk_w, blk_h, self.grid.resolution, unit_mode=True)
+        self.set_size_from_bound_box(top_layer, bnd_box)
+        self.array_box = bnd_box
+
+        vdd, vss = None, None
+        for lay in range(bot_layer, top_layer + 1):
+            tr_w, tr_sp, sp, sp_le = fill_config[lay]
+            flip = get_fill_flip(lay - bot_layer, orient_mode)
+            vdd, vss = self.do_power_fill(lay, sp, sp_le, vdd_warrs=vdd, vss_warrs=vss,
+                                          fill_width=tr_w, fill_space=tr_sp, flip=flip,
+                                          unit_mode=True)
+            if lay == bot_layer:
+                self.add_pin('VDD_bot', vdd, label='VDD', show=False)
+                self.add_pin('VSS_bot', vss, label='VSS', show=False)
+
+        self.add_pin('VDD', vdd, show=show_pins)
+        self.add_pin('VSS', vss, show=show_pins)
+
+
+class MaxSpaceFillTile(TemplateBase):
+    """A max space fill tile of a single layer.
+
+    Tiles are cached by layer, fill pitch and size, so all fill regions of a layer share a
+    small set of tile masters.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs :
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        return dict(
+            layer_id='the fill layer.',
+            fill_pitch='the fill pitch, in number of tracks.',
+            width='the tile width, in resolution units.',
+            height='the tile height, in resolution units.',
+        )
+
+    @classmethod
+    def get_tile_quantum(cls, grid, layer_id, fill_pitch):
+        # type: (RoutingGrid, int, Union[float, int]) -> Tuple[int, int]
+        """Returns the tile width and height quantization, in resolution units.
+
+        The quantization is a multiple of the block size, and a multiple of the fill period
+        in the direction perpendicular to the tracks, so adjacent tiles line up.
+        """
+        blk_w, blk_h = grid.get_block_size(layer_id, unit_mode=True)
+        period = grid.get_track_pitch(layer_id, unit_mode=True) * int(round(2 * fill_pitch))
+        if grid.get_direction(layer_id) == 'x':
+            return blk_w, _lcm(blk_h, period)
+        return _lcm(blk_w, period), blk_h
+
+    def get_layout_basename(self):
+        return 'max_space_fill_tile_m%d' % self.params['layer_id']
+
+    def draw_layout(self):
+        layer_id = self.params['layer_id']
+        fill_pitch = self.params['fill_pitch']
+        width = self.params['width']
+        height = self.params['height']
+
+        bnd_box = BBox(0, 0, width, height, self.grid.resolution, unit_mode=True)
+        self.set_size_from_bound_box(layer_id, bnd_box)
+        self.array_box = bnd_box
+        self.do_max_space_fill(layer_id, bound_box=bnd_box, fill_pitch=fill_pitch)
+
+
+def _get_flat_boxes(bnd_box, arr_box):
+    # type: (BBox, BBox) -> List[BBox]
+    """Returns the boxes that cover bnd_box but not arr_box."""
+    res = bnd_box.resolution
+    xl, yb = bnd_box.left_unit, bnd_box.bottom_unit
+    xr, yt = bnd_box.right_unit, bnd_box.top_unit
+    axl, ayb = arr_box.left_unit, arr_box.bottom_unit
+    axr, ayt = arr_box.right_unit, arr_box.top_unit
+    box_list = []
+    if axl > xl:
+        box_list.append(BBox(xl, yb, axl, yt, res, unit_mode=True))
+    if axr < xr:
+        box_list.append(BBox(axr, yb, xr, yt, res, unit_mode=True))
+    if ayb > yb:
+        box_list.append(BBox(axl, yb, axr, ayb, res, unit_mode=True))
+    if ayt < yt:
+        box_list.append(BBox(axl, ayt, axr, yt, res, unit_mode=True))
+    return box_list
+
+
+def _get_tile_runs(flags):
+    # type: (Sequence[bool]) -> List[Tuple[int, int, bool]]
+    """Returns (start, stop, flag) of every run of identical flags."""
+    ans = []
+    start = 0
+    for idx in range(1, len(flags) + 1):
+        if idx == len(flags) or flags[idx] != flags[start]:
+            ans.append((start, idx, flags[start]))
+            start = idx
+    return ans
+
+
+def _get_tile_arrays(bnd_box,  # type: BBox
+                     arr_bnd_box,  # type: BBox
+                     blk_w,  # type: int
+                     blk_h,  # type: int
+                     exclude_boxes,  # type: Optional[List[BBox]]
+                     align=None,  # type: Optional[Tuple[int, int]]
+                     ):
+    # type: (...) -> Tuple[List[Tuple[int, int, int, int]], List[BBox]]
+    """Compute tile arrays on the alignment grid, and the boxes not covered by tiles.
+
+    Parameters
+    ----------
+    bnd_box : BBox
+        the fill area.
+    arr_bnd_box : BBox
+        the area tiles can be placed in.  Must be inside bnd_box.
+    blk_w : int
+        the tile width.
+    blk_h : int
+        the tile height.
+    exclude_boxes : Optional[List[BBox]]
+        areas where no tiles are placed.
+    align : Optional[Tuple[int, int]]
+        the tile array location alignment.  Defaults to the tile size.
+
+    Returns
+    -------
+    arr_list : List[Tuple[int, int, int, int]]
+        list of (x, y, nx, ny) of tile arrays.  Empty if no tiles fit in arr_bnd_box.
+    flat_boxes : List[BBox]
+        the boxes in bnd_box that are not covered by tiles.
+    """
+    res = bnd_box.resolution
+    align_x, align_y = (blk_w, blk_h) if align is None else align
+    x0 = -(-arr_bnd_box.left_unit // align_x) * align_x
+    y0 = -(-arr_bnd_box.bottom_unit // align_y) * align_y
+    nx = (arr_bnd_box.right_unit - x0) // blk_w
+    ny = (arr_bnd_box.top_unit - y0) // blk_h
+    if nx <= 0 or ny <= 0:
+        return [], [bnd_box]
+
+    # find tiles that touch the exclude boxes
+    excl_rows = [[False] * nx for _ in range(ny)]
+    if exclude_boxes:
+        for box in exclude_boxes:
+            ix0 = max(0, (box.left_unit - x0) // blk_w)
+            ix1 = min(nx, (box.right_unit - x0) // blk_w + 1)
+            iy0 = max(0, (box.bottom_unit - y0) // blk_h)
+            iy1 = min(ny, (box.top_unit - y0) // blk_h + 1)
+            for iy in range(iy0, iy1):
+                excl_rows[iy][ix0:ix1] = [True] * max(0, ix1 - ix0)
+
+    # group rows with the same excluded tiles, then array tiles over each run of columns
+    arr_list = []
+    flat_boxes = []
+    for iy0, iy1, _ in _get_tile_runs([tuple(row) for row in excl_rows]):
+        cur_yb = y0 + iy0 * blk_h
+        cur_yt = y0 + iy1 * blk_h
+        for ix0, ix1, excl in _get_tile_runs(excl_rows[iy0]):
+            cur_xl = x0 + ix0 * blk_w
+            cur_xr = x0 + ix1 * blk_w
+            if excl:
+                flat_boxes.append(BBox(cur_xl, cur_yb, cur_xr, cur_yt, res, unit_mode=True))
+            else:
+                arr_list.append((cur_xl, cur_yb, ix1 - ix0, iy1 - iy0))
+
+    arr_box = BBox(x0, y0, x0 + nx * blk_w, y0 + ny * blk_h, res, unit_mode=True)
+    flat_boxes.extend(_get_flat_boxes(bnd_box, arr_box))
+    return arr_list, flat_boxes
+
+
+def _do_flat_power_fill(template,  # type: TemplateBase
+                        fill_config,  # type: Dict[int, Any]
+                        bot_layer,  # type: int
+                        top_layer,  # type: int
+                        bnd_box,  # type: BBox
+                        vdd_warrs,  # type: List[WireArray]
+                        vss_warrs,  # type: List[WireArray]
+                        orient_mode,  # type: int
+                        ):
+    # type: (...) -> Tuple[List[WireArray], List[WireArray]]
+    vdd, vss = vdd_warrs, vss_warrs
+    for lay in range(bot_layer, top_layer + 1):
+        tr_w, tr_sp, sp, sp_le = fill_config[lay]
+        flip = get_fill_flip(lay - bot_layer, orient_mode)
+        vdd, vss = template.do_power_fill(lay, sp, sp_le, vdd_warrs=vdd, vss_warrs=vss,
+                                          bound_box=bnd_box, fill_width=tr_w, fill_space=tr_sp,
+                                          flip=flip, unit_mode=True)
+    return vdd, vss
+
+
+def do_tiled_power_fill(template,  # type: TemplateBase
+                        fill_config,  # type: Dict[int, Any]
+                        bot_layer,  # type: int
+                        top_layer,  # type: int
+                        bnd_box,  # type: BBox
+                        vdd_warrs,  # type: List[WireArray]
+                        vss_warrs,  # type: List[WireArray]
+                        orient_mode=0,  # type: int
+                        exclude_boxes=None,  # type: Optional[List[BBox]]
+                        ):
+    # type: (...) -> Tuple[List[WireArray], List[WireArray]]
+    """Power fill the given area from bot_layer to top_layer with arrays of fill tiles.
+
+    Tiles are placed on the tile pitch grid, and connected to the supply wires on
+    bot_layer - 1 with vias on intersections.  Area not covered by tiles is power filled
+    flat.  Tiles are not placed over the exclude boxes, as they do not avoid existing
+    wires.  Use exclude boxes to cover routing on the fill layers, so the flat power fill
+    can route around it.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template to draw power fill in.
+    fill_config : Dict[int, Any]
+        the fill configuration dictionary.
+    bot_layer : int
+        the bottom fill layer.
+    top_layer : int
+        the top fill layer.
+    bnd_box : BBox
+        the fill area.
+    vdd_warrs : List[WireArray]
+        VDD wires on bot_layer - 1.
+    vss_warrs : List[WireArray]
+        VSS wires on bot_layer - 1.
+    orient_mode : int
+        the fill orientation mode.
+    exclude_boxes : Optional[List[BBox]]
+        areas where no fill tiles are placed.
+
+    Returns
+    -------
+    vdd : List[WireArray]
+        VDD wires on top_layer.
+    vss : List[WireArray]
+        VSS wires on top_layer.
+    """
+    blk_w, blk_h = PowerFillTile.get_tile_size(template.grid, fill_config, bot_layer, top_layer)
+    arr_list, flat_boxes = _get_tile_arrays(bnd_box, bnd_box, blk_w, blk_h, exclude_boxes)
+    if not arr_list:
+        return _do_flat_power_fill(template, fill_config, bot_layer, top_layer, bnd_box,
+                                   vdd_warrs, vss_warrs, orient_mode)
+
+    params = dict(fill_config=fill_config, bot_layer=bot_layer, top_layer=top_layer,
+                  orient_mode=orient_mode, show_pins=False)
+    master = template.new_template(params=params, temp_cls=PowerFillTile)
+    vdd_top, vss_top, vdd_bot, vss_bot = [], [], [], []
+    for x, y, nx, ny in arr_list:
+        inst = template.add_instance(master, loc=(x, y), nx=nx, ny=ny, spx=blk_w, spy=blk_h,
+                                     unit_mode=True)
+        vdd_top.extend(inst.port_pins_iter('VDD'))
+        vss_top.extend(inst.port_pins_iter('VSS'))
+        vdd_bot.extend(inst.port_pins_iter('VDD_bot'))
+        vss_bot.extend(inst.port_pins_iter('VSS_bot'))
+
+    # connect tiles to supply wires below
+    template.draw_vias_on_intersections(vdd_warrs, template.connect_wires(vdd_bot))
+    template.draw_vias_on_intersections(vss_warrs, template.connect_wires(vss_bot))
+    vdd = template.connect_wires(vdd_top)
+    vss = template.connect_wires(vss_top)
+
+    # fill boundary and excluded tiles flat
+    for box in flat_boxes:
+        cur_vdd, cur_vss = _do_flat_power_fill(template, fill_config, bot_layer, top_layer, box,
+                                               vdd_warrs, vss_warrs, orient_mode)
+        vdd.extend(cur_vdd)
+        vss.extend(cur_vss)
+
+    return vdd, vss
+
+
+def _get_fill_tile_dim(quantum, length):
+    # type: (int, int) -> int
+    """Returns the largest tile dimension that fits at least twice in the given length.
+
+    The tile dimension is quantum times a power of 2, up to the largest size class.  Returns
+    0 if no tile fits.
+    """
+    num = length // (2 * quantum)
+    if num < 1:
+        return 0
+    return quantum << min(num.bit_length() - 1, _max_fill_tile_class)
+
+
+def do_tiled_max_space_fill(template,  # type: TemplateBase
+                            layer_id,  # type: int
+                            bnd_box,  # type: BBox
+                            fill_pitch=1,  # type: Union[float, int]
+                            exclude_boxes=None,  # type: Optional[List[BBox]]
+                            ):
+    # type: (...) -> None
+    """Max space fill the given area with arrays of fill tiles.
+
+    Tiles do not avoid existing wires, so this method should only be used on areas with no
+    wires on the fill layer, or with exclude boxes covering those wires.  A margin of one
+    tile quantum at the area boundary, excluded tiles, and area not covered by tiles are
+    max space filled flat, so spacing to wires around the area is still checked.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template to draw fill in.
+    layer_id : int
+        the fill layer ID.
+    bnd_box : BBox
+        the fill area.
+    fill_pitch : Union[float, int]
+        the fill pitch, in number of tracks.
+    exclude_boxes : Optional[List[BBox]]
+        areas where no fill tiles are placed.
+    """
+    grid = template.grid
+    qx, qy = MaxSpaceFillTile.get_tile_quantum(grid, layer_id, fill_pitch)
+    arr_bnd_box = bnd_box.expand(dx=-qx, dy=-qy, unit_mode=True)
+    tile_w = _get_fill_tile_dim(qx, arr_bnd_box.width_unit)
+    tile_h = _get_fill_tile_dim(qy, arr_bnd_box.height_unit)
+    arr_list, flat_boxes = [], [bnd_box]
+    if tile_w > 0 and tile_h > 0:
+        arr_list, flat_boxes = _get_tile_arrays(bnd_box, arr_bnd_box, tile_w, tile_h,
+                                                exclude_boxes, align=(qx, qy))
+    if not arr_list:
+        template.do_max_space_fill(layer_id, bound_box=bnd_box, fill_pitch=fill_pitch)
+        return
+
+    params = dict(layer_id=layer_id, fill_pitch=fill_pitch, width=tile_w, height=tile_h)
+    master = template.new_template(params=params, temp_cls=MaxSpaceFillTile)
+    for x, y, nx, ny in arr_list:
+        template.add_instance(master, loc=(x, y), nx=nx, ny=ny, spx=tile_w, spy=tile_h,
+                              unit_mode=True)
+    for box in flat_boxes:
+        template.do_max_space_fill(layer_id, bound_box=box, fill_pitch=fill_pitch)
+
+
+def add_max_space_fill(template, fill_list, layer_id, bnd_box, fill_pitch=1, tiled=False):
+    # type: (TemplateBase, Optional[List[FillInfo]], int, BBox, Union[float, int], bool) -> None
+    """Max space fill the given layer, or defer it by recording the fill region.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template to draw fill in.
+    fill_list : Optional[List[FillInfo]]
+        if None, fill is drawn immediately.  Otherwise, the fill region is appended to this
+        list, to be drawn later by do_fill_list().
+    layer_id : int
+        the fill layer ID.
+    bnd_box : BBox
+        the fill region.
+    fill_pitch : Union[float, int]
+        the fill pitch, in number of tracks.
+    tiled : bool
+        True to fill with arrays of fill tiles.  Only use this if the fill region has no
+        wires on the fill layer.  See do_tiled_max_space_fill().
+    """
+    if fill_list is None:
+        if tiled:
+            do_tiled_max_space_fill(template, layer_id, bnd_box, fill_pitch=fill_pitch)
+        else:
+            template.do_max_space_fill(layer_id, bound_box=bnd_box, fill_pitch=fill_pitch)
+    else:
+        fill_list.append((layer_id, (bnd_box.left_unit, bnd_box.bottom_unit,
+                                     bnd_box.right_unit, bnd_box.top_unit), fill_pitch, tiled))
+
+
+def get_inst_fill_list(inst):
+    # type: (Instance) -> List[FillInfo]
+    """Returns the deferred fill regions of the given instance, in parent coordinates.
+
+    The instance master must have a fill_list property.
+    """
+    res = inst.master.grid.resolution
+    ans = []
+    for layer_id, (xl, yb, xr, yt), fill_pitch, tiled in inst.master.fill_list:
+        box = inst.translate_master_box(BBox(xl, yb, xr, yt, res, unit_mode=True))
+        for xidx in range(inst.nx):
+            for yidx in range(inst.ny):
+                cur_box = box.move_by(dx=xidx * inst.spx_unit, dy=yidx * inst.spy_unit,
+                                      unit_mode=True)
+                ans.append((layer_id, (cur_box.left_unit, cur_box.bottom_unit,
+                                       cur_box.right_unit, cur_box.top_unit), fill_pitch, tiled))
+    return ans
+
+
+def do_fill_list(template, fill_list):
+    # type: (TemplateBase, List[FillInfo]) -> None
+    """Draw all given deferred fill regions in a single pass.
+
+    Regions are grouped by layer and fill pitch.  Regions that are contained in another
+    region of the same group are skipped, since they would already be filled.  A region
+    filled flat is never skipped in favor of a tiled region.  Tiled regions of a layer and
+    fill pitch share fill tile masters of a few size classes.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template to draw fill in.
+    fill_list : List[FillInfo]
+        list of (layer_id, (xl, yb, xr, yt), fill_pitch, tiled) fill regions.
+    """
+    res = template.grid.resolution
+    groups = OrderedDict()  # type: Dict[Tuple[int, Union[float, int]], List[Tuple[Any, ...]]]
+    for layer_id, bnds, fill_pitch, tiled in sorted(fill_list, key=lambda v: v[0]):
+        groups.setdefault((layer_id, fill_pitch), []).append((bnds, tiled))
+
+    for (layer_id, fill_pitch), bnds_list in groups.items():
+        for idx, ((xl, yb, xr, yt), tiled) in enumerate(bnds_list):
+            skip = False
+            for jdx, ((xl2, yb2, xr2, yt2), tiled2) in enumerate(bnds_list):
+                if (jdx != idx and xl2 <= xl and yb2 <= yb and xr <= xr2 and yt <= yt2 and
+                        (tiled or not tiled2) and
+                        (jdx < idx or (xl2, yb2, xr2, yt2, tiled2) != (xl, yb, xr, yt, tiled))):
+                    skip = True
+                    break
+            if not skip:
+                box = BBox(xl, yb, xr, yt, res, unit_mode=True)
+                if tiled:
+                    do_tiled_max_space_fill(template, layer_id, box, fill_pitch=fill_pitch)
+                else:
+                    template.do_max_space_fill(layer_id, bound_box=box, fill_pitch=fill_pitch)
@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines a streaming GDSII writer for template database masters.
+
+The writer exports layout masters directly to a GDSII stream file, without going through the
+layout database.  Masters are written depth first, children before parents, and each unique
+master is written exactly once.  Layout content of a master is requested from the master,
+written to disk, and discarded right away, so memory usage does not grow with the size of
+the exported hierarchy.
+
+GDSII layer numbers are given by a layer map file with the following format::
+
+    layer_map:
+      M1:
+        drawing: [31, 0]
+        pin: [31, 2]
+      V1:
+        drawing: [51, 0]
+    via_info:
+      M1_M2:
+        bot_layer: [M1, drawing]
+        cut_layer: [V1, drawing]
+        top_layer: [M2, drawing]
+    boundary_map:
+      PR: [235, 0]
+
+via_info maps each via ID to its metal and cut layers.  Blockages and boundaries are only
+written if their type is listed in blockage_map or boundary_map, respectively.  Arrayed
+rectangles and vias are written as an array reference to a structure named
+``<lib_name>_ARRAY_<index>``, which contains a single copy of the shapes.
+
+Every script in scripts_test accepts the following command line options::
+
+    --gds FILE          write the layout to the given GDSII file instead of the database.
+    --gds-layer-map FILE
+                        the layer map file.  Defaults to gds_layer_map.yaml.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Sequence, Set, Optional
+
+import io
+import sys
+import time
+import struct
+import argparse
+import warnings
+
+import yaml
+
+if TYPE_CHECKING:
+    from bag.core import BagProject
+    from bag.layout.template import TemplateDB, TemplateBase
+
+# GDSII record types, with data type included.
+_HEADER = 0x0002
+_BGNLIB = 0x0102
+_LIBNAME = 0x0206
+_UNITS = 0x0305
+_ENDLIB = 0x0400
+_BGNSTR = 0x0502
+_STRNAME = 0x0606
+_ENDSTR = 0x0700
+_BOUNDARY = 0x0800
+_PATH = 0x0900
+_SREF = 0x0A00
+_AREF = 0x0B00
+_TEXT = 0x0C00
+_LAYER = 0x0D02
+_DATATYPE = 0x0E02
+_WIDTH = 0x0F03
+_XY = 0x1003
+_ENDEL = 0x1100
+_SNAME = 0x1206
+_COLROW = 0x1302
+_TEXTTYPE = 0x1602
+_STRING = 0x1906
+_STRANS = 0x1A01
+_ANGLE = 0x1C05
+_PATHTYPE = 0x2102
+
+# maximum number of points in a XY record.
+_max_points = 8191
+
+# a complete rectangle element, from BOUNDARY to ENDEL.
+_box_struct = struct.Struct('>HHHHhHHhHH10iHH')
+
+# orientation name -> (x-axis reflection, rotation angle)
+_orient_strans = {
+    'R0': (False, 0),
+    'R90': (False, 90),
+    'R180': (False, 180),
+    'R270': (False, 270),
+    'MX': (True, 0),
+    'MY': (True, 180),
+    'MXR90': (True, 90),
+    'MYR90': (True, 270),
+}
+
+# orientation name -> transformation matrix (xx, xy, yx, yy)
+_orient_mat = {
+    'R0': (1, 0, 0, 1),
+    'R90': (0, -1, 1, 0),
+    'R180': (-1, 0, 0, -1),
+    'R270': (0, 1, -1, 0),
+    'MX': (1, 0, 0, -1),
+    'MY': (-1, 0, 0, 1),
+    'MXR90': (0, 1, 1, 0),
+    'MYR90': (0, -1, -1, 0),
+}
+
+# generation options that only affect logging, and are ignored when writing GDS.
+_gds_ignored_options = {'debug'}
+
+# path end style -> GDSII path type
+_path_types = {
+    'truncate': 0,
+    'round': 1,
+    'extend': 2,
+}
+
+
+def _real8(val):
+    # type: (float) -> bytes
+    """Returns the GDSII 8-byte excess-64 base-16 representation of the given number."""
+    if val == 0:
+        return b'\0' * 8
+    sign = 0x80 if val < 0 else 0
+    val = abs(val)
+    exp = 64
+    while val >= 1:
+        val /= 16
+        exp += 1
+    while val < 1 / 16:
+        val *= 16
+        exp -= 1
+    mant = int(round(val * (1 << 56)))
+    if mant >= (1 << 56):
+        mant >>= 4
+        exp += 1
+    return struct.pack('>Q', ((sign | exp) << 56) | mant)
+
+
+def _get_layer(layer):
+    # type: (Any) -> Tuple[str, str]
+    """Returns the (layer, purpose) tuple of the given layer."""
+    if isinstance(layer, str):
+        return layer, 'drawing'
+    return layer[0], layer[1]
+
+
+class GDSWriter(object):
+    """A streaming GDSII record writer.
+
+    All coordinates are given in resolution units.  This writer is a context manager; the
+    library is ended and the file is closed on exit.
+
+    Parameters
+    ----------
+    fname : str
+        the output file name.
+    lib_name : str
+        the GDSII library name.
+    resolution : float
+        the layout resolution, in layout units.
+    layout_unit : float
+        the layout unit, in meters.
+    buffer_size : int
+        the file buffer size, in bytes.
+    """
+
+    def __init__(self, fname, lib_name, resolution, layout_unit, buffer_size=1 << 20):
+        # type: (str, str, float, float, int) -> None
+        self._file = io.open(fname, 'wb', buffering=buffer_size)
+        self._in_struct = False
+        self._timestamp = list(time.localtime()[:6]) * 2
+
+        self._record(_HEADER, struct.pack('>h', 600))
+        self._record(_BGNLIB, struct.pack('>12h', *self._timestamp))
+        self._string_record(_LIBNAME, lib_name)
+        self._record(_UNITS, _real8(resolution) + _real8(resolution * layout_unit))
+
+    def __enter__(self):
+        # type: () -> GDSWriter
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def close(self):
+        # type: () -> None
+        """End the library and close the file."""
+        if self._in_struct:
+            raise ValueError('Cannot close GDS file in the middle of a structure.')
+        self._record(_ENDLIB, b'')
+        self._file.close()
+
+    def _record(self, rec_type, data):
+        # type: (int, bytes) -> None
+        self._file.write(struct.pack('>HH', len(data) + 4, rec_type))
+        self._file.write(data)
+
+    def _string_record(self, rec_type, val):
+        # type: (int, str) -> None
+        data = val.encode('ascii')
+        if len(data) % 2 == 1:
+            data += b'\0'
+        self._record(rec_type, data)
+
+    def _xy_record(self, points):
+        # type: (Sequence[Tuple[int, int]]) -> None
+        if len(points) > _max_points:
+            raise ValueError('Cannot write %d points in one GDS element.' % len(points))
+        coords = [v for pt in points for v in pt]
+        self._record(_XY, struct.pack('>%di' % len(coords), *coords))
+
+    def _strans_records(self, orient):
+        # type: (str) -> None
+        if orient not in _orient_strans:
+            raise ValueError('Unknown orientation: %s' % orient)
+        reflect, angle = _orient_strans[orient]
+        if reflect or angle:
+            self._record(_STRANS, struct.pack('>H', 0x8000 if reflect else 0))
+            if angle:
+                self._record(_ANGLE, _real8(angle))
+
+    def begin_struct(self, name):
+        # type: (str) -> None
+        """Start a new structure with the given name."""
+        if self._in_struct:
+            raise ValueError('Cannot nest GDS structures.')
+        self._in_struct = True
+        self._record(_BGNSTR, struct.pack('>12h', *self._timestamp))
+        self._string_record(_STRNAME, name)
+
+    def end_struct(self):
+        # type: () -> None
+        """End the current structure."""
+        self._in_struct = False
+        self._record(_ENDSTR, b'')
+
+    def add_box(self, layer, dtype, xl, yb, xr, yt):
+        # type: (int, int, int, int, int, int) -> None
+        """Add a rectangle."""
+        self._file.write(_box_struct.pack(4, _BOUNDARY, 6, _LAYER, layer, 6, _DATATYPE, dtype,
+                                          44, _XY, xl, yb, xr, yb, xr, yt, xl, yt, xl, yb,
+                                          4, _ENDEL))
+
+    def add_polygon(self, layer, dtype, points):
+        # type: (int, int, Sequence[Tuple[int, int]]) -> None
+        """Add a polygon.  The polygon is closed automatically."""
+        points = list(points)
+        if points[0] != points[-1]:
+            points.append(points[0])
+        self._record(_BOUNDARY, b'')
+        self._record(_LAYER, struct.pack('>h', layer))
+        self._record(_DATATYPE, struct.pack('>h', dtype))
+        self._xy_record(points)
+        self._record(_ENDEL, b'')
+
+    def add_path(self, layer, dtype, width, points, path_type=0):
+        # type: (int, int, int, Sequence[Tuple[int, int]], int) -> None
+        """Add a path."""
+        self._record(_PATH, b'')
+        self._record(_LAYER, struct.pack('>h', layer))
+        self._record(_DATATYPE, struct.pack('>h', dtype))
+        self._record(_PATHTYPE, struct.pack('>h', path_type))
+        self._record(_WIDTH, struct.pack('>i', width))
+        self._xy_record(points)
+        self._record(_ENDEL, b'')
+
+    def add_text(self, layer, text_type, x, y, text):
+        # type: (int, int, int, int, str) -> None
+        """Add a text label."""
+        self._record(_TEXT, b'')
+        self._record(_LAYER, struct.pack('>h', layer))
+        self._record(_TEXTTYPE, struct.pack('>h', text_type))
+        self._xy_record([(x, y)])
+        self._string_record(_STRING, text)
+        self._record(_ENDEL, b'')
+
+    def add_ref(self, name, x, y, orient='R0', nx=1, ny=1, spx=0, spy=0):
+        # type: (str, int, int, str, int, int, int, int) -> None
+        """Add a structure reference.  An array reference is used if nx or ny is not 1."""
+        is_arr = nx != 1 or ny != 1
+        self._record(_AREF if is_arr else _SREF, b'')
+        self._string_record(_SNAME, name)
+        self._strans_records(orient)
+        if is_arr:
+            self._record(_COLROW, struct.pack('>hh', nx, ny))
+            self._xy_record([(x, y), (x + nx * spx, y), (x, y + ny * spy)])
+        else:
+            self._xy_record([(x, y)])
+        self._record(_ENDEL, b'')
+
+
+class GDSExporter(object):
+    """Exports template database masters to a GDSII file.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    lay_map_fname : str
+        the layer map file name.
+    """
+
+    def __init__(self, temp_db, lay_map_fname):
+        # type: (TemplateDB, str) -> None
+        with open(lay_map_fname, 'r') as f:
+            lay_info = yaml.load(f)
+
+        self._temp_db = temp_db
+        self._lay_map = {}  # type: Dict[Tuple[str, str], Tuple[int, int]]
+        for lay, purp_dict in lay_info['layer_map'].items():
+            for purp, (lay_id, purp_id) in purp_dict.items():
+                self._lay_map[(lay, purp)] = (lay_id, purp_id)
+        self._via_info = {}  # type: Dict[str, Tuple[Tuple[int, int], ...]]
+        for via_id, info in lay_info.get('via_info', {}).items():
+            self._via_info[via_id] = tuple(self._get_gds_layer(info[key]) for key in
+                                           ('bot_layer', 'cut_layer', 'top_layer'))
+        self._blk_map = {key: tuple(val) for key, val in
+                         lay_info.get('blockage_map', {}).items()}
+        self._bnd_map = {key: tuple(val) for key, val in
+                         lay_info.get('boundary_map', {}).items()}
+        self._res = temp_db.grid.resolution
+        self._lay_unit = temp_db.grid.layout_unit
+        # shapes of arrayed rectangles and vias -> name of the structure containing them.
+        self._arr_cells = {}  # type: Dict[Tuple[Tuple[int, ...], ...], str]
+        self._arr_prefix = ''
+        self._arr_pending = []  # type: List[Tuple[str, Tuple[Tuple[int, ...], ...]]]
+
+    def _get_gds_layer(self, layer):
+        # type: (Any) -> Tuple[int, int]
+        key = _get_layer(layer)
+        if key not in self._lay_map:
+            raise ValueError('Layer %s not found in GDS layer map.' % (key, ))
+        return self._lay_map[key]
+
+    def _to_unit(self, val):
+        # type: (float) -> int
+        return int(round(val / self._res))
+
+    def _to_points(self, points):
+        # type: (Sequence[Sequence[float]]) -> List[Tuple[int, int]]
+        return [(self._to_unit(x), self._to_unit(y)) for x, y in points]
+
+    def export(self, fname, master_list, name_list, lib_name=None):
+        # type: (str, Sequence[TemplateBase], Sequence[str], Optional[str]) -> Set[str]
+        """Write the given masters and all their children to a GDSII file.
+
+        Parameters
+        ----------
+        fname : str
+            the output file name.
+        master_list : Sequence[TemplateBase]
+            the top level masters.
+        name_list : Sequence[str]
+            the cell names of the top level masters.
+        lib_name : Optional[str]
+            the GDSII library name.  Defaults to the template database library name.
+
+        Returns
+        -------
+        ext_cells : Set[str]
+            names of cells that are referenced but not defined in the output file.  These
+            cells come from external libraries, and have to be merged separately.
+        """
+        temp_db = self._temp_db
+        if lib_name is None:
+            lib_name = temp_db.lib_name
+        master_lookup = getattr(temp_db, '_master_lookup')
+        self._arr_cells.clear()
+        self._arr_prefix = lib_name
+
+        rename_dict = {master.cell_name: name for master, name in zip(master_list, name_list)}
+
+        def rename_fun(cell_name):
+            # type: (str) -> str
+            return temp_db.format_cell_name(rename_dict.get(cell_name, cell_name))
+
+        done = set()
+        cell_names = set()
+        ref_names = set()
+        with GDSWriter(fname, lib_name, self._res, self._lay_unit) as writer:
+            for top_master in master_list:
+                # iterative post-order traversal, so children are always written first.
+                stack = [(top_master, False)]
+                while stack:
+                    master, expanded = stack.pop()
+                    if master.key in done:
+                        continue
+                    if expanded:
+                        done.add(master.key)
+                        content = master.get_content(lib_name, rename_fun)
+                        cell_names.add(content[0])
+                        ref_names.update(self._write_content(writer, content))
+                    else:
+                        stack.append((master, True))
+                        for child_key in master.children():
+                            if child_key not in done:
+                                stack.append((master_lookup[child_key], False))
+
+        return ref_names - cell_names
+
+    def _write_content(self, writer, content):
+        # type: (GDSWriter, Sequence[Any]) -> Set[str]
+        """Write the given master content as a GDS structure, returns referenced cell names."""
+        if len(content) < 9:
+            raise ValueError('Cannot export OpenAccess layout content to GDS; create the '
+                             'template database with use_cybagoa=False.')
+        (cell_name, inst_list, rect_list, via_list, pin_list, path_list,
+         blockage_list, boundary_list, polygon_list) = content[:9]
+
+        to_unit = self._to_unit
+        ref_names = set()
+        writer.begin_struct(cell_name)
+        for inst in inst_list:
+            if inst.get('params', None) is not None:
+                raise ValueError('Cannot export parameterized instance %s/%s to GDS.' %
+                                 (inst['lib'], inst['cell']))
+            ref_names.add(inst['cell'])
+            x, y = inst['loc']
+            writer.add_ref(inst['cell'], to_unit(x), to_unit(y), orient=inst['orient'],
+                           nx=inst['num_cols'], ny=inst['num_rows'],
+                           spx=to_unit(inst['sp_cols']), spy=to_unit(inst['sp_rows']))
+        for rect in rect_list:
+            lay_id, purp_id = self._get_gds_layer(rect['layer'])
+            (xl, yb), (xr, yt) = rect['bbox']
+            xl, yb = to_unit(xl), to_unit(yb)
+            shape = (lay_id, purp_id, 0, 0, to_unit(xr) - xl, to_unit(yt) - yb)
+            self._write_shape_array(writer, [shape], xl, yb, rect)
+        for via in via_list:
+            self._write_via(writer, via)
+        for pin in pin_list:
+            self._write_pin(writer, pin)
+        for path in path_list:
+            lay_id, purp_id = self._get_gds_layer(path['layer'])
+            path_type = _path_types.get(path.get('end_style', 'truncate'), 0)
+            writer.add_path(lay_id, purp_id, to_unit(path['width']),
+                            self._to_points(path['points']), path_type=path_type)
+        for blockage in blockage_list:
+            gds_lay = self._blk_map.get(blockage.get('btype', None), None)
+            if gds_lay is not None:
+                writer.add_polygon(gds_lay[0], gds_lay[1], self._to_points(blockage['points']))
+        for boundary in boundary_list:
+            gds_lay = self._bnd_map.get(boundary.get('type', None), None)
+            if gds_lay is not None:
+                writer.add_polygon(gds_lay[0], gds_lay[1], self._to_points(boundary['points']))
+        for polygon in polygon_list:
+            lay_id, purp_id = self._get_gds_layer(polygon['layer'])
+            writer.add_polygon(lay_id, purp_id, self._to_points(polygon['points']))
+        writer.end_struct()
+
+        # write structures of new arrayed shapes referenced by this cell.
+        for name, shapes in self._arr_pending:
+            writer.begin_struct(name)
+            for box in shapes:
+                writer.add_box(*box)
+            writer.end_struct()
+        del self._arr_pending[:]
+        return ref_names
+
+    def _get_array_cell(self, shapes):
+        # type: (Tuple[Tuple[int, ...], ...]) -> str
+        """Returns the name of the structure containing the given rectangles.
+
+        Each unique set of rectangles is written once, after the current structure ends.
+        """
+        name = self._arr_cells.get(shapes, None)
+        if name is None:
+            name = '%s_ARRAY_%d' % (self._arr_prefix, len(self._arr_cells))
+            self._arr_cells[shapes] = name
+            self._arr_pending.append((name, shapes))
+        return name
+
+    def _write_shape_array(self, writer, shapes, x, y, info):
+        # type: (GDSWriter, Sequence[Tuple[int, ...]], int, int, Dict[str, Any]) -> None
+        """Write rectangles relative to (x, y), arrayed according to the arr_* entries.
+
+        An array is written as a structure containing one element and an array reference.
+        """
+        nx = info.get('arr_nx', 1)
+        ny = info.get('arr_ny', 1)
+        if nx == 1 and ny == 1:
+            for lay_id, purp_id, xl, yb, xr, yt in shapes:
+                writer.add_box(lay_id, purp_id, x + xl, y + yb, x + xr, y + yt)
+        else:
+            spx = self._to_unit(info.get('arr_spx', 0))
+            spy = self._to_unit(info.get('arr_spy', 0))
+            name = self._get_array_cell(tuple(shapes))
+            writer.add_ref(name, x, y, nx=nx, ny=ny, spx=spx, spy=spy)
+
+    def _write_via(self, writer, via):
+        # type: (GDSWriter, Dict[str, Any]) -> None
+        via_id = via['id']
+        if via_id not in self._via_info:
+            raise ValueError('Via %s not found in GDS layer map.' % via_id)
+        to_unit = self._to_unit
+        orient = via.get('orient', 'R0')
+        if orient not in _orient_mat:
+            raise ValueError('Unknown orientation: %s' % orient)
+        xx, xy, yx, yy = _orient_mat[orient]
+
+        x0, y0 = via['loc']
+        x0, y0 = to_unit(x0), to_unit(y0)
+        nx, ny = via['num_cols'], via['num_rows']
+        cw, ch = to_unit(via['cut_width']), to_unit(via['cut_height'])
+        spx, spy = to_unit(via['sp_cols']), to_unit(via['sp_rows'])
+        w_arr = nx * cw + (nx - 1) * spx
+        h_arr = ny * ch + (ny - 1) * spy
+        # via shapes relative to the via center, before orientation.
+        xl, yb = -w_arr // 2, -h_arr // 2
+        xr, yt = xl + w_arr, yb + h_arr
+        box_list = []
+        for (lay_id, purp_id), enc in zip((self._via_info[via_id][0],
+                                           self._via_info[via_id][2]),
+                                          (via['enc1'], via['enc2'])):
+            el, er, et, eb = [to_unit(v) for v in enc]
+            box_list.append((lay_id, purp_id, xl - el, yb - eb, xr + er, yt + et))
+        lay_id, purp_id = self._via_info[via_id][1]
+        for xidx in range(nx):
+            cxl = xl + xidx * (cw + spx)
+            for yidx in range(ny):
+                cyb = yb + yidx * (ch + spy)
+                box_list.append((lay_id, purp_id, cxl, cyb, cxl + cw, cyb + ch))
+
+        shapes = []
+        for lay_id, purp_id, bxl, byb, bxr, byt in box_list:
+            # transform both corners, then reorder to get the lower left corner.
+            ax, ay = xx * bxl + xy * byb, yx * bxl + yy * byb
+            bx, by = xx * bxr + xy * byt, yx * bxr + yy * byt
+            shapes.append((lay_id, purp_id, min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)))
+        self._write_shape_array(writer, shapes, x0, y0, via)
+
+    def _write_pin(self, writer, pin):
+        # type: (GDSWriter, Dict[str, Any]) -> None
+        lay = _get_layer(pin['layer'])[0]
+        key = (lay, 'pin') if (lay, 'pin') in self._lay_map else _get_layer(pin['layer'])
+        lay_id, purp_id = self._get_gds_layer(key)
+        (xl, yb), (xr, yt) = pin['bbox']
+        xl, yb, xr, yt = (self._to_unit(v) for v in (xl, yb, xr, yt))
+        if pin.get('make_rect', True):
+            writer.add_box(lay_id, purp_id, xl, yb, xr, yt)
+        writer.add_text(lay_id, purp_id, (xl + xr) // 2, (yb + yt) // 2,
+                        pin.get('label', None) or pin['net_name'])
+
+
+def write_gds(temp_db, master_list, name_list, fname, lay_map_fname, lib_name=None):
+    # type: (TemplateDB, Sequence[TemplateBase], Sequence[str], str, str, Optional[str]) -> Set[str]
+    """Write the given masters and all their children to a GDSII file.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.  It must not use cybagoa.
+    master_list : Sequence[TemplateBase]
+        the top level masters.
+    name_list : Sequence[str]
+        the cell names of the top level masters.
+    fname : str
+        the output file name.
+    lay_map_fname : str
+        the layer map file name.
+    lib_name : Optional[str]
+        the GDSII library name.  Defaults to the template database library name.
+
+    Returns
+    -------
+    ext_cells : Set[str]
+        names of cells that are referenced but not defined in the output file.  A warning is
+        issued if this set is not empty.
+    """
+    exporter = GDSExporter(temp_db, lay_map_fname)
+    ext_cells = exporter.export(fname, master_list, name_list, lib_name=lib_name)
+    if ext_cells:
+        warnings.warn('%s references cells not included in the file, which have to be merged '
+                      'separately: %s' % (fname, ', '.join(sorted(ext_cells))))
+    return ext_cells
+
+
+def get_gds_options(argv=None):
+    # type: (Optional[List[str]]) -> Tuple[str, str]
+    """Parse GDS export options from the command line.
+
+    Unknown arguments are ignored, so this can be used in any script.
+
+    Returns
+    -------
+    gds_fname : str
+        the GDS output file name.  Empty if GDS export is not requested.
+    lay_map_fname : str
+        the layer map file name.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--gds', default='')
+    parser.add_argument('--gds-layer-map', default='gds_layer_map.yaml')
+    args = parser.parse_known_args(sys.argv[1:] if argv is None else argv)[0]
+    return args.gds, args.gds_layer_map
+
+
+def _check_gds_options(kwargs):
+    # type: (Dict[str, Any]) -> None
+    """Raise an error if the given generation options cannot be honored when writing GDS."""
+    bad_opts = ['%s=%r' % (key, val) for key, val in sorted(kwargs.items())
+                if key not in _gds_ignored_options and bool(val) != (key == 'gen_lay')]
+    if bad_opts:
+        raise ValueError('GDS export only generates layout; unsupported options: %s.  '
+                         'Run without --gds instead.' % ', '.join(bad_opts))
+
+
+def generate_cell(prj, specs, temp_cls, **kwargs):
+    # type: (BagProject, Dict[str, Any], type, **Any) -> Any
+    """Generate the given cell.
+
+    If GDS export is requested on the command line, the layout is written to the GDS file
+    and nothing else is generated.  The template database is created without cybagoa, and
+    the names of cells referenced but not included in the GDS file are returned.  A
+    ValueError is raised if any other option, such as gen_sch or run_lvs, is requested.
+    Otherwise, this method returns the result of prj.generate_cell().
+    """
+    gds_fname, lay_map_fname = get_gds_options()
+    if not gds_fname:
+        return prj.generate_cell(specs, temp_cls, **kwargs)
+
+    _check_gds_options(kwargs)
+    temp_db = prj.make_template_db(specs['impl_lib'], specs['routing_grid'], use_cybagoa=False)
+    master = temp_db.new_template(params=specs['params'], temp_cls=temp_cls)
+    return write_gds(temp_db, [master], [specs['impl_cell']], gds_fname, lay_map_fname)
+
+
+def batch_layout(prj, temp_db, temp_list, name_list, **kwargs):
+    # type: (BagProject, TemplateDB, Sequence[TemplateBase], Sequence[str], **Any) -> Optional[Set[str]]
+    """Create the given layouts.
+
+    If GDS export is requested on the command line, the layouts are written to the GDS file,
+    and the names of cells referenced but not included in the GDS file are returned.  The
+    template database must not use cybagoa in this case, and a ValueError is raised if an
+    option other than debug is given.  Otherwise, this method calls temp_db.batch_layout()
+    and returns None.
+    """
+    gds_fname, lay_map_fname = get_gds_options()
+    if not gds_fname:
+        temp_db.batch_layout(prj, temp_list, name_list, **kwargs)
+        return None
+
+    _check_gds_options(kwargs)
+    return write_gds(temp_db, temp_list, name_list, gds_fname, lay_map_fname)
@@ -2,16 +2,19 @@
 
 """This module contains LaygoBase templates used in Hybrid-QDR receiver."""
 
-from typing import TYPE_CHECKING, Dict, Any, Set, Union
+from typing import TYPE_CHECKING, Dict, Any, Set, Union, List, Tuple
 
 from itertools import chain
 
-from bag.layout.routing import TrackManager, TrackID, WireArray
+from bag.layout.routing import TrackID, WireArray
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.laygo.core import LaygoBase
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
+    from bag.layout.routing import TrackManager
     from bag.layout.template import TemplateDB
 
 
@@ -94,8 +97,12 @@ def _connect_supply(template, sup_warr, sup_list, sup_intv, tr_manager, round_up
     return warr_list
 
 
-class SinClkDivider2(LaygoBase):
-    """A Sinusoidal clock divider using LaygoBase.
+class SinClkDividerBase(LaygoBase):
+    """Base class of sinusoidal clock dividers.
+
+    This class contains the integrating amplifier section, the section size information,
+    and the routing shared by all sinusoidal clock divider variants.  The gate inverter
+    and SR latch sections are drawn by the subclasses.
 
     Parameters
     ----------
@@ -134,26 +141,10 @@ class SinClkDivider2(LaygoBase):
         return self._sa_clk_tidx
 
     @classmethod
-    def get_col_info(cls, seg_dict, abut_mode):
-        # compute number of columns, then draw floorplan
-        blk_sp = seg_dict['blk_sp']
-        seg_inv = cls._get_gate_inv_info(seg_dict)
-        seg_int = cls._get_integ_amp_info(seg_dict)
-        seg_sr = cls._get_sr_latch_info(seg_dict)
-
-        if abut_mode & 1 != 0:
-            # abut on left
-            inc_coll = blk_sp
-        else:
-            inc_coll = 0
-        if abut_mode & 2 != 0:
-            # abut on right
-            inc_colr = blk_sp
-        else:
-            inc_colr = 0
-
-        seg_tot = seg_inv + seg_int + seg_sr + 2 * blk_sp + inc_coll + inc_colr
-        return seg_tot, blk_sp, seg_inv, seg_int, seg_sr, inc_coll, inc_colr
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'sa_clk_tidx']
 
     @classmethod
     def get_params_info(cls):
@@ -185,41 +176,12 @@ class SinClkDivider2(LaygoBase):
             show_pins=True,
         )
 
-    def draw_layout(self):
-        row_layout_info = self.params['row_layout_info']
-        seg_dict = self.params['seg_dict'].copy()
-        tr_widths = self.params['tr_widths']
-        tr_spaces = self.params['tr_spaces']
-        en3_htr_idx = self.params['en3_htr_idx']
-        tr_info = self.params['tr_info']
-        fg_min = self.params['fg_min']
-        end_mode = self.params['end_mode']
-        abut_mode = self.params['abut_mode']
-        div_pos_edge = self.params['div_pos_edge']
-        show_pins = self.params['show_pins']
-
-        # compute number of columns
-        tmp = self.get_col_info(seg_dict, abut_mode)
-        seg_tot, blk_sp, seg_inv, seg_int, seg_sr, col_inv, inc_colr = tmp
-        if fg_min > seg_tot:
-            deltal = (fg_min - seg_tot) // 4 * 2
-            col_inv += deltal
-            inc_colr += (fg_min - seg_tot - col_inv)
-            seg_tot = fg_min
-
-        self._fg_tot = seg_tot
-        self.set_rows_direct(row_layout_info, end_mode=end_mode, num_col=seg_tot)
-
-        # draw individual blocks
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
-        vss_w, vdd_w = _draw_substrate(self, col_inv, seg_tot, seg_tot - inc_colr - col_inv)
-        col_int = col_inv + seg_inv + blk_sp
-        col_sr = col_int + seg_int + blk_sp
-        inv_ports, inv_seg = self._draw_gate_inv(col_inv, seg_inv, seg_dict, tr_manager)
-        int_ports, int_seg = self._draw_integ_amp(col_int, seg_int, seg_dict, tr_manager)
-        sr_ports, xm_locs, sr_params = self._draw_sr_latch(col_sr, seg_sr, seg_dict, tr_manager,
-                                                           en3_htr_idx)
+    def _connect_sections(self, inv_ports, int_ports, sr_ports):
+        # type: (Dict[str, Any], Dict[str, Any], Dict[str, Any]) -> Tuple[List[WireArray], Any]
+        """Connect gate inverters, integrating amplifier, and SR latch together.
 
+        Returns the enable wires and the clock wire.
+        """
         # connect enable
         en = self.connect_to_track_wires([inv_ports['en'], sr_ports['pen']], int_ports['en'])
         en_vm = sr_ports['nen']
@@ -241,26 +203,17 @@ class SinClkDivider2(LaygoBase):
         self.connect_wires([int_ports['sb'], sr_ports['sb']])
         self.connect_wires([int_ports['rb'], sr_ports['rb']])
 
-        # connect sr latch to inverters
-        xm_layer = self.conn_layer + 3
-        xm_w_q = tr_manager.get_width(xm_layer, 'div')
-
-        # connect supply wires
-        vss_list = [inv_ports['VSS'], int_ports['VSS'], sr_ports['VSS']]
-        vdd_list = [inv_ports['VDD'], int_ports['VDD'], sr_ports['VDD']]
-        vss_intv = self.get_track_interval(0, 'ds')
-        vdd_intv = self.get_track_interval(self.num_rows - 1, 'ds')
-        vss = _connect_supply(self, vss_w, vss_list, vss_intv, tr_manager, round_up=False,
-                              exc_set={en3_htr_idx})
-        vdd = _connect_supply(self, vdd_w, vdd_list, vdd_intv, tr_manager, round_up=True)
+        return en, clk
 
-        # fill space
-        self.fill_space()
+    def _add_div_pins(self, tr_manager, q_warrs, qb_warrs, xm_locs, en, clk, vdd, vss, scan_s):
+        # type: (TrackManager, Any, Any, List[float], Any, Any, Any, Any, Any) -> None
+        """Connect wires to xm_layer tracks if track information are given, then add pins."""
+        tr_info = self.params['tr_info']
+        div_pos_edge = self.params['div_pos_edge']
+        show_pins = self.params['show_pins']
 
-        # add pins.  Connect to xm_layer if track information are given
-        q_warrs = [inv_ports['q'], sr_ports['q']]
-        qb_warrs = [inv_ports['qb'], sr_ports['qb']]
-        scan_s = sr_ports['scan_s']
+        xm_layer = self.conn_layer + 3
+        xm_w_q = tr_manager.get_width(xm_layer, 'div')
         if tr_info is None:
             en_lbl = 'en:'
             q, qb = self.connect_differential_tracks(q_warrs, qb_warrs, xm_layer, xm_locs[1],
@@ -301,13 +254,14 @@ class SinClkDivider2(LaygoBase):
         self.add_pin('VSS', vss, show=show_pins)
         self.add_pin('scan_s', scan_s, show=show_pins)
 
-        # compute schematic parameters.
+    def _set_sch_params(self, seg_dict, sr_params):
+        # type: (Dict[str, int], Dict[str, Any]) -> None
+        """Compute schematic parameters."""
         n0_info = self.get_row_info(1)
         n1_info = self.get_row_info(2)
         n2_info = self.get_row_info(3)
         p0_info = self.get_row_info(4)
         p1_info = self.get_row_info(5)
-        inv_seg.update(int_seg)
         self._sch_params = dict(
             lch=self.laygo_info.lch,
             w_dict=dict(
@@ -324,7 +278,7 @@ class SinClkDivider2(LaygoBase):
                 p0=p0_info['threshold'],
                 p1=p1_info['threshold'],
             ),
-            seg_dict=inv_seg,
+            seg_dict=seg_dict,
             sr_params=sr_params,
         )
 
@@ -367,96 +321,6 @@ class SinClkDivider2(LaygoBase):
         seg_nand_set = max(seg_nand * 2, seg_set)
         return (seg_inv + seg_drv + seg_sp + seg_nand_set) * 2
 
-    def _draw_gate_inv(self, start, seg_tot, seg_dict, tr_manager):
-        blk_sp = seg_dict['blk_sp']
-        seg_pen = seg_dict['inv_pen']
-        seg_inv = seg_dict['inv_inv']
-
-        xleft = self.laygo_info.col_to_coord(start, unit_mode=True)
-        xright = self.laygo_info.col_to_coord(start + seg_tot, unit_mode=True)
-
-        col_inv = start + (seg_pen + 2) // 2
-        ridx = 3
-        ninvl = self.add_laygo_mos(ridx, col_inv, seg_inv)
-        pinvl = self.add_laygo_mos(ridx + 1, col_inv, seg_inv)
-        col_inv += seg_inv
-        ninvr = self.add_laygo_mos(ridx, col_inv, seg_inv)
-        pinvr = self.add_laygo_mos(ridx + 1, col_inv, seg_inv)
-        pgate = self.add_laygo_mos(ridx + 2, start, seg_tot, gate_loc='s')
-
-        # get track indices
-        hm_layer = self.conn_layer + 1
-        vm_layer = hm_layer + 1
-        hm_w_in = tr_manager.get_width(hm_layer, 'in')
-        hm_w_out = tr_manager.get_width(hm_layer, 'out')
-        vm_w_in = tr_manager.get_width(vm_layer, 'in')
-        in_start, in_stop = self.get_track_interval(3, 'g')
-        nin_locs = tr_manager.spread_wires(hm_layer, ['in', 'in'], in_stop - in_start,
-                                           'in', alignment=1, start_idx=in_start)
-        gb_idx0 = self.get_track_index(3, 'gb', 0)
-        gb_idx1 = self.get_track_index(4, 'gb', 0)
-        ntr = gb_idx1 - gb_idx0 + 1
-        out_locs = tr_manager.spread_wires(hm_layer, [1, 'out', 1, 'out', 1], ntr,
-                                           'out', alignment=0, start_idx=gb_idx0)
-        pin_idx0 = self.get_track_index(4, 'g', -1)
-        clk_idx = self.get_track_index(5, 'g', -1)
-        en_idx = clk_idx + 1
-        tleft = self.grid.coord_to_nearest_track(vm_layer, xleft, unit_mode=True, half_track=True,
-                                                 mode=1)
-        tright = self.grid.coord_to_nearest_track(vm_layer, xright, unit_mode=True, half_track=True,
-                                                  mode=-1)
-        ntr = tright - tleft + 1
-        vin_locs = tr_manager.align_wires(vm_layer, ['in', 'in'], ntr, alignment=0, start_idx=tleft)
-        xleft = self.laygo_info.col_to_coord(col_inv + seg_inv, unit_mode=True)
-        xright = self.laygo_info.col_to_coord(start + seg_tot + blk_sp, unit_mode=True)
-        tleft = self.grid.coord_to_nearest_track(vm_layer, xleft, unit_mode=True, half_track=True,
-                                                 mode=1)
-        tright = self.grid.coord_to_nearest_track(vm_layer, xright, unit_mode=True, half_track=True,
-                                                  mode=-1)
-        ntr = tright - tleft + 1
-        vout_locs = tr_manager.align_wires(vm_layer, ['in', 'in'], ntr, alignment=0,
-                                           start_idx=tleft)
-
-        # connect pmos tail
-        tid = self.make_track_id(5, 'gb', 0)
-        self.connect_to_tracks([pinvl['s'], pinvr['s'], pgate['s']], tid)
-
-        # connect outputs
-        outp = [ninvr['d'], pinvr['d']]
-        outn = [ninvl['d'], pinvl['d']]
-        outp, outn = self.connect_differential_tracks(outp, outn, hm_layer, out_locs[3],
-                                                      out_locs[1], width=hm_w_out)
-        outp, outn = self.connect_differential_tracks(outp, outn, vm_layer, vout_locs[1],
-                                                      vout_locs[0], width=vm_w_in)
-
-        # connect inputs
-        ninp, ninn = self.connect_differential_tracks(ninvl['g'], ninvr['g'], hm_layer, nin_locs[1],
-                                                      nin_locs[0], width=hm_w_in)
-        pinp, pinn = self.connect_differential_tracks(pinvl['g'], pinvr['g'], hm_layer, pin_idx0,
-                                                      pin_idx0 + 1, width=hm_w_in)
-        inp, inn = self.connect_differential_tracks([ninp, pinp], [ninn, pinn], vm_layer,
-                                                    vin_locs[0], vin_locs[1], width=vm_w_in)
-
-        # connect enables and clocks
-        num_en = (seg_pen + 2) // 4
-        pgate_warrs = pgate['g'].to_warr_list()
-        en_warrs = pgate_warrs[:num_en] + pgate_warrs[-num_en:]
-        en = self.connect_to_tracks(en_warrs, TrackID(hm_layer, en_idx))
-        clk_warrs = pgate_warrs[num_en:-num_en]
-        clk = self.connect_to_tracks(clk_warrs, TrackID(hm_layer, clk_idx))
-
-        ports = {'VDD': pgate['d'], 'VSS': [ninvl['s'], ninvr['s']],
-                 'mp': outp, 'mn': outn,
-                 'qb': inp, 'q': inn,
-                 'en': en, 'clk': clk}
-
-        inv_seg_dict = dict(
-            inv_clk=2 * seg_inv + 2,
-            inv_en=seg_pen,
-            inv_inv=seg_inv,
-        )
-        return ports, inv_seg_dict
-
     def _draw_integ_amp(self, start, seg_tot, seg_dict, tr_manager):
         seg_rst = seg_dict['int_rst']
         seg_pen = seg_dict['int_pen']
@@ -558,67 +422,255 @@ class SinClkDivider2(LaygoBase):
         )
         return ports, int_seg_dict
 
-    def _draw_sr_latch(self, start, seg_tot, seg_dict, tr_manager, en_htr_idx):
-        seg_nand = seg_dict['sr_nand']
-        seg_set = seg_dict['sr_set']
-        seg_sp = seg_dict['sr_sp']
-        seg_inv = seg_dict['sr_inv']
-        seg_drv = seg_dict['sr_drv']
-        seg_pnor = seg_dict.get('sr_pnor', 1)
-        seg_nnor = seg_dict.get('sr_nnor', 2)
-        seg_sinv = seg_dict.get('sr_sinv', 2)
-        fg_nand = seg_nand * 2
 
-        if seg_set > seg_drv:
-            raise ValueError('Must have sr_set <= sr_drv')
-        if seg_pnor > seg_nand:
-            raise ValueError('Must have sr_pnor <= sr_nand.')
-        if seg_nnor % 2 == 1 or seg_sinv % 2 == 1:
-            raise ValueError('sr_nnor and sr_sinv must be even.')
+class SinClkDivider2(SinClkDividerBase):
+    """A Sinusoidal clock divider using LaygoBase.
 
-        # place instances
-        stop = start + seg_tot
-        ridx = 3
-        cidx = start
-        col_spl = cidx + seg_nand * 2 + 1
-        col_norl = cidx
-        nnandl = self.add_laygo_mos(ridx, cidx, seg_nand, gate_loc='s', stack=True)
-        pnandl = self.add_laygo_mos(ridx + 1, cidx, seg_nand, gate_loc='s', stack=True)
-        pnorl = self.add_laygo_mos(ridx + 2, cidx, seg_pnor, gate_loc='s', stack=True, flip=True)
-        nnor1l = self.add_laygo_mos(ridx - 1, cidx, seg_nnor)
-        nnor2l = self.add_laygo_mos(ridx - 1, cidx + seg_nnor, seg_nnor)
-        cidx = stop - fg_nand
-        col_spr = cidx - 1
-        col_norr = cidx + seg_pnor
-        nnandr = self.add_laygo_mos(ridx, cidx, seg_nand, gate_loc='s', stack=True, flip=True)
-        pnandr = self.add_laygo_mos(ridx + 1, cidx, seg_nand, gate_loc='s', stack=True, flip=True)
-        pnorr = self.add_laygo_mos(ridx + 2, cidx, seg_pnor, gate_loc='s', stack=True)
-        nnor1r = self.add_laygo_mos(ridx - 1, cidx + fg_nand - seg_nnor, seg_nnor)
-        nnor2r = self.add_laygo_mos(ridx - 1, cidx + fg_nand - 2 * seg_nnor, seg_nnor)
-        psinv = self.add_laygo_mos(ridx + 2, cidx - 1, 1)
-        start += fg_nand + seg_sp
-        stop -= fg_nand + seg_sp
+    Parameters
+    ----------
+    temp_db : TemplateDB
+            the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs :
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
 
-        ndrvl = self.add_laygo_mos(ridx, start, seg_drv)
-        setl = self.add_laygo_mos(ridx - 1, start, seg_set)
-        pdrvl = self.add_laygo_mos(ridx + 1, start, seg_drv)
-        cidx = stop - seg_drv
-        ndrvr = self.add_laygo_mos(ridx, cidx, seg_drv)
-        setr = self.add_laygo_mos(ridx - 1, cidx + seg_drv - seg_set, seg_set)
-        pdrvr = self.add_laygo_mos(ridx + 1, cidx, seg_drv)
-        start += seg_drv
-        stop -= seg_drv
+    @classmethod
+    def get_col_info(cls, seg_dict, abut_mode):
+        # compute number of columns, then draw floorplan
+        blk_sp = seg_dict['blk_sp']
+        seg_inv = cls._get_gate_inv_info(seg_dict)
+        seg_int = cls._get_integ_amp_info(seg_dict)
+        seg_sr = cls._get_sr_latch_info(seg_dict)
 
-        ninvl = self.add_laygo_mos(ridx, start, seg_inv)
-        pinvl = self.add_laygo_mos(ridx + 1, start, seg_inv)
-        cidx = stop - seg_inv
-        ninvr = self.add_laygo_mos(ridx, cidx, seg_inv)
-        pinvr = self.add_laygo_mos(ridx + 1, cidx, seg_inv)
-        if seg_sinv % 4 == 0:
-            start += seg_inv - seg_sinv // 2
+        if abut_mode & 1 != 0:
+            # abut on left
+            inc_coll = blk_sp
         else:
-            start += seg_inv - (seg_sinv + 2) // 2
-        nsinv = self.add_laygo_mos(ridx - 1, start, seg_sinv)
+            inc_coll = 0
+        if abut_mode & 2 != 0:
+            # abut on right
+            inc_colr = blk_sp
+        else:
+            inc_colr = 0
+
+        seg_tot = seg_inv + seg_int + seg_sr + 2 * blk_sp + inc_coll + inc_colr
+        return seg_tot, blk_sp, seg_inv, seg_int, seg_sr, inc_coll, inc_colr
+
+    def draw_layout(self):
+        row_layout_info = self.params['row_layout_info']
+        seg_dict = self.params['seg_dict'].copy()
+        tr_widths = self.params['tr_widths']
+        tr_spaces = self.params['tr_spaces']
+        en3_htr_idx = self.params['en3_htr_idx']
+        fg_min = self.params['fg_min']
+        end_mode = self.params['end_mode']
+        abut_mode = self.params['abut_mode']
+
+        # compute number of columns
+        tmp = self.get_col_info(seg_dict, abut_mode)
+        seg_tot, blk_sp, seg_inv, seg_int, seg_sr, col_inv, inc_colr = tmp
+        if fg_min > seg_tot:
+            deltal = (fg_min - seg_tot) // 4 * 2
+            col_inv += deltal
+            inc_colr += (fg_min - seg_tot - col_inv)
+            seg_tot = fg_min
+
+        self._fg_tot = seg_tot
+        self.set_rows_direct(row_layout_info, end_mode=end_mode, num_col=seg_tot)
+
+        # draw individual blocks
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        vss_w, vdd_w = _draw_substrate(self, col_inv, seg_tot, seg_tot - inc_colr - col_inv)
+        col_int = col_inv + seg_inv + blk_sp
+        col_sr = col_int + seg_int + blk_sp
+        inv_ports, inv_seg = self._draw_gate_inv(col_inv, seg_inv, seg_dict, tr_manager)
+        int_ports, int_seg = self._draw_integ_amp(col_int, seg_int, seg_dict, tr_manager)
+        sr_ports, xm_locs, sr_params = self._draw_sr_latch(col_sr, seg_sr, seg_dict, tr_manager,
+                                                           en3_htr_idx)
+
+        # connect sections
+        en, clk = self._connect_sections(inv_ports, int_ports, sr_ports)
+
+        # connect supply wires
+        vss_list = [inv_ports['VSS'], int_ports['VSS'], sr_ports['VSS']]
+        vdd_list = [inv_ports['VDD'], int_ports['VDD'], sr_ports['VDD']]
+        vss_intv = self.get_track_interval(0, 'ds')
+        vdd_intv = self.get_track_interval(self.num_rows - 1, 'ds')
+        vss = _connect_supply(self, vss_w, vss_list, vss_intv, tr_manager, round_up=False,
+                              exc_set={en3_htr_idx})
+        vdd = _connect_supply(self, vdd_w, vdd_list, vdd_intv, tr_manager, round_up=True)
+
+        # fill space
+        self.fill_space()
+
+        # add pins
+        q_warrs = [inv_ports['q'], sr_ports['q']]
+        qb_warrs = [inv_ports['qb'], sr_ports['qb']]
+        scan_s = sr_ports['scan_s']
+        self._add_div_pins(tr_manager, q_warrs, qb_warrs, xm_locs, en, clk, vdd, vss, scan_s)
+
+        # compute schematic parameters.
+        inv_seg.update(int_seg)
+        self._set_sch_params(inv_seg, sr_params)
+
+    def _draw_gate_inv(self, start, seg_tot, seg_dict, tr_manager):
+        blk_sp = seg_dict['blk_sp']
+        seg_pen = seg_dict['inv_pen']
+        seg_inv = seg_dict['inv_inv']
+
+        xleft = self.laygo_info.col_to_coord(start, unit_mode=True)
+        xright = self.laygo_info.col_to_coord(start + seg_tot, unit_mode=True)
+
+        col_inv = start + (seg_pen + 2) // 2
+        ridx = 3
+        ninvl = self.add_laygo_mos(ridx, col_inv, seg_inv)
+        pinvl = self.add_laygo_mos(ridx + 1, col_inv, seg_inv)
+        col_inv += seg_inv
+        ninvr = self.add_laygo_mos(ridx, col_inv, seg_inv)
+        pinvr = self.add_laygo_mos(ridx + 1, col_inv, seg_inv)
+        pgate = self.add_laygo_mos(ridx + 2, start, seg_tot, gate_loc='s')
+
+        # get track indices
+        hm_layer = self.conn_layer + 1
+        vm_layer = hm_layer + 1
+        hm_w_in = tr_manager.get_width(hm_layer, 'in')
+        hm_w_out = tr_manager.get_width(hm_layer, 'out')
+        vm_w_in = tr_manager.get_width(vm_layer, 'in')
+        in_start, in_stop = self.get_track_interval(3, 'g')
+        nin_locs = tr_manager.spread_wires(hm_layer, ['in', 'in'], in_stop - in_start,
+                                           'in', alignment=1, start_idx=in_start)
+        gb_idx0 = self.get_track_index(3, 'gb', 0)
+        gb_idx1 = self.get_track_index(4, 'gb', 0)
+        ntr = gb_idx1 - gb_idx0 + 1
+        out_locs = tr_manager.spread_wires(hm_layer, [1, 'out', 1, 'out', 1], ntr,
+                                           'out', alignment=0, start_idx=gb_idx0)
+        pin_idx0 = self.get_track_index(4, 'g', -1)
+        clk_idx = self.get_track_index(5, 'g', -1)
+        en_idx = clk_idx + 1
+        tleft = self.grid.coord_to_nearest_track(vm_layer, xleft, unit_mode=True, half_track=True,
+                                                 mode=1)
+        tright = self.grid.coord_to_nearest_track(vm_layer, xright, unit_mode=True, half_track=True,
+                                                  mode=-1)
+        ntr = tright - tleft + 1
+        vin_locs = tr_manager.align_wires(vm_layer, ['in', 'in'], ntr, alignment=0, start_idx=tleft)
+        xleft = self.laygo_info.col_to_coord(col_inv + seg_inv, unit_mode=True)
+        xright = self.laygo_info.col_to_coord(start + seg_tot + blk_sp, unit_mode=True)
+        tleft = self.grid.coord_to_nearest_track(vm_layer, xleft, unit_mode=True, half_track=True,
+                                                 mode=1)
+        tright = self.grid.coord_to_nearest_track(vm_layer, xright, unit_mode=True, half_track=True,
+                                                  mode=-1)
+        ntr = tright - tleft + 1
+        vout_locs = tr_manager.align_wires(vm_layer, ['in', 'in'], ntr, alignment=0,
+                                           start_idx=tleft)
+
+        # connect pmos tail
+        tid = self.make_track_id(5, 'gb', 0)
+        self.connect_to_tracks([pinvl['s'], pinvr['s'], pgate['s']], tid)
+
+        # connect outputs
+        outp = [ninvr['d'], pinvr['d']]
+        outn = [ninvl['d'], pinvl['d']]
+        outp, outn = self.connect_differential_tracks(outp, outn, hm_layer, out_locs[3],
+                                                      out_locs[1], width=hm_w_out)
+        outp, outn = self.connect_differential_tracks(outp, outn, vm_layer, vout_locs[1],
+                                                      vout_locs[0], width=vm_w_in)
+
+        # connect inputs
+        ninp, ninn = self.connect_differential_tracks(ninvl['g'], ninvr['g'], hm_layer, nin_locs[1],
+                                                      nin_locs[0], width=hm_w_in)
+        pinp, pinn = self.connect_differential_tracks(pinvl['g'], pinvr['g'], hm_layer, pin_idx0,
+                                                      pin_idx0 + 1, width=hm_w_in)
+        inp, inn = self.connect_differential_tracks([ninp, pinp], [ninn, pinn], vm_layer,
+                                                    vin_locs[0], vin_locs[1], width=vm_w_in)
+
+        # connect enables and clocks
+        num_en = (seg_pen + 2) // 4
+        pgate_warrs = pgate['g'].to_warr_list()
+        en_warrs = pgate_warrs[:num_en] + pgate_warrs[-num_en:]
+        en = self.connect_to_tracks(en_warrs, TrackID(hm_layer, en_idx))
+        clk_warrs = pgate_warrs[num_en:-num_en]
+        clk = self.connect_to_tracks(clk_warrs, TrackID(hm_layer, clk_idx))
+
+        ports = {'VDD': pgate['d'], 'VSS': [ninvl['s'], ninvr['s']],
+                 'mp': outp, 'mn': outn,
+                 'qb': inp, 'q': inn,
+                 'en': en, 'clk': clk}
+
+        inv_seg_dict = dict(
+            inv_clk=2 * seg_inv + 2,
+            inv_en=seg_pen,
+            inv_inv=seg_inv,
+        )
+        return ports, inv_seg_dict
+
+    def _draw_sr_latch(self, start, seg_tot, seg_dict, tr_manager, en_htr_idx):
+        seg_nand = seg_dict['sr_nand']
+        seg_set = seg_dict['sr_set']
+        seg_sp = seg_dict['sr_sp']
+        seg_inv = seg_dict['sr_inv']
+        seg_drv = seg_dict['sr_drv']
+        seg_pnor = seg_dict.get('sr_pnor', 1)
+        seg_nnor = seg_dict.get('sr_nnor', 2)
+        seg_sinv = seg_dict.get('sr_sinv', 2)
+        fg_nand = seg_nand * 2
+
+        if seg_set > seg_drv:
+            raise ValueError('Must have sr_set <= sr_drv')
+        if seg_pnor > seg_nand:
+            raise ValueError('Must have sr_pnor <= sr_nand.')
+        if seg_nnor % 2 == 1 or seg_sinv % 2 == 1:
+            raise ValueError('sr_nnor and sr_sinv must be even.')
+
+        # place instances
+        stop = start + seg_tot
+        ridx = 3
+        cidx = start
+        col_spl = cidx + seg_nand * 2 + 1
+        col_norl = cidx
+        nnandl = self.add_laygo_mos(ridx, cidx, seg_nand, gate_loc='s', stack=True)
+        pnandl = self.add_laygo_mos(ridx + 1, cidx, seg_nand, gate_loc='s', stack=True)
+        pnorl = self.add_laygo_mos(ridx + 2, cidx, seg_pnor, gate_loc='s', stack=True, flip=True)
+        nnor1l = self.add_laygo_mos(ridx - 1, cidx, seg_nnor)
+        nnor2l = self.add_laygo_mos(ridx - 1, cidx + seg_nnor, seg_nnor)
+        cidx = stop - fg_nand
+        col_spr = cidx - 1
+        col_norr = cidx + seg_pnor
+        nnandr = self.add_laygo_mos(ridx, cidx, seg_nand, gate_loc='s', stack=True, flip=True)
+        pnandr = self.add_laygo_mos(ridx + 1, cidx, seg_nand, gate_loc='s', stack=True, flip=True)
+        pnorr = self.add_laygo_mos(ridx + 2, cidx, seg_pnor, gate_loc='s', stack=True)
+        nnor1r = self.add_laygo_mos(ridx - 1, cidx + fg_nand - seg_nnor, seg_nnor)
+        nnor2r = self.add_laygo_mos(ridx - 1, cidx + fg_nand - 2 * seg_nnor, seg_nnor)
+        psinv = self.add_laygo_mos(ridx + 2, cidx - 1, 1)
+        start += fg_nand + seg_sp
+        stop -= fg_nand + seg_sp
+
+        ndrvl = self.add_laygo_mos(ridx, start, seg_drv)
+        setl = self.add_laygo_mos(ridx - 1, start, seg_set)
+        pdrvl = self.add_laygo_mos(ridx + 1, start, seg_drv)
+        cidx = stop - seg_drv
+        ndrvr = self.add_laygo_mos(ridx, cidx, seg_drv)
+        setr = self.add_laygo_mos(ridx - 1, cidx + seg_drv - seg_set, seg_set)
+        pdrvr = self.add_laygo_mos(ridx + 1, cidx, seg_drv)
+        start += seg_drv
+        stop -= seg_drv
+
+        ninvl = self.add_laygo_mos(ridx, start, seg_inv)
+        pinvl = self.add_laygo_mos(ridx + 1, start, seg_inv)
+        cidx = stop - seg_inv
+        ninvr = self.add_laygo_mos(ridx, cidx, seg_inv)
+        pinvr = self.add_laygo_mos(ridx + 1, cidx, seg_inv)
+        if seg_sinv % 4 == 0:
+            start += seg_inv - seg_sinv // 2
+        else:
+            start += seg_inv - (seg_sinv + 2) // 2
+        nsinv = self.add_laygo_mos(ridx - 1, start, seg_sinv)
 
         # compute track locations
         hm_layer = self.conn_layer + 1
@@ -861,6 +913,12 @@ class EnableRetimer(LaygoBase):
         # type: () -> Union[float, int]
         return self._en3_htr_tidx
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'en3_htr_tidx']
+
     @classmethod
     def get_col_info(cls, seg_dict, abut_mode):
         blk_sp = 2
@@ -942,7 +1000,7 @@ class EnableRetimer(LaygoBase):
         self.set_rows_direct(row_layout_info, end_mode=end_mode, num_col=num_col)
 
         # draw individual blocks
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         col_ff1 = col_ff0 + ncol_ff0 + blk_sp
         col_lat = col_ff1 + ncol_ff1 + blk_sp
         vss_w, vdd_w = _draw_substrate(self, col_ff0, num_col, num_col - inc_colr - col_ff0)
@@ -1206,10 +1264,22 @@ class DividerGroup(TemplateBase):
         return self._sa_clk_tidx
 
     @classmethod
-    def get_num_col(cls, seg_dict, abut_mode):
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'sa_clk_tidx']
+
+    @classmethod
+    def get_num_col(cls, seg_dict, abut_mode, fg_min=0):
+        # type: (Dict[str, int], int, int) -> int
+        """Returns the number of columns of both the divider and the retimer.
+
+        This is computed from the get_col_info() methods of both laygo blocks, so they
+        can be drawn with the same number of columns without creating any master first.
+        """
         seg_div = SinClkDivider.get_col_info(seg_dict, abut_mode)[0]
         seg_re = EnableRetimer.get_col_info(seg_dict, abut_mode)[0]
-        return max(seg_div, seg_re)
+        return max(fg_min, seg_div, seg_re)
 
     @classmethod
     def get_params_info(cls):
@@ -1275,20 +1345,20 @@ class DividerGroup(TemplateBase):
             end_mode ^= 8
             abut_mode |= 2
 
+        # both blocks use the same number of columns, so each is only drawn once.
+        fg_min = self.get_num_col(seg_dict, abut_mode, fg_min=fg_min)
         params = dict(config=config, row_layout_info=lat_row_info, seg_dict=seg_dict,
                       tr_widths=tr_widths, tr_spaces=tr_spaces, tr_info=div_tr_info, fg_min=fg_min,
                       end_mode=end_mode, abut_mode=abut_mode, div_pos_edge=clk_inverted,
                       laygo_edgel=laygo_edgel, laygo_edger=laygo_edger, show_pins=False)
         re_master = self.new_template(params=params, temp_cls=EnableRetimer)
-        params['fg_min'] = fg_min = re_master.fg_tot
         params['en3_htr_idx'] = re_master.en3_htr_tidx
         div_master = self.new_template(params=params, temp_cls=SinClkDivider)
         self._sa_clk_tidx = div_master.sa_clk_tidx
-
-        self._fg_tot = fg_tot_div = div_master.fg_tot
-        if fg_tot_div > fg_min:
-            params['fg_min'] = fg_tot_div
-            re_master = self.new_template(params=params, temp_cls=EnableRetimer)
+        self._fg_tot = div_master.fg_tot
+        if self._fg_tot != fg_min or re_master.fg_tot != fg_min:
+            raise ValueError('Divider and retimer column mismatch: %d, %d, %d' %
+                             (fg_min, self._fg_tot, re_master.fg_tot))
 
         # set this template to use the same RoutingGrid as LaygoBase
         self.grid = re_master.grid.copy()
@@ -1376,7 +1446,7 @@ class DividerGroup(TemplateBase):
         )
 
 
-class SinClkDivider(LaygoBase):
+class SinClkDivider(SinClkDividerBase):
     """A Sinusoidal clock divider using LaygoBase.
 
     Parameters
@@ -1394,27 +1464,6 @@ class SinClkDivider(LaygoBase):
         :class:`bag.layout.template.TemplateBase` for details.
     """
 
-    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
-        # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
-        LaygoBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
-        self._sch_params = None
-        self._fg_tot = None
-        self._sa_clk_tidx = None
-
-    @property
-    def sch_params(self):
-        # type: () -> Dict[str, Any]
-        return self._sch_params
-
-    @property
-    def fg_tot(self):
-        # type: () -> int
-        return self._fg_tot
-
-    @property
-    def sa_clk_tidx(self):
-        return self._sa_clk_tidx
-
     @classmethod
     def get_col_info(cls, seg_dict, abut_mode):
         # compute number of columns, then draw floorplan
@@ -1438,48 +1487,15 @@ class SinClkDivider(LaygoBase):
         seg_tot = seg_inv + seg_int + seg_sr + seg_nor + 3 * blk_sp + inc_coll + inc_colr
         return seg_tot, blk_sp, seg_inv, seg_int, seg_sr, seg_nor, inc_coll, inc_colr
 
-    @classmethod
-    def get_params_info(cls):
-        # type: () -> Dict[str, str]
-        return dict(
-            config='laygo configuration dictionary.',
-            row_layout_info='The AnalogBase layout information dictionary.',
-            seg_dict='Number of segments dictionary.',
-            tr_widths='Track width dictionary.',
-            tr_spaces='Track spacing dictionary.',
-            en3_htr_idx='Enable3 half-track index.',
-            tr_info='output track information dictionary.',
-            fg_min='Minimum number of core fingers.',
-            end_mode='The LaygoBase end_mode flag.',
-            abut_mode='The left/right abut mode flag.',
-            div_pos_edge='True to divider off of clkp.',
-            show_pins='True to show pins.',
-        )
-
-    @classmethod
-    def get_default_param_values(cls):
-        # type: () -> Dict[str, Any]
-        return dict(
-            tr_info=None,
-            fg_min=0,
-            end_mode=None,
-            abut_mode=0,
-            div_pos_edge=True,
-            show_pins=True,
-        )
-
     def draw_layout(self):
         row_layout_info = self.params['row_layout_info']
         seg_dict = self.params['seg_dict'].copy()
         tr_widths = self.params['tr_widths']
         tr_spaces = self.params['tr_spaces']
         en3_htr_idx = self.params['en3_htr_idx']
-        tr_info = self.params['tr_info']
         fg_min = self.params['fg_min']
         end_mode = self.params['end_mode']
         abut_mode = self.params['abut_mode']
-        div_pos_edge = self.params['div_pos_edge']
-        show_pins = self.params['show_pins']
 
         # compute number of columns
         tmp = self.get_col_info(seg_dict, abut_mode)
@@ -1494,7 +1510,7 @@ class SinClkDivider(LaygoBase):
         self.set_rows_direct(row_layout_info, end_mode=end_mode, num_col=seg_tot)
 
         # draw individual blocks
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         vss_w, vdd_w = _draw_substrate(self, col_inv, seg_tot, seg_tot - inc_colr - col_inv)
         col_int = col_inv + seg_inv + blk_sp
         col_sr = col_int + seg_int + blk_sp
@@ -1505,31 +1521,9 @@ class SinClkDivider(LaygoBase):
                                                            en3_htr_idx, inv_ports)
         nor_ports, nor_seg = self._draw_nor(col_nor, seg_dict, tr_manager, inv_ports)
 
-        # connect enable
-        en = self.connect_to_track_wires([inv_ports['en'], sr_ports['pen']], int_ports['en'])
-        en_vm = sr_ports['nen']
-        self.add_pin('en_vm', en_vm, label='en', show=False)
-        en.append(en_vm)
+        # connect sections
+        en, clk = self._connect_sections(inv_ports, int_ports, sr_ports)
         en.append(nor_ports['en'])
-        # connect inverters to integ amp
-        clk = self.connect_to_track_wires(inv_ports['clk'], int_ports['clk'])
-        mp = inv_ports['mp']
-        mn = inv_ports['mn']
-        tr_upper = mp.upper
-        tr_w = mp.track_id.width
-        mp_tid = mp.track_id.base_index
-        mn_tid = mn.track_id.base_index
-        self.connect_differential_tracks(int_ports['mp'], int_ports['mn'],
-                                         mp.layer_id, mp_tid, mn_tid,
-                                         width=tr_w, track_upper=tr_upper)
-
-        # connect integ amp to sr latch
-        self.connect_wires([int_ports['sb'], sr_ports['sb']])
-        self.connect_wires([int_ports['rb'], sr_ports['rb']])
-
-        # connect sr latch to inverters
-        xm_layer = self.conn_layer + 3
-        xm_w_q = tr_manager.get_width(xm_layer, 'div')
 
         # connect supply wires
         vss_list = [inv_ports['VSS'], int_ports['VSS'], sr_ports['VSS'], nor_ports['VSS']]
@@ -1543,116 +1537,16 @@ class SinClkDivider(LaygoBase):
         # fill space
         self.fill_space()
 
-        # add pins.  Connect to xm_layer if track information are given
+        # add pins
         q_warrs = nor_ports['q']
         qb_warrs = nor_ports['qb']
         scan_s = sr_ports['scan_s']
-        if tr_info is None:
-            en_lbl = 'en:'
-            q, qb = self.connect_differential_tracks(q_warrs, qb_warrs, xm_layer, xm_locs[1],
-                                                     xm_locs[0], width=xm_w_q)
-        else:
-            en_lbl = 'en'
-            q_idx, w_q = tr_info['q']
-            qb_idx = tr_info['qb'][0]
-            en_idx, w_en = tr_info['en']
-            if div_pos_edge:
-                clk_idx, w_clk = tr_info['clkp']
-                clkb_idx = tr_info['clkn'][0]
-            else:
-                clk_idx, w_clk = tr_info['clkn']
-                clkb_idx = tr_info['clkp'][0]
-            vdd_idx, w_vdd = tr_info['VDD']
-            vss_idx, w_vss = tr_info['VSS']
-            s_idx = tr_manager.get_next_track(xm_layer, en_idx, w_en, 1, up=False)
-            self._sa_clk_tidx = tr_manager.get_next_track(xm_layer, s_idx, 1, 'clk', up=False)
-
-            q, qb = self.connect_differential_tracks(q_warrs, qb_warrs, xm_layer, q_idx, qb_idx,
-                                                     width=w_q)
-            en = self.connect_to_tracks(en, TrackID(xm_layer, en_idx))
-            clk = self.connect_to_tracks(clk, TrackID(xm_layer, clk_idx, width=w_clk))
-            vdd = self.connect_to_tracks(vdd, TrackID(xm_layer, vdd_idx, width=w_vdd))
-            vss = self.connect_to_tracks(vss, TrackID(xm_layer, vss_idx, width=w_vss))
-            scan_s = self.connect_to_tracks(scan_s, TrackID(xm_layer, s_idx), min_len_mode=0)
-            # add fake port so we can match clock wires
-            clkb = self.add_wires(xm_layer, clkb_idx, clk.lower_unit, clk.upper_unit, width=w_clk,
-                                  unit_mode=True)
-            self.add_pin('clkb', clkb, show=False)
-
-        self.add_pin('q', q, show=show_pins)
-        self.add_pin('qb', qb, show=show_pins)
-        self.add_pin('en', en, label=en_lbl, show=show_pins)
-        self.add_pin('clk', clk, show=show_pins)
-        self.add_pin('VDD', vdd, show=show_pins)
-        self.add_pin('VSS', vss, show=show_pins)
-        self.add_pin('scan_s', scan_s, show=show_pins)
+        self._add_div_pins(tr_manager, q_warrs, qb_warrs, xm_locs, en, clk, vdd, vss, scan_s)
 
         # compute schematic parameters.
-        n0_info = self.get_row_info(1)
-        n1_info = self.get_row_info(2)
-        n2_info = self.get_row_info(3)
-        p0_info = self.get_row_info(4)
-        p1_info = self.get_row_info(5)
         inv_seg.update(int_seg)
         inv_seg.update(nor_seg)
-        self._sch_params = dict(
-            lch=self.laygo_info.lch,
-            w_dict=dict(
-                n0=n0_info['w_max'],
-                n1=n1_info['w_max'],
-                n2=n2_info['w_max'],
-                p0=p0_info['w_max'],
-                p1=p1_info['w_max'],
-            ),
-            th_dict=dict(
-                n0=n0_info['threshold'],
-                n1=n1_info['threshold'],
-                n2=n2_info['threshold'],
-                p0=p0_info['threshold'],
-                p1=p1_info['threshold'],
-            ),
-            seg_dict=inv_seg,
-            sr_params=sr_params,
-        )
-
-    @classmethod
-    def _get_gate_inv_info(cls, seg_dict):
-        seg_pen = seg_dict['inv_pen']
-        seg_inv = seg_dict['inv_inv']
-
-        if seg_inv % 2 != 0:
-            raise ValueError('This generator only works for even inv_inv.')
-        if seg_pen % 4 != 2:
-            raise ValueError('This generator only works for seg_pen = 2 mod 4.')
-
-        return 2 * seg_inv + (seg_pen + 2)
-
-    @classmethod
-    def _get_integ_amp_info(cls, seg_dict):
-        seg_rst = seg_dict['int_rst']
-        seg_pen = seg_dict['int_pen']
-        seg_in = seg_dict['int_in']
-
-        if seg_rst % 2 != 0 or seg_pen % 2 != 0 or seg_in % 2 != 0:
-            raise ValueError('This generator only works for even sr_inv/sr_drv/sr_sp.')
-
-        return 2 * max(seg_in, seg_rst + seg_pen)
-
-    @classmethod
-    def _get_sr_latch_info(cls, seg_dict):
-        seg_inv = seg_dict['sr_inv']
-        seg_drv = seg_dict['sr_drv']
-        seg_set = seg_dict['sr_set']
-        seg_sp = seg_dict['sr_sp']
-        seg_nand = seg_dict['sr_nand']
-
-        if seg_inv % 2 != 0 or seg_drv % 2 != 0 or seg_sp % 2 != 0:
-            raise ValueError('This generator only works for even sr_inv/sr_drv/sr_sp.')
-        if seg_sp < 2:
-            raise ValueError('sr_sp must be >= 2.')
-
-        seg_nand_set = max(seg_nand * 2, seg_set)
-        return (seg_inv + seg_drv + seg_sp + seg_nand_set) * 2
+        self._set_sch_params(inv_seg, sr_params)
 
     @classmethod
     def _get_nor_info(cls, seg_dict):
@@ -1758,107 +1652,6 @@ class SinClkDivider(LaygoBase):
         )
         return ports, inv_seg_dict
 
-    def _draw_integ_amp(self, start, seg_tot, seg_dict, tr_manager):
-        seg_rst = seg_dict['int_rst']
-        seg_pen = seg_dict['int_pen']
-        seg_in = seg_dict['int_in']
-
-        xleft = self.laygo_info.col_to_coord(start + 1, unit_mode=True)
-        xright = self.laygo_info.col_to_coord(start + seg_tot - 1, unit_mode=True)
-
-        # place instances
-        seg_single = seg_tot // 2
-        ridx = 1
-        nclk = self.add_laygo_mos(ridx, start, seg_tot)
-        nen = self.add_laygo_mos(ridx + 1, start, seg_tot, gate_loc='s')
-        col_l = start + seg_single - seg_in
-        inl = self.add_laygo_mos(ridx + 2, col_l, seg_in)
-        inr = self.add_laygo_mos(ridx + 2, col_l + seg_in, seg_in)
-        ridx = 4
-        col = start + seg_single - seg_rst - seg_pen
-        penl = self.add_laygo_mos(ridx, col, seg_pen)
-        col += seg_pen
-        rstl = self.add_laygo_mos(ridx, col, seg_rst)
-        col += seg_rst
-        rstr = self.add_laygo_mos(ridx, col, seg_rst)
-        col += seg_rst
-        penr = self.add_laygo_mos(ridx, col, seg_pen)
-
-        # get track locations
-        hm_layer = self.conn_layer + 1
-        vm_layer = hm_layer + 1
-        hm_w_tail = tr_manager.get_width(hm_layer, 'tail')
-        hm_w_in = tr_manager.get_width(hm_layer, 'in')
-        hm_w_out = tr_manager.get_width(hm_layer, 'out')
-        vm_w_out = tr_manager.get_width(vm_layer, 'out')
-        vm_w_clk = tr_manager.get_width(vm_layer, 'clk')
-        tail_off = tr_manager.place_wires(hm_layer, ['tail'])[1][0]
-        in_start, in_stop = self.get_track_interval(3, 'g')
-        in_locs = tr_manager.spread_wires(hm_layer, ['in', 'in'], in_stop - in_start,
-                                          'in', alignment=1, start_idx=in_start)
-        gb_idx0 = self.get_track_index(3, 'gb', 0)
-        gb_idx1 = self.get_track_index(4, 'gb', 0)
-        ntr = gb_idx1 - gb_idx0 + 1
-        out_locs = tr_manager.spread_wires(hm_layer, [1, 'out', 1, 'out', 1], ntr,
-                                           'out', alignment=0, start_idx=gb_idx0)
-        pg_start = self.get_track_interval(4, 'g')[0]
-        pg_locs = tr_manager.place_wires(hm_layer, [1, 1, 1, 1], start_idx=pg_start)[1]
-        tleft = self.grid.coord_to_nearest_track(vm_layer, xleft, unit_mode=True, half_track=True,
-                                                 mode=1)
-        tright = self.grid.coord_to_nearest_track(vm_layer, xright, unit_mode=True, half_track=True,
-                                                  mode=-1)
-        ntr = tright - tleft + 1
-        vm_locs = tr_manager.spread_wires(vm_layer, [1, 'out', 'clk', 'out', 1], ntr,
-                                          'out', alignment=0, start_idx=tleft)
-
-        # connect intermediate wires
-        tidx = self.get_track_index(1, 'gb', 0)
-        self.connect_to_tracks([nclk['d'], nen['d']],
-                               TrackID(hm_layer, tidx + tail_off, width=hm_w_tail))
-        tidx = self.get_track_index(2, 'gb', 0)
-        self.connect_to_tracks([nen['s'], inl['s'], inr['s']],
-                               TrackID(hm_layer, tidx + tail_off, width=hm_w_tail))
-
-        # connect gate wires
-        inp, inn = self.connect_differential_tracks(inl['g'], inr['g'], hm_layer, in_locs[1],
-                                                    in_locs[0], width=hm_w_in)
-
-        # connect enables
-        en = self.connect_to_tracks(nen['g'], self.make_track_id(2, 'g', -1))
-        enl = self.connect_to_tracks(penl['g'], TrackID(hm_layer, pg_locs[1]), min_len_mode=0)
-        enr = self.connect_to_tracks(penr['g'], TrackID(hm_layer, pg_locs[1]), min_len_mode=0)
-        enl = self.connect_to_tracks([en, enl], TrackID(vm_layer, vm_locs[0]))
-        enr = self.connect_to_tracks([en, enr], TrackID(vm_layer, vm_locs[-1]))
-
-        # connect clocks
-        clk1 = self.connect_to_tracks(nclk['g'], self.make_track_id(1, 'g', -1))
-        clk2 = self.connect_to_tracks([rstl['g'], rstr['g']], TrackID(hm_layer, pg_locs[0]))
-        clk = self.connect_to_tracks([clk1, clk2], TrackID(vm_layer, vm_locs[2], width=vm_w_clk))
-
-        # connect outputs
-        outp = [inr['d'], rstr['d'], penr['d']]
-        outn = [inl['d'], rstl['d'], penl['d']]
-        outp, outn = self.connect_differential_tracks(outp, outn, hm_layer, out_locs[3],
-                                                      out_locs[1], width=hm_w_out)
-        outp, outn = self.connect_differential_tracks(outp, outn, vm_layer, vm_locs[1], vm_locs[3],
-                                                      width=vm_w_out)
-        outp, outn = self.connect_differential_tracks(outp, outn, hm_layer, pg_locs[3],
-                                                      pg_locs[2], width=1)
-
-        ports = {'VSS': nclk['s'], 'VDD': [penl['s'], rstl['s'], rstr['s'], penr['s']],
-                 'mp': inp, 'mn': inn,
-                 'sb': outn, 'rb': outp,
-                 'en': [enl, enr], 'clk': clk}
-
-        int_seg_dict = dict(
-            int_clk=seg_tot,
-            int_en=seg_tot,
-            int_in=seg_in,
-            int_pen=seg_pen,
-            int_rst=seg_rst,
-        )
-        return ports, int_seg_dict
-
     def _draw_sr_latch(self, start, seg_tot, seg_dict, tr_manager, en_htr_idx, inv_ports):
         seg_nand = seg_dict['sr_nand']
         seg_set = seg_dict['sr_set']
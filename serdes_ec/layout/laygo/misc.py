@@ -3,12 +3,14 @@
 """This module contains miscellaneous LaygoBase generators."""
 
 
-from typing import TYPE_CHECKING, Dict, Any, Set
+from typing import TYPE_CHECKING, Dict, Any, Set, List
 
-from bag.layout.routing.base import TrackManager, TrackID
+from bag.layout.routing.base import TrackID
 
 from abs_templates_ec.laygo.core import LaygoBase
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
 
@@ -41,6 +43,12 @@ class LaygoDummy(LaygoBase):
         # type: () -> Dict[str, Any]
         return self._sch_params
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -81,7 +89,7 @@ class LaygoDummy(LaygoBase):
 
         hm_layer = self.conn_layer + 1
         xm_layer = hm_layer + 2
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         hm_w_sup = tr_manager.get_width(hm_layer, 'sup')
         xm_w_sup = tr_manager.get_width(xm_layer, 'sup')
 
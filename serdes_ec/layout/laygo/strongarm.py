@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 
-from typing import TYPE_CHECKING, Dict, Any, Set
+from typing import TYPE_CHECKING, Dict, Any, Set, List
 
-from bag.layout.routing import TrackID, TrackManager
+from bag.layout.routing import TrackID
 
 from abs_templates_ec.laygo.core import LaygoBase
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
 
@@ -48,6 +50,12 @@ class SenseAmpStrongArm(LaygoBase):
         # type: () -> int
         return self._fg_tot
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -127,7 +135,7 @@ class SenseAmpStrongArm(LaygoBase):
         th_ninv = th_dict['ninv']
         th_pinv = th_dict['pinv']
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces)
 
         # get row information
         row_list = ['ptap', 'ptap', 'nch', 'nch', 'nch', 'pch', 'ntap', 'ntap']
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines a hierarchical profiler for layout generation.
+
+Usage::
+
+    with LayoutProfiler() as prof:
+        bprj.generate_cell(block_specs, RXTop, debug=True)
+    prof.save('rxtop_prof')
+
+While a profiler is active, every master created by the template database becomes a node
+in the profile tree, and every method decorated with :func:`profile_phase` becomes a child
+node of the template that runs it.  Each node records wall time, CPU time, peak RSS increase,
+and the number of shapes, vias and instances added.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable
+
+import os
+import sys
+import json
+import time
+import resource
+import functools
+from collections import OrderedDict
+
+from bag.layout.template import TemplateDB
+
+if TYPE_CHECKING:
+    from bag.layout.template import TemplateBase
+
+# the currently active profiler
+_profiler = None  # type: Optional[LayoutProfiler]
+
+# BagLayout lists counted by each statistic.
+_count_attrs = OrderedDict([
+    ('num_shapes', ('_rect_list', '_path_list', '_polygon_list', '_blockage_list',
+                    '_boundary_list')),
+    ('num_vias', ('_via_list', '_via_primitives')),
+    ('num_insts', ('_inst_list', '_inst_primitives')),
+])
+
+# names of the layout content statistics, in the order returned by get_layout_counts().
+LAYOUT_COUNT_NAMES = tuple(_count_attrs.keys())
+
+
+def get_max_rss():
+    # type: () -> int
+    """Returns the peak resident set size of this process, in kilobytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes instead of kilobytes
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def get_layout_counts(template):
+    # type: (Optional[TemplateBase]) -> List[int]
+    """Returns the number of shapes, vias, and instances drawn in the given template."""
+    layout = None if template is None else getattr(template, '_layout', None)
+    if layout is None:
+        return [0] * len(_count_attrs)
+    return [sum(len(getattr(layout, attr, None) or ()) for attr in attr_list)
+            for attr_list in _count_attrs.values()]
+
+
+class ProfileNode(object):
+    """A node in the profile tree.
+
+    Repeated calls with the same name under the same parent are merged into one node.
+
+    Parameters
+    ----------
+    name : str
+        the node name.
+    """
+
+    def __init__(self, name):
+        # type: (str) -> None
+        self.name = name
+        self.count = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.rss_delta = 0
+        self.counts = [0] * len(_count_attrs)
+        self.children = OrderedDict()  # type: Dict[str, ProfileNode]
+
+    def get_child(self, name):
+        # type: (str) -> ProfileNode
+        """Returns the child node with the given name, creating it if necessary."""
+        node = self.children.get(name, None)
+        if node is None:
+            node = self.children[name] = ProfileNode(name)
+        return node
+
+    @property
+    def self_time(self):
+        # type: () -> float
+        """Wall time spent in this node but not in any child node."""
+        return max(0.0, self.wall_time - sum((c.wall_time for c in self.children.values())))
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        """Returns a JSON-compatible dictionary representation of this subtree."""
+        ans = OrderedDict([
+            ('name', self.name),
+            ('count', self.count),
+            ('wall_time', self.wall_time),
+            ('cpu_time', self.cpu_time),
+            ('rss_delta_kb', self.rss_delta),
+        ])
+        for key, val in zip(_count_attrs.keys(), self.counts):
+            ans[key] = val
+        ans['children'] = [c.to_dict() for c in self.children.values()]
+        return ans
+
+    def collapsed_stacks(self, prefix=''):
+        # type: (str) -> List[str]
+        """Returns the collapsed stacks of this subtree, with self time in microseconds."""
+        stack = self.name if not prefix else prefix + ';' + self.name
+        ans = ['%s %d' % (stack, int(round(self.self_time * 1e6)))]
+        for child in self.children.values():
+            ans.extend(child.collapsed_stacks(prefix=stack))
+        return ans
+
+
+class LayoutProfiler(object):
+    """A hierarchical layout generation profiler.
+
+    This profiler is a context manager.  Only one profiler can be active at a time.
+
+    Parameters
+    ----------
+    name : str
+        the root node name.
+    """
+
+    def __init__(self, name='generate_cell'):
+        # type: (str) -> None
+        self._root = ProfileNode(name)
+        self._stack = []  # type: List[ProfileNode]
+        self._old_fun = {}  # type: Dict[str, Callable]
+        self._root_start = None
+
+    @property
+    def root(self):
+        # type: () -> ProfileNode
+        return self._root
+
+    def __enter__(self):
+        # type: () -> LayoutProfiler
+        global _profiler
+        if _profiler is not None:
+            raise ValueError('Another layout profiler is already active.')
+
+        _profiler = self
+        self._stack = [self._root]
+        for fun_name in ('new_template', 'batch_layout'):
+            old_fun = getattr(TemplateDB, fun_name)
+            self._old_fun[fun_name] = old_fun
+            setattr(TemplateDB, fun_name, self._wrap_db_method(fun_name, old_fun))
+        self._root_start = self._start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _profiler
+        for fun_name, old_fun in self._old_fun.items():
+            setattr(TemplateDB, fun_name, old_fun)
+        self._old_fun.clear()
+        self._stop(self._root, self._root_start, None)
+        self._stack = []
+        _profiler = None
+
+    @classmethod
+    def _start(cls, template=None):
+        return time.perf_counter(), time.process_time(), get_max_rss(), \
+            get_layout_counts(template)
+
+    @classmethod
+    def _stop(cls, node, start_info, template):
+        wall0, cpu0, rss0, counts0 = start_info
+        node.count += 1
+        node.wall_time += time.perf_counter() - wall0
+        node.cpu_time += time.process_time() - cpu0
+        node.rss_delta += get_max_rss() - rss0
+        counts1 = get_layout_counts(template)
+        node.counts = [tot + c1 - c0 for tot, c1, c0 in zip(node.counts, counts1, counts0)]
+
+    def _wrap_db_method(self, fun_name, old_fun):
+        @functools.wraps(old_fun)
+        def wrapper(temp_db, *args, **kwargs):
+            if fun_name == 'new_template':
+                temp_cls = kwargs.get('temp_cls', None)
+                name = fun_name if temp_cls is None else temp_cls.__name__
+            else:
+                name = fun_name
+            node = self._stack[-1].get_child(name)
+            self._stack.append(node)
+            num_masters = len(getattr(temp_db, '_master_lookup', ()))
+            start_info = self._start()
+            try:
+                master = old_fun(temp_db, *args, **kwargs)
+            finally:
+                self._stack.pop()
+                self._stop(node, start_info, None)
+            if fun_name == 'new_template' and \
+                    len(getattr(temp_db, '_master_lookup', ())) > num_masters:
+                # a new master is created, attribute its content to this node.
+                node.counts = [tot + c for tot, c in zip(node.counts,
+                                                         get_layout_counts(master))]
+            return master
+
+        return wrapper
+
+    def run_phase(self, template, name, fun, *args, **kwargs):
+        # type: (TemplateBase, str, Callable, *Any, **Any) -> Any
+        """Run the given method of the given template as a profiled phase."""
+        node = self._stack[-1].get_child(name)
+        self._stack.append(node)
+        start_info = self._start(template)
+        try:
+            return fun(template, *args, **kwargs)
+        finally:
+            self._stack.pop()
+            self._stop(node, start_info, template)
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        """Returns the profile tree as a JSON-compatible dictionary."""
+        return self._root.to_dict()
+
+    def save(self, fname):
+        # type: (str) -> None
+        """Save the profile results.
+
+        Parameters
+        ----------
+        fname : str
+            the output file name, without extension.  The profile tree is written to
+            fname.json, and the collapsed stacks are written to fname.folded.  The collapsed
+            stack file can be used directly with flamegraph tools, such as flamegraph.pl or
+            speedscope.
+        """
+        dir_name = os.path.dirname(fname)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        with open(fname + '.json', 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(fname + '.folded', 'w') as f:
+            f.write('\n'.join(self._root.collapsed_stacks()))
+            f.write('\n')
+
+
+def profile_phase(fun):
+    # type: (Callable) -> Callable
+    """Decorator that marks a template method as a layout generation phase.
+
+    When no profiler is active, the method is called directly.
+    """
+    @functools.wraps(fun)
+    def wrapper(self, *args, **kwargs):
+        if _profiler is None:
+            return fun(self, *args, **kwargs)
+        return _profiler.run_phase(self, fun.__name__, fun, *args, **kwargs)
+
+    return wrapper
@@ -2,14 +2,14 @@
 
 """This module defines amplifier generators based on HybridQDRBase."""
 
-from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Union
-
-from bag.layout.routing import TrackManager
+from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Union, List
 
 from .base import HybridQDRBaseInfo, HybridQDRBase
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
+    from bag.layout.routing import RoutingGrid
 
 
 class IntegAmp(HybridQDRBase):
@@ -54,24 +54,47 @@ class IntegAmp(HybridQDRBase):
         # type: () -> Dict[str, Tuple[Union[float, int], int]]
         return self._track_info
 
+    @property
+    def vm_coord_info(self):
+        # type: () -> Tuple[Tuple[Tuple[int, int], ...], Tuple[int, int]]
+        return self._hm_intvs, self._hm_widths
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'track_info', 'vm_coord_info', 'row_layout_info',
+                'lr_edge_info', 'sd_pitch_unit']
+
     def get_vm_coord(self, vm_width, is_left, mode):
         # type: (int, bool, int) -> int
+        hm_layer = self.get_mos_conn_layer(self.grid.tech_info) + 1
+        return self.compute_vm_coord(self.grid, hm_layer, self.vm_coord_info, vm_width,
+                                     is_left, mode)
+
+    @classmethod
+    def compute_vm_coord(cls, grid, hm_layer, vm_coord_info, vm_width, is_left, mode):
+        # type: (RoutingGrid, int, Tuple[Any, Tuple[int, int]], int, bool, int) -> int
+        """Compute vertical wire coordinate from the vm_coord_info property.
+
+        This is a classmethod so that parent templates can compute coordinates from
+        cached properties without holding a reference to the master itself.
+        """
+        hm_intvs, hm_widths = vm_coord_info
         if is_left:
             idx, sgn = 0, -1
         else:
             idx, sgn = 1, 1
-        idx = 0 if is_left else 1
-        other_coord = self._hm_intvs[0][idx]
-        hm_layer = self.mos_conn_layer + 1
+        other_coord = hm_intvs[0][idx]
         if mode & 1 == 1:
-            in_coord = self._vm_coord_helper(self._hm_intvs[1][idx], hm_layer, self._hm_widths[0],
-                                             vm_width, sgn)
+            in_coord = cls._vm_coord_helper(grid, hm_intvs[1][idx], hm_layer, hm_widths[0],
+                                            vm_width, sgn)
         else:
             in_coord = other_coord
 
         if mode & 2 == 2:
-            out_coord = self._vm_coord_helper(self._hm_intvs[2][idx], hm_layer, self._hm_widths[1],
-                                              vm_width, sgn)
+            out_coord = cls._vm_coord_helper(grid, hm_intvs[2][idx], hm_layer, hm_widths[1],
+                                             vm_width, sgn)
         else:
             out_coord = other_coord
 
@@ -80,9 +103,10 @@ class IntegAmp(HybridQDRBase):
         else:
             return max(other_coord, in_coord, out_coord)
 
-    def _vm_coord_helper(self, coord, hm_layer, hm_w, vm_w, sgn):
-        sple = self.grid.get_line_end_space(hm_layer, hm_w, unit_mode=True)
-        extx = self.grid.get_via_extensions(hm_layer, hm_w, vm_w, unit_mode=True)[0]
+    @classmethod
+    def _vm_coord_helper(cls, grid, coord, hm_layer, hm_w, vm_w, sgn):
+        sple = grid.get_line_end_space(hm_layer, hm_w, unit_mode=True)
+        extx = grid.get_via_extensions(hm_layer, hm_w, vm_w, unit_mode=True)[0]
         return coord + sgn * (sple + extx)
 
     @classmethod
@@ -171,7 +195,7 @@ class IntegAmp(HybridQDRBase):
             casc_g = [1]
 
         # get track manager and wire names
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         wire_names = {
             'tail': dict(g=['clk'], ds=[1]),
             'nen': dict(g=['clk', 'en'], ds=['ntail']),
@@ -236,6 +260,10 @@ class IntegAmp(HybridQDRBase):
             if export_probe:
                 self.add_pin(name, warr, show=True)
 
+        # record enable row clock track so parents do not need to query wire IDs
+        en_clk_tid = self.get_wire_id('nch', 1, 'g', wire_name='clk')
+        self._track_info['en_clk'] = (en_clk_tid.base_index, en_clk_tid.width)
+
         nen3 = ports['nen3']
         self.add_pin('nen3', nen3, show=False)
         self._track_info['nen3'] = (nen3.track_id.base_index, nen3.track_id.width)
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, Optional, Dict, Any, Set, Tuple, List, Union
 
 import abc
 
+import numpy as np
+
 from abs_templates_ec.analog_core.base import AnalogBase, AnalogBaseInfo
 
 if TYPE_CHECKING:
@@ -270,6 +272,134 @@ class HybridQDRBaseInfo(AnalogBaseInfo):
             sd_dir_dict=sd_dir_dict,
         )
 
+    def get_integ_amp_info_batch(self, seg_arrs, fg_min=0, fg_dum=0, fg_sep_hm=0):
+        # type: (Dict[str, Any], int, int, int) -> Dict[str, Any]
+        """Compute integrating amplifier finger counts for many sizings at once.
+
+        This is the vectorized equivalent of get_integ_amp_info(), useful for screening
+        the footprint of many candidate sizings.  Only number of fingers and column
+        indices are computed; source/drain junction information is not.
+
+        Parameters
+        ----------
+        seg_arrs : Dict[str, Any]
+            a dictionary from transistor type to number of segments, with the same keys
+            as the seg_dict argument of get_integ_amp_info().  Each value is either a
+            scalar or a 1D integer array, all arrays must broadcast together.
+        fg_min : int
+            minimum number of fingers.
+        fg_dum : int
+            number of dummy fingers on each side.
+        fg_sep_hm : int
+            number of fingers separating the load reset switches.
+
+        Returns
+        -------
+        info_dict : Dict[str, Any]
+            the amplifier information dictionary.  Has the following entries:
+
+            fg_tot : np.ndarray
+                total number of fingers.
+            fg_dum : np.ndarray
+                number of dummy fingers on each side.
+            fg_sep : np.ndarray
+                number of center separation fingers.
+            col_dict : Dict[str, np.ndarray]
+                a dictionary of left side column indices of each transistor.  The
+                column index is -1 if the transistor is not present.
+        """
+        shape = np.broadcast(*(np.asarray(val) for val in seg_arrs.values())).shape
+
+        def get_arr(name, default=None):
+            val = seg_arrs[name] if default is None else seg_arrs.get(name, default)
+            return np.broadcast_to(np.asarray(val, dtype=int), shape)
+
+        seg_in = get_arr('in')
+        seg_nen = get_arr('nen')
+        seg_tail = get_arr('tail')
+
+        fg_sep_min = self.min_fg_sep
+        fg_sep_pmos = get_arr('psep', fg_sep_min)
+        fg_sep_nmos = get_arr('nsep', fg_sep_min)
+        seg_casc = get_arr('casc', 0)
+        seg_but = get_arr('but', 0)
+        seg_cap = get_arr('cap', 0)
+        stack_in = get_arr('stack_in', 1)
+        seg_load = get_arr('load', 0)
+        seg_pen = get_arr('pen', 0)
+        seg_tsw = get_arr('tsw', 0)
+
+        if np.any((seg_casc > 0) & (seg_but > 0)):
+            raise ValueError('Cannot have both cascode transistor and butterfly switch.')
+        if np.any((seg_load > 0) & (seg_but > 0)):
+            raise ValueError('Cannot have both butterfly switch and load.')
+        if np.any((seg_load > 0) & (seg_pen > 0) & (seg_pen != seg_load)):
+            raise ValueError('Must have seg_load = seg_pen if both > 0')
+
+        has_casc_but = (seg_casc > 0) | (seg_but > 0)
+        flip_load_sd = (stack_in % 2 == 0) & has_casc_but
+        fg_sep_load = np.where(flip_load_sd, max(0, fg_sep_hm), max(0, fg_sep_hm - 2))
+        fg_in = seg_in * stack_in
+
+        # calculate PMOS center transistor number of fingers
+        if self.abut_analog_mos:
+            sep_load = (fg_sep_load > 0) | (seg_load > seg_pen)
+        else:
+            sep_load = np.ones(shape, dtype=bool)
+        fg_sep_load = np.where(sep_load, np.maximum(fg_sep_load, fg_sep_pmos), 0)
+        seg_pmos = np.where(seg_pen == 0, 0, seg_pen * 2 + fg_sep_load)
+
+        fg_sep_nmos = np.where(has_casc_but, np.maximum(fg_sep_nmos, fg_sep_hm), fg_sep_nmos)
+
+        # calculate NMOS center transistor number of fingers
+        if self.abut_analog_mos:
+            seg_but_tot = 2 * seg_but
+        else:
+            seg_but_tot = np.where(seg_but > 0, 2 * seg_but + fg_sep_nmos, 0)
+
+        # calculate number of center fingers and total size
+        fg_sep_amp = np.where(seg_tsw == 0, np.maximum(fg_sep_pmos, fg_sep_nmos),
+                              2 * fg_sep_nmos + seg_tsw)
+        seg_single = np.maximum.reduce([seg_pmos, seg_casc, fg_in, seg_but_tot, seg_nen,
+                                        seg_tail])
+        seg_tot = 2 * seg_single + fg_sep_amp
+        fg_dum = np.maximum(fg_dum, -(-(fg_min - seg_tot) // 2))
+        fg_tot = seg_tot + 2 * fg_dum
+
+        # calculate number of fingers if cap option is enabled
+        fg_cap = -(-seg_cap // 2) * 2
+        fg_single_cap = np.maximum(fg_in, seg_nen) + fg_sep_nmos + fg_cap
+        fg_tot_cap = 2 * fg_single_cap + fg_sep_amp + 2 * fg_sep_min
+        delta = np.where((seg_cap > 0) & (fg_tot_cap > fg_tot),
+                         -(-(fg_tot_cap - fg_tot) // 2), 0)
+        fg_tot = fg_tot + 2 * delta
+        fg_dum = fg_dum + delta
+
+        # compute column index of each transistor
+        col_lc = fg_dum + seg_single
+        has_pen = seg_pen > 0
+        has_but = (seg_casc == 0) & (seg_but > 0)
+        col_dict = dict(
+            load0=np.where(has_pen, col_lc - seg_pmos, -1),
+            load1=np.where(has_pen, col_lc - seg_pen, -1),
+            casc=np.where(seg_casc > 0, col_lc - seg_casc, -1),
+            but0=np.where(has_but, col_lc - seg_but_tot, -1),
+            but1=np.where(has_but, col_lc - seg_but, -1),
+            tsw=col_lc + (fg_sep_amp - seg_tsw) // 2,
+            tail=col_lc - seg_tail,
+        )
+        col_dict['pen0'] = col_dict['load0']
+        col_dict['pen1'] = col_dict['load1']
+        col_dict['in'] = col_lc - fg_in
+        col_dict['nen'] = col_lc - seg_nen
+
+        return dict(
+            fg_tot=fg_tot,
+            fg_dum=fg_dum,
+            fg_sep=fg_sep_amp,
+            col_dict=col_dict,
+        )
+
 
 class HybridQDRBase(AnalogBase, metaclass=abc.ABCMeta):
     """Subclass of AnalogBase that draws QDR serdes blocks.
@@ -9,6 +9,8 @@ from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_mos.mos import DummyFillActive
 
+from ..fill import add_max_space_fill
+from ..profile import profile_phase
 from .tapx import TapXColumn
 from .offset import HighPassColumn
 from .tap1 import Tap1Column
@@ -49,6 +51,7 @@ class RXDatapath(TemplateBase):
         self._buf_locs = None
         self._retime_ncol = None
         self._en_div_tidx = None
+        self._fill_list = []
 
     @property
     def sch_params(self):
@@ -110,6 +113,19 @@ class RXDatapath(TemplateBase):
         # type: () -> Union[float, int]
         return self._en_div_tidx
 
+    @property
+    def fill_list(self):
+        # type: () -> List[Tuple[int, Tuple[int, int, int, int], Union[float, int]]]
+        return self._fill_list
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'x_tapx', 'x_tap1', 'num_dfe', 'num_ffe', 'num_hp_tapx',
+                'num_hp_tap1', 'blockage_intvs', 'sup_y_list', 'buf_locs', 'retime_ncol',
+                'en_div_tidx', 'fill_list']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -131,6 +147,7 @@ class RXDatapath(TemplateBase):
             fill_margin='space between supply fill and others.',
             x_margin='space between fill wires and left/right edge.',
             ana_options='other AnalogBase options',
+            defer_fill='True to record max space fill regions for the parent to draw.',
             show_pins='True to create pin labels.',
             export_probe='True to export probe ports.',
         )
@@ -144,6 +161,7 @@ class RXDatapath(TemplateBase):
             fill_margin=0,
             x_margin=100,
             ana_options=None,
+            defer_fill=False,
             show_pins=True,
             export_probe=False,
         )
@@ -212,6 +230,7 @@ class RXDatapath(TemplateBase):
         self._num_dfe = master_tapx.num_dfe
         self._sup_y_list = master_tapx.sup_y_list
 
+    @profile_phase
     def _do_dummy_fill(self, top_layer, tapx, tap1, offset, offlev, samp):
         res = self.grid.resolution
 
@@ -238,14 +257,17 @@ class RXDatapath(TemplateBase):
         self.add_instance(dum1, 'XDUM1', loc=(box1.left_unit, box1.bottom_unit), unit_mode=True)
         self.add_instance(dum2, 'XDUM2', loc=(box2.left_unit, box2.bottom_unit), unit_mode=True)
 
+        fill_list = self._fill_list if self.params['defer_fill'] else None
         hm_layer = top_layer - 1
+        # the gaps have no wires below hm_layer, so they can be filled with fill tiles.
         for layer in range(1, hm_layer):
-            self.do_max_space_fill(layer, bound_box=box1)
-            self.do_max_space_fill(layer, bound_box=box2)
+            add_max_space_fill(self, fill_list, layer, box1, tiled=True)
+            add_max_space_fill(self, fill_list, layer, box2, tiled=True)
 
         self.fill_box = tapx_box.merge(samp_box)
-        self.do_max_space_fill(hm_layer, self.fill_box, fill_pitch=2)
+        add_max_space_fill(self, fill_list, hm_layer, self.fill_box, fill_pitch=2)
 
+    @profile_phase
     def _connect_supplies(self, tapx, tap1, offset, offlev, samp, show_pins):
         fill_w = self.params['fill_w']
         fill_sp = self.params['fill_sp']
@@ -283,6 +305,7 @@ class RXDatapath(TemplateBase):
         self.add_pin('VDD_re', samp.get_all_port_pins('VDD_re'), label='VDD', show=False)
         self.add_pin('VSS_re', samp.get_all_port_pins('VSS_re'), label='VSS', show=False)
 
+    @profile_phase
     def _export_pins(self, tapx, tap1, offset, offlev, samp, show_pins):
 
         # reexport common ports
@@ -349,6 +372,7 @@ class RXDatapath(TemplateBase):
             self.reexport(samp.get_port('data' + off_suf), show=show_pins)
             self.reexport(samp.get_port('dlev' + off_suf), show=show_pins)
 
+    @profile_phase
     def _connect_signals(self, tapx, tap1, offset, offlev, samp, show_pins, export_probe):
         # connect input/outputs that are track-aligned by construction
         io_list2 = [[], [], []]
@@ -424,6 +448,7 @@ class RXDatapath(TemplateBase):
                 self.add_pin('outp_dlev' + out_suf, outp_lev, show=show_pins)
                 self.add_pin('outn_dlev' + out_suf, outn_lev, show=show_pins)
 
+    @profile_phase
     def _create_masters(self, export_probe):
         config = self.params['config']
         ptap_w = self.params['ptap_w']
@@ -2,15 +2,16 @@
 
 """This module defines classes for Hybrid-QDR offset cancellation/dlev."""
 
-from typing import TYPE_CHECKING, Dict, Any, Set
+from typing import TYPE_CHECKING, Dict, Any, Set, List
 
-from bag.layout.routing import TrackManager
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_core.base import AnalogBaseEnd
 
 from analog_ec.layout.passives.filter.highpass import HighPassDiff
 
+from ..util import CachedTrackManager
+
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
 
@@ -43,6 +44,12 @@ class HighPassColumn(TemplateBase):
         # type: () -> Dict[str, Any]
         return self._sch_params
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -107,7 +114,7 @@ class HighPassColumn(TemplateBase):
         sub_tids = self.params['sub_tids']
         show_pins = self.params['show_pins']
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         sub_tr_w = tr_manager.get_width(top_layer - 1, 'sup')
 
         rc_params = dict(w=w, h_unit=h_unit, sub_w=ptap_w, sub_lch=lch, sub_type='ptap',
@@ -2,12 +2,12 @@
 
 """This module defines classes for Hybrid-QDR sampler/retimer."""
 
-from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Union, List
 
 from itertools import chain
 
 from bag.layout.util import BBox
-from bag.layout.routing.base import TrackManager, TrackID
+from bag.layout.routing.base import TrackID
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_core.base import AnalogBase, AnalogBaseEnd
@@ -20,6 +20,7 @@ from ..laygo.misc import LaygoDummy
 from ..laygo.strongarm import SenseAmpStrongArm
 from ..laygo.divider import DividerGroup
 from ..digital.buffer import BufferArray
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -58,6 +59,12 @@ class SenseAmpColumn(TemplateBase):
         # type: () -> Dict[str, Any]
         return self._sch_params
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -225,6 +232,12 @@ class DividerColumn(TemplateBase):
     def sa_clk_tidx(self):
         return self._sa_clk_tidx
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'sa_clk_tidx']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -400,7 +413,7 @@ class DividerColumn(TemplateBase):
             self.add_pin('en2', en2_warrs, show=show_pins)
         else:
             top_layer += 1
-            tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+            tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
             tr_w = tr_manager.get_width(top_layer, 'clk')
             if en2_tr_idx == 'default':
                 en2_tr_idx = self.grid.coord_to_nearest_track(top_layer, bnd_box.xc_unit,
@@ -482,6 +495,12 @@ class Retimer(StdDigitalTemplate):
         # type: () -> Tuple[Union[int, float], Union[int, float]]
         return self._rt_clk_tids
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'num_cols', 'lr_vm_tidx', 'rt_col', 'rt_clk_tids']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -535,7 +554,7 @@ class Retimer(StdDigitalTemplate):
         # compute track locations
         hm_layer = self.conn_layer + 1
         ym_layer = hm_layer + 1
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         clk0_tidx = lat0_master.get_port('clkb').get_pins()[0].track_id.base_index
         clk1_tidx = tr_manager.get_next_track(ym_layer, clk0_tidx, 'clk', 'clk', up=False)
         clk2_tidx = tr_manager.get_next_track(ym_layer, clk1_tidx, 'clk', 'clk', up=False)
@@ -743,6 +762,12 @@ class RetimerClkBuffer(StdDigitalTemplate):
     def r_vm_tidx(self):
         return self._r_vm_tidx
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'num_cols', 'r_vm_tidx']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -878,6 +903,12 @@ class RetimerColumn(StdDigitalTemplate):
         # type: () -> int
         return self._xsup
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'sig_locs', 'xsup']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -979,7 +1010,7 @@ class RetimerColumn(StdDigitalTemplate):
                         dlev_inst.translate_master_track(vm_layer, dlev_master.lr_vm_tidx[1]),
                         buf_inst.translate_master_track(vm_layer, buf_master.r_vm_tidx))
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         sup_w = tr_manager.get_width(vm_layer, 'sup')
         _, r_locs = tr_manager.place_wires(vm_layer, ['sig', 'sup', 'sup', 'sup', 'sup'])
         deltar = r_vm_tidx - r_locs[0]
@@ -1059,6 +1090,12 @@ class SamplerColumn(TemplateBase):
         # type: () -> int
         return self._retime_ncol
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'buf_locs', 'retime_ncol']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -1108,7 +1145,7 @@ class SamplerColumn(TemplateBase):
 
         # compute retimer placement
         vm_layer = re_master.conn_layer + 2
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
 
         tr0 = self.grid.coord_to_nearest_track(vm_layer, x0, half_track=True,
                                                mode=1, unit_mode=True)
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Dict, Any, Set, List, Union, Tuple
 from itertools import chain
 
 from bag.layout.util import BBox
-from bag.layout.routing import TrackManager, TrackID
+from bag.layout.routing import TrackID
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_core.base import AnalogBaseEnd
@@ -15,6 +15,7 @@ from abs_templates_ec.analog_core.base import AnalogBaseEnd
 from .base import HybridQDRBaseInfo, HybridQDRBase
 from .amp import IntegAmp
 from ..laygo.divider import DividerGroup
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -54,6 +55,12 @@ class Tap1SummerRow(HybridQDRBase):
         # type: () -> int
         return self._fg_tot
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'row_layout_info', 'lr_edge_info']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -111,7 +118,7 @@ class Tap1SummerRow(HybridQDRBase):
         end_mode = 12
 
         # get track manager and wire names
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         wire_names = {
             'tail': dict(g=['clk'], ds=['ntail']),
             'nen': dict(g=['en'], ds=['ntail']),
@@ -235,6 +242,9 @@ class Tap1Summer(TemplateBase):
         self._lat_row_info = None
         self._left_edge_info = None
         self._div_grp_loc = None
+        self._in_tr_info = None
+        self._out_tr_info = None
+        self._vdd_xr = None
 
     @property
     def sch_params(self):
@@ -285,6 +295,29 @@ class Tap1Summer(TemplateBase):
         # type: () -> Tuple[int, int]
         return self._div_grp_loc
 
+    @property
+    def in_tr_info(self):
+        # type: () -> Tuple[Union[int, float], Union[int, float], int]
+        return self._in_tr_info
+
+    @property
+    def out_tr_info(self):
+        # type: () -> Tuple[Union[int, float], Union[int, float], int]
+        return self._out_tr_info
+
+    @property
+    def vdd_xr(self):
+        # type: () -> int
+        return self._vdd_xr
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'fg_tot', 'fg_core', 'en_locs', 'data_tr_info', 'div_tr_info',
+                'sum_row_info', 'lat_row_info', 'left_edge_info', 'div_grp_loc', 'in_tr_info',
+                'out_tr_info', 'vdd_xr']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -306,6 +339,7 @@ class Tap1Summer(TemplateBase):
             sup_tids='supply tracks information for a summer.',
             sch_hp_params='Schematic high-pass filter parameters.',
             show_pins='True to create pin labels.',
+            dry_run='True to only compute floorplan and properties, without adding instances.',
         )
 
     @classmethod
@@ -317,6 +351,7 @@ class Tap1Summer(TemplateBase):
             sup_tids=None,
             sch_hp_params=None,
             show_pins=True,
+            dry_run=False,
         )
 
     def draw_layout(self):
@@ -324,29 +359,81 @@ class Tap1Summer(TemplateBase):
         tr_widths = self.params['tr_widths']
         tr_spaces = self.params['tr_spaces']
         show_pins = self.params['show_pins']
+        dry_run = self.params['dry_run']
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         l_master, m_master = self._make_masters(tr_manager)
 
         ml_margin, mr_margin = m_master.layout_info.edge_margins
         m_arr_box = m_master.array_box
         m_bnd_box = m_master.bound_box
-        # place instances
+        # compute instance locations
         top_layer = m_master.top_layer
-        m_inst = self.add_instance(m_master, 'XMAIN', loc=(0, 0), unit_mode=True)
         y_lat = m_arr_box.top_unit + l_master.array_box.top_unit
         x_lat = m_bnd_box.right_unit - mr_margin - l_master.array_box.right_unit
-        l_inst = self.add_instance(l_master, 'XLAT', loc=(x_lat, y_lat),
-                                   orient='MX', unit_mode=True)
         self._div_grp_loc = (ml_margin, m_arr_box.top_unit)
 
         # set size
-        l_bnd_box = l_inst.bound_box
-        self.array_box = m_arr_box.extend(y=l_inst.array_box.top_unit, unit_mode=True)
+        l_arr_box = l_master.array_box.transform(loc=(x_lat, y_lat), orient='MX', unit_mode=True)
+        l_bnd_box = l_master.bound_box.transform(loc=(x_lat, y_lat), orient='MX', unit_mode=True)
+        self.array_box = m_arr_box.extend(y=l_arr_box.top_unit, unit_mode=True)
         self.fill_box = bnd_box = m_bnd_box.extend(y=l_bnd_box.top_unit, unit_mode=True)
         self.set_size_from_bound_box(top_layer, bnd_box)
         self.add_cell_boundary(bnd_box)
 
+        # set schematic parameters and properties that only depend on the masters
+        self._sch_params = dict(
+            sum_params=m_master.sch_params,
+            lat_params=l_master.sch_params,
+        )
+        self._fg_tot = m_master.fg_tot
+        m_tr_info = l_master.track_info
+        en3_info = m_tr_info['nen3']
+        self._div_tr_info = dict(
+            VDD=m_tr_info['VDD'],
+            VSS=m_tr_info['VSS'],
+            q=m_tr_info['inp'],
+            qb=m_tr_info['inn'],
+            en=(en3_info[0] - 2, en3_info[1]),
+            clkp=m_tr_info['clkp'],
+            clkn=m_tr_info['clkn'],
+            inp=m_tr_info['inp'],
+            inn=m_tr_info['inn'],
+            outp=m_tr_info['outp'],
+            outn=m_tr_info['outn'],
+            foot=m_tr_info['foot'],
+            tail=m_tr_info['tail'],
+        )
+        self._sum_row_info = m_master.row_layout_info
+        self._lat_row_info = l_master.row_layout_info
+        self._left_edge_info = l_master.lr_edge_info[0]
+        inp = m_master.get_port('inp').get_pins()[0].track_id
+        inn = m_master.get_port('inn').get_pins()[0].track_id
+        outp = m_master.get_port('outp').get_pins()[0].track_id
+        outn = m_master.get_port('outn').get_pins()[0].track_id
+        self._in_tr_info = (inp.base_index, inn.base_index, inp.width)
+        self._out_tr_info = (outp.base_index, outn.base_index, outp.width)
+        self._vdd_xr = max(warr.upper_unit for warr in m_master.get_port('VDD').get_pins())
+
+        if dry_run:
+            # floorplan only, compute latch track locations from the latch master
+            hm_layer = top_layer - 1
+            in_xl = l_master.get_port('inp').get_pins()[0].lower_unit + x_lat
+            self._en_locs = self._get_en_locs(hm_layer, m_tr_info['inp'][1], in_xl, tr_manager)
+            outp_idx, out_w = m_tr_info['outp']
+            outn_idx = m_tr_info['outn'][0]
+            outp_idx = self.grid.transform_track(hm_layer, outp_idx, dy=y_lat, orient='MX',
+                                                 unit_mode=True)
+            outn_idx = self.grid.transform_track(hm_layer, outn_idx, dy=y_lat, orient='MX',
+                                                 unit_mode=True)
+            self._data_tr_info = (outp_idx, outn_idx, out_w)
+            return
+
+        # place instances
+        m_inst = self.add_instance(m_master, 'XMAIN', loc=(0, 0), unit_mode=True)
+        l_inst = self.add_instance(l_master, 'XLAT', loc=(x_lat, y_lat),
+                                   orient='MX', unit_mode=True)
+
         # export pins in-place
         exp_list = [(m_inst, 'outp', 'outp_m', True), (m_inst, 'outn', 'outn_m', True),
                     (m_inst, 'inp', 'inp', False), (m_inst, 'inn', 'inn', False),
@@ -370,51 +457,23 @@ class Tap1Summer(TemplateBase):
             if inst is m_inst and (port_name == 'outp' or port_name == 'outn'):
                 self.reexport(port, net_name=port_name + '_main', show=False)
 
-        self._en_locs = self._get_en_locs(l_inst, tr_manager)
+        inp_warr = l_inst.get_pin('inp')
+        self._en_locs = self._get_en_locs(inp_warr.track_id.layer_id, inp_warr.track_id.width,
+                                          inp_warr.lower_unit, tr_manager)
 
         for lay_id in range(1, top_layer - 1):
             self.do_max_space_fill(lay_id, bound_box=l_bnd_box, fill_pitch=1.5)
 
-        # set schematic parameters
         l_outp_tid = l_inst.get_pin('outp').track_id
-        self._sch_params = dict(
-            sum_params=m_master.sch_params,
-            lat_params=l_master.sch_params,
-        )
-        self._fg_tot = m_master.fg_tot
         self._data_tr_info = (l_outp_tid.base_index, l_inst.get_pin('outn').track_id.base_index,
                               l_outp_tid.width)
-        m_tr_info = l_master.track_info
-        en3_info = m_tr_info['nen3']
-        tr_info = dict(
-            VDD=m_tr_info['VDD'],
-            VSS=m_tr_info['VSS'],
-            q=m_tr_info['inp'],
-            qb=m_tr_info['inn'],
-            en=(en3_info[0] - 2, en3_info[1]),
-            clkp=m_tr_info['clkp'],
-            clkn=m_tr_info['clkn'],
-            inp=m_tr_info['inp'],
-            inn=m_tr_info['inn'],
-            outp=m_tr_info['outp'],
-            outn=m_tr_info['outn'],
-            foot=m_tr_info['foot'],
-            tail=m_tr_info['tail'],
-        )
-        self._div_tr_info = tr_info
-        self._sum_row_info = m_master.row_layout_info
-        self._lat_row_info = l_master.row_layout_info
-        self._left_edge_info = l_master.lr_edge_info[0]
 
-    def _get_en_locs(self, l_inst, tr_manager):
+    def _get_en_locs(self, hm_layer, in_w, in_xl, tr_manager):
+        # type: (int, int, int, CachedTrackManager) -> List[Union[int, float]]
 
         # compute metal 5 enable track locations
-        inp_warr = l_inst.get_pin('inp')
-        hm_layer = inp_warr.track_id.layer_id
         vm_layer = hm_layer + 1
-        in_w = inp_warr.track_id.width
         tr_w = tr_manager.get_width(vm_layer, 'en')
-        in_xl = inp_warr.lower_unit
         via_ext = self.grid.get_via_extensions(hm_layer, in_w, tr_w, unit_mode=True)[0]
         sp_le = self.grid.get_line_end_space(hm_layer, in_w, unit_mode=True)
         ntr, tr_locs = tr_manager.place_wires(vm_layer, ['en'] * 4)
@@ -540,6 +599,13 @@ class Tap1Column(TemplateBase):
     def blockage_intvs(self):
         return self._blockage_intvs
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'in_tr_info', 'out_tr_info', 'data_tr_info', 'div_tr_info',
+                'sum_row_info', 'lat_row_info', 'blockage_intvs']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -563,6 +629,7 @@ class Tap1Column(TemplateBase):
             sch_hp_params='Schematic high-pass filter parameters.',
             show_pins='True to create pin labels.',
             export_probe='True to export probe ports.',
+            dry_run='True to only compute floorplan and properties, without routing.',
         )
 
     @classmethod
@@ -575,6 +642,7 @@ class Tap1Column(TemplateBase):
             sch_hp_params=None,
             show_pins=True,
             export_probe=False,
+            dry_run=False,
         )
 
     def draw_layout(self):
@@ -583,28 +651,45 @@ class Tap1Column(TemplateBase):
         tr_spaces = self.params['tr_spaces']
         show_pins = self.params['show_pins']
         export_probe = self.params['export_probe']
+        dry_run = self.params['dry_run']
 
-        sum_master, end_row_master, div2_master, div3_master = self._make_masters()
+        sum_master, end_row_master, div2_master, div3_master = self._make_masters(dry_run)
 
         end_row_box = end_row_master.array_box
         sum_arr_box = sum_master.array_box
 
-        # place instances
+        # compute instance locations
         vm_layer = top_layer = sum_master.top_layer
-        bot_row = self.add_instance(end_row_master, 'XROWB', loc=(0, 0), unit_mode=True)
-        y1 = ycur = end_row_box.top_unit
-        inst1 = self.add_instance(sum_master, 'X1', loc=(0, ycur), unit_mode=True)
-        ycur += sum_arr_box.top_unit + sum_arr_box.top_unit
-        inst2 = self.add_instance(sum_master, 'X2', loc=(0, ycur), orient='MX', unit_mode=True)
-        inst0 = self.add_instance(sum_master, 'X0', loc=(0, ycur), unit_mode=True)
-        y3 = ycur = ycur + sum_arr_box.top_unit + sum_arr_box.top_unit
-        inst3 = self.add_instance(sum_master, 'X3', loc=(0, ycur), orient='MX', unit_mode=True)
-        ycur += end_row_box.top_unit
-        top_row = self.add_instance(end_row_master, 'XROWT', loc=(0, ycur), orient='MX',
-                                    unit_mode=True)
+        y1 = end_row_box.top_unit
+        y2 = y1 + sum_arr_box.top_unit + sum_arr_box.top_unit
+        y3 = y2 + sum_arr_box.top_unit + sum_arr_box.top_unit
+        y4 = y3 + end_row_box.top_unit
+        bot_row_box = end_row_master.bound_box
+        top_row_box = bot_row_box.transform(loc=(0, y4), orient='MX', unit_mode=True)
+        sum_fill_box = sum_master.fill_box
+        fill_box1 = sum_fill_box.move_by(dy=y1, unit_mode=True)
+        fill_box3 = sum_fill_box.transform(loc=(0, y3), orient='MX', unit_mode=True)
+        self.fill_box = fill_box1.merge(fill_box3)
+        blockage_y = [0, top_row_box.top_unit]
+
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        if dry_run:
+            # floorplan only, skip all instances and routing.  The output tracks are
+            # placed to the right of the summer VDD wires.
+            out_locs = self._get_out_locs(tr_manager, vm_layer, sum_master.vdd_xr)
+            self._set_floorplan(tr_manager, vm_layer, sum_master.en_locs, out_locs, bot_row_box,
+                                top_row_box)
+            self._set_properties(sum_master, div3_master, export_probe)
+            return
+
+        # place instances
+        self.add_instance(end_row_master, 'XROWB', loc=(0, 0), unit_mode=True)
+        inst1 = self.add_instance(sum_master, 'X1', loc=(0, y1), unit_mode=True)
+        inst2 = self.add_instance(sum_master, 'X2', loc=(0, y2), orient='MX', unit_mode=True)
+        inst0 = self.add_instance(sum_master, 'X0', loc=(0, y2), unit_mode=True)
+        inst3 = self.add_instance(sum_master, 'X3', loc=(0, y3), orient='MX', unit_mode=True)
+        self.add_instance(end_row_master, 'XROWT', loc=(0, y4), orient='MX', unit_mode=True)
         inst_list = [inst0, inst1, inst2, inst3]
-        self.fill_box = inst1.fill_box.merge(inst3.fill_box)
-        blockage_y = [0, top_row.bound_box.top_unit]
 
         div_grp_x0, div_grp_y0 = sum_master.div_grp_loc
         div_grp_x = div_grp_x0 - div3_master.array_box.left_unit
@@ -614,15 +699,12 @@ class Tap1Column(TemplateBase):
                                       unit_mode=True)
         div2_inst = self.add_instance(div2_master, 'XDIV2', loc=(div_grp_x, div_grp_y2),
                                       orient='MX', unit_mode=True)
-
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        div_insts = [div3_inst, div2_inst]
 
         # re-export supply pins
-        vdd_list = list(chain(div3_inst.port_pins_iter('VDD'),
-                              div2_inst.port_pins_iter('VDD'),
+        vdd_list = list(chain(*(inst.port_pins_iter('VDD') for inst in div_insts),
                               *(inst.port_pins_iter('VDD') for inst in inst_list)))
-        vss_list = list(chain(div3_inst.port_pins_iter('VSS'),
-                              div2_inst.port_pins_iter('VSS'),
+        vss_list = list(chain(*(inst.port_pins_iter('VSS') for inst in div_insts),
                               *(inst.port_pins_iter('VSS') for inst in inst_list)))
         vdd_list = self.connect_wires(vdd_list)
         vss_list = self.connect_wires(vss_list)
@@ -631,10 +713,8 @@ class Tap1Column(TemplateBase):
 
         # draw wires
         # compute output wire tracks
-        xr = vdd_list[0].upper_unit
-        tidx0 = self.grid.find_next_track(vm_layer, xr, mode=1, unit_mode=True)
-        _, out_locs = tr_manager.place_wires(vm_layer, [1, 'out', 'out', 1, 'out', 'out',
-                                                        1, 'out', 'out', 1], start_idx=tidx0)
+        out_locs = self._get_out_locs(tr_manager, vm_layer, vdd_list[0].upper_unit)
+        sh_pitch = out_locs[3] - out_locs[0]
 
         # re-export ports, and gather wires
         outp_warrs = [[], [], [], []]
@@ -694,16 +774,7 @@ class Tap1Column(TemplateBase):
 
         # draw clock/bias_f wires
         vm_w_clk = tr_manager.get_width(vm_layer, 'clk')
-        start_idx0 = en_locs[3] - (vm_w_en - 1) / 2
-        ntr = out_locs[0] + 1 - start_idx0
-        try:
-            clk_locs = tr_manager.spread_wires(vm_layer, ['en', 1, 'clk', 'clk', 'clk', 'clk', 1],
-                                               ntr, ('clk', ''), alignment=1, start_idx=start_idx0)
-        except ValueError:
-            sp_min = self.grid.get_num_space_tracks(vm_layer, vm_w_clk, half_space=True)
-            clk_locs = tr_manager.spread_wires(vm_layer, ['en', 1, 'clk', 'clk', 'clk', 'clk', 1],
-                                               ntr, ('clk', ''), alignment=1, start_idx=start_idx0,
-                                               sp_override={('clk', 'clk'): {vm_layer: sp_min}})
+        clk_locs = self._get_clk_locs(tr_manager, vm_layer, en_locs, out_locs)
 
         clkn, clkp = self.connect_differential_tracks(clk_warrs[1], clk_warrs[0], vm_layer,
                                                       clk_locs[2], clk_locs[5], width=vm_w_clk)
@@ -721,12 +792,8 @@ class Tap1Column(TemplateBase):
         self.add_pin('bias_f<3>', bf3, show=show_pins, edge_mode=1)
 
         # compute bias_m/bias_d wires locations
-        shield_tidr = tr_manager.get_next_track(vm_layer, en_locs[0], 'en', 1, up=False)
-        sp_clk = clk_locs[3] - clk_locs[2]
-        sp_clk_shield = clk_locs[2] - clk_locs[1]
-        right_tidx = shield_tidr - sp_clk_shield
-        bias_locs = [right_tidx + idx * sp_clk for idx in range(-3, 1, 1)]
-        shield_tidl = bias_locs[0] - sp_clk_shield
+        tmp = self._get_bias_locs(tr_manager, vm_layer, en_locs, clk_locs)
+        bias_locs, shield_tidl, shield_tidr, sp_clk_shield = tmp
         # draw shields
         self._blockage_intvs = []
         sh_tid = TrackID(vm_layer, shield_tidl, num=2, pitch=shield_tidr - shield_tidl)
@@ -736,7 +803,6 @@ class Tap1Column(TemplateBase):
         self._blockage_intvs.append(sh_box.get_interval('x', unit_mode=True))
         self.add_pin('VSS', sh_warrs, show=show_pins)
 
-        sh_pitch = out_locs[3] - out_locs[0]
         out_sh_tid = TrackID(vm_layer, out_locs[0] + sh_pitch, num=2, pitch=sh_pitch)
         sh_warrs = self.connect_to_tracks(vdd_list, out_sh_tid, track_lower=tr_lower,
                                           track_upper=tr_upper, unit_mode=True)
@@ -771,14 +837,7 @@ class Tap1Column(TemplateBase):
         blockage_y[1] = min(blockage_y[1], bd2.lower_unit)
         self.add_pin('bias_d<3>', bd3, show=show_pins, edge_mode=1)
 
-        # set size
-        bnd_box = bot_row.bound_box.merge(top_row.bound_box)
-        bnd_xr = self.grid.track_to_coord(vm_layer, out_locs[0] + 2 * sh_pitch + 0.5,
-                                          unit_mode=True)
-        bnd_box = bnd_box.extend(x=bnd_xr, unit_mode=True)
-        self.set_size_from_bound_box(top_layer, bnd_box)
-        self.array_box = bnd_box
-        self.add_cell_boundary(bnd_box)
+        bnd_box = self._set_size(top_layer, out_locs, bot_row_box, top_row_box)
 
         # mark blockages
         res = self.grid.resolution
@@ -802,6 +861,73 @@ class Tap1Column(TemplateBase):
         en_div = self.connect_to_tracks(div3_inst.get_pin('in'), en_div_tid, min_len_mode=1)
         self.add_pin('en_div', en_div, show=show_pins)
 
+        self._set_properties(sum_master, div3_master, export_probe)
+
+    def _get_out_locs(self, tr_manager, vm_layer, xr):
+        # type: (CachedTrackManager, int, int) -> List[Union[float, int]]
+        """Returns the output wire and shield tracks to the right of the given coordinate."""
+        tidx0 = self.grid.find_next_track(vm_layer, xr, mode=1, unit_mode=True)
+        _, out_locs = tr_manager.place_wires(vm_layer, [1, 'out', 'out', 1, 'out', 'out',
+                                                        1, 'out', 'out', 1], start_idx=tidx0)
+        return out_locs
+
+    def _get_clk_locs(self, tr_manager, vm_layer, en_locs, out_locs):
+        vm_w_en = tr_manager.get_width(vm_layer, 'en')
+        vm_w_clk = tr_manager.get_width(vm_layer, 'clk')
+        start_idx0 = en_locs[3] - (vm_w_en - 1) / 2
+        ntr = out_locs[0] + 1 - start_idx0
+        try:
+            clk_locs = tr_manager.spread_wires(vm_layer, ['en', 1, 'clk', 'clk', 'clk', 'clk', 1],
+                                               ntr, ('clk', ''), alignment=1, start_idx=start_idx0)
+        except ValueError:
+            sp_min = self.grid.get_num_space_tracks(vm_layer, vm_w_clk, half_space=True)
+            clk_locs = tr_manager.spread_wires(vm_layer, ['en', 1, 'clk', 'clk', 'clk', 'clk', 1],
+                                               ntr, ('clk', ''), alignment=1, start_idx=start_idx0,
+                                               sp_override={('clk', 'clk'): {vm_layer: sp_min}})
+        return clk_locs
+
+    @classmethod
+    def _get_bias_locs(cls, tr_manager, vm_layer, en_locs, clk_locs):
+        shield_tidr = tr_manager.get_next_track(vm_layer, en_locs[0], 'en', 1, up=False)
+        sp_clk = clk_locs[3] - clk_locs[2]
+        sp_clk_shield = clk_locs[2] - clk_locs[1]
+        right_tidx = shield_tidr - sp_clk_shield
+        bias_locs = [right_tidx + idx * sp_clk for idx in range(-3, 1, 1)]
+        shield_tidl = bias_locs[0] - sp_clk_shield
+        return bias_locs, shield_tidl, shield_tidr, sp_clk_shield
+
+    def _set_floorplan(self, tr_manager, vm_layer, en_locs, out_locs, bot_row_box,
+                       top_row_box):
+        """Set size and blockage intervals without drawing any wires."""
+        grid = self.grid
+        clk_locs = self._get_clk_locs(tr_manager, vm_layer, en_locs, out_locs)
+        _, shield_tidl, shield_tidr, _ = self._get_bias_locs(tr_manager, vm_layer, en_locs,
+                                                             clk_locs)
+
+        # blockages are the VSS shields and the clock VDD shields
+        self._blockage_intvs = [
+            (grid.get_wire_bounds(vm_layer, shield_tidl, unit_mode=True)[0],
+             grid.get_wire_bounds(vm_layer, shield_tidr, unit_mode=True)[1]),
+            (grid.get_wire_bounds(vm_layer, clk_locs[1], unit_mode=True)[0],
+             grid.get_wire_bounds(vm_layer, out_locs[0], unit_mode=True)[1]),
+        ]
+
+        self._set_size(vm_layer, out_locs, bot_row_box, top_row_box)
+
+    def _set_size(self, vm_layer, out_locs, bot_row_box, top_row_box):
+        # type: (int, List[Union[float, int]], BBox, BBox) -> BBox
+        """Set size to include the output shields, and returns the bounding box."""
+        sh_pitch = out_locs[3] - out_locs[0]
+        bnd_box = bot_row_box.merge(top_row_box)
+        bnd_xr = self.grid.track_to_coord(vm_layer, out_locs[0] + 2 * sh_pitch + 0.5,
+                                          unit_mode=True)
+        bnd_box = bnd_box.extend(x=bnd_xr, unit_mode=True)
+        self.set_size_from_bound_box(vm_layer, bnd_box)
+        self.array_box = bnd_box
+        self.add_cell_boundary(bnd_box)
+        return bnd_box
+
+    def _set_properties(self, sum_master, div3_master, export_probe):
         # set schematic parameters
         self._sch_params = dict(
             sum_params=sum_master.sch_params['sum_params'],
@@ -809,18 +935,14 @@ class Tap1Column(TemplateBase):
             div_params=div3_master.sch_params,
             export_probe=export_probe,
         )
-        inp = sum_master.get_port('inp').get_pins()[0].track_id
-        inn = sum_master.get_port('inn').get_pins()[0].track_id
-        outp_m = sum_master.get_port('outp_m').get_pins()[0].track_id
-        outn_m = sum_master.get_port('outn_m').get_pins()[0].track_id
-        self._in_tr_info = (inp.base_index, inn.base_index, inp.width)
-        self._out_tr_info = (outp_m.base_index, outn_m.base_index, outp_m.width)
+        self._in_tr_info = sum_master.in_tr_info
+        self._out_tr_info = sum_master.out_tr_info
         self._data_tr_info = sum_master.data_tr_info
         self._div_tr_info = sum_master.div_tr_info
         self._sum_row_info = sum_master.sum_row_info
         self._lat_row_info = sum_master.lat_row_info
 
-    def _make_masters(self):
+    def _make_masters(self, dry_run):
         # get parameters
         config = self.params['config']
         lch = self.params['lch']
@@ -865,8 +987,12 @@ class Tap1Column(TemplateBase):
             show_pins=False,
         )
         div3_master = self.new_template(params=div_params, temp_cls=DividerGroup)
-        div_params['re_dummy'] = True
-        div_params['clk_inverted'] = True
-        div2_master = self.new_template(params=div_params, temp_cls=DividerGroup)
+        if dry_run:
+            # the second divider group has the same footprint, and is only needed for routing.
+            div2_master = None
+        else:
+            div_params['re_dummy'] = True
+            div_params['clk_inverted'] = True
+            div2_master = self.new_template(params=div_params, temp_cls=DividerGroup)
 
         return sum_master, end_row_master, div2_master, div3_master
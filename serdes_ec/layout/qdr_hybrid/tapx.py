@@ -8,15 +8,17 @@ from itertools import chain
 
 from bag.layout.util import BBox
 from bag.layout.template import TemplateBase
-from bag.layout.routing.base import TrackManager, TrackID
+from bag.layout.routing.base import TrackID
 
 from abs_templates_ec.analog_core.base import AnalogBaseEnd
 
 from ..laygo.divider import DividerGroup
 from .amp import IntegAmp
 from .sampler import DividerColumn
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
+    from bag.layout.routing import RoutingGrid
     from bag.layout.template import TemplateDB
 
     NumType = Union[float, int]
@@ -29,6 +31,15 @@ def _record_track(track_info, name, tidx):
         track_info[name] = [tidx]
 
 
+def _get_master_info(master):
+    # type: (TemplateBase) -> Dict[str, Any]
+    """Returns the cached properties and bounding boxes of the given master."""
+    info = {name: getattr(master, name) for name in master.get_cache_properties()}
+    info['array_box'] = master.array_box
+    info['bound_box'] = master.bound_box
+    return info
+
+
 class TapXSummerCell(TemplateBase):
     """A summer cell containing a single DFE/FFE tap with the corresponding latch.
 
@@ -56,7 +67,7 @@ class TapXSummerCell(TemplateBase):
         self._lat_lr_edge_info = None
         self._lat_track_info = None
         self._div_tr_info = None
-        self._amp_masters = None
+        self._vm_coord_info = None
         self._sd_pitch_unit = None
         self._fg_tot = None
         self._row_heights = None
@@ -117,14 +128,39 @@ class TapXSummerCell(TemplateBase):
         # type: () -> int
         return self._sup_y_mid
 
+    @property
+    def vm_coord_info(self):
+        # type: () -> Tuple[Any, Any]
+        return self._vm_coord_info
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'lat_row_layout_info', 'sum_row_layout_info', 'lat_lr_edge_info',
+                'lat_track_info', 'div_tr_info', 'vm_coord_info', 'sd_pitch_unit', 'fg_tot',
+                'row_heights', 'sup_tids', 'sup_y_mid']
+
     def get_vm_coord(self, vm_width, is_left, is_out):
         # type: (int, bool, bool) -> int
+        return self.compute_vm_coord(self.grid, self.vm_coord_info, vm_width, is_left, is_out)
+
+    @classmethod
+    def compute_vm_coord(cls, grid, vm_coord_info, vm_width, is_left, is_out):
+        # type: (RoutingGrid, Tuple[Any, Any], int, bool, bool) -> int
+        """Compute vertical wire coordinate from the vm_coord_info property.
+
+        This is a classmethod so that the vertical wire coordinate can be computed from the
+        summer and latch masters before this cell is created.
+        """
+        hm_layer = IntegAmp.get_mos_conn_layer(grid.tech_info) + 1
+        s_info, l_info = vm_coord_info
         if is_out:
-            top_coord = self._amp_masters[1].get_vm_coord(vm_width, is_left, 1)
-            bot_coord = self._amp_masters[0].get_vm_coord(vm_width, is_left, 0)
+            top_coord = IntegAmp.compute_vm_coord(grid, hm_layer, l_info, vm_width, is_left, 1)
+            bot_coord = IntegAmp.compute_vm_coord(grid, hm_layer, s_info, vm_width, is_left, 0)
         else:
-            top_coord = self._amp_masters[1].get_vm_coord(vm_width, is_left, 2)
-            bot_coord = self._amp_masters[0].get_vm_coord(vm_width, is_left, 1)
+            top_coord = IntegAmp.compute_vm_coord(grid, hm_layer, l_info, vm_width, is_left, 2)
+            bot_coord = IntegAmp.compute_vm_coord(grid, hm_layer, s_info, vm_width, is_left, 1)
 
         if is_left:
             return min(top_coord, bot_coord)
@@ -165,42 +201,62 @@ class TapXSummerCell(TemplateBase):
             show_pins=True,
         )
 
-    def draw_layout(self):
-        # get parameters
-        fg_duml = self.params['fg_duml']
-        fg_dumr = self.params['fg_dumr']
-        flip_sign = self.params['flip_sign']
-        end_mode = self.params['end_mode']
-        show_pins = self.params['show_pins']
-        tr_widths = self.params['tr_widths']
-        tr_spaces = self.params['tr_spaces']
-        sch_hp_params = self.params['sch_hp_params']
+    @classmethod
+    def get_amp_params(cls, grid, params):
+        # type: (RoutingGrid, Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], int]
+        """Returns the summer and latch parameters of a summer cell with the given parameters.
+
+        The number of dummy fingers of the narrower amplifier is increased so both
+        amplifiers have the same total number of fingers.  This is computed from
+        IntegAmp.get_amp_fg_info(), so no amplifier master is created.
+
+        Parameters
+        ----------
+        grid : RoutingGrid
+            the routing grid.
+        params : Dict[str, Any]
+            the summer cell parameters.
+
+        Returns
+        -------
+        sum_params : Dict[str, Any]
+            the summer IntegAmp parameters.
+        lat_params : Dict[str, Any]
+            the latch IntegAmp parameters.
+        fg_tot : int
+            total number of fingers.
+        """
+        params = dict(cls.get_default_param_values(), **params)
+        fg_duml = params['fg_duml']
+        fg_dumr = params['fg_dumr']
+        end_mode = params['end_mode']
+        sch_hp_params = params['sch_hp_params']
 
         # get layout parameters
-        seg_sum = self.params['seg_sum']
+        seg_sum = params['seg_sum']
         if seg_sum.get('casc', 0) > 0:
             sum_hp_params = None
         else:
             sum_hp_params = sch_hp_params
         sum_params = dict(
-            w_dict=self.params['w_sum'],
-            th_dict=self.params['th_sum'],
-            seg_dict=self.params['seg_sum'],
-            tr_widths=tr_widths,
-            tr_spaces=tr_spaces,
+            w_dict=params['w_sum'],
+            th_dict=params['th_sum'],
+            seg_dict=seg_sum,
+            tr_widths=params['tr_widths'],
+            tr_spaces=params['tr_spaces'],
             top_layer=None,
-            flip_sign=flip_sign,
+            flip_sign=params['flip_sign'],
             but_sw=True,
             show_pins=False,
             end_mode=end_mode,
             sch_hp_params=sum_hp_params,
         )
         lat_params = dict(
-            w_dict=self.params['w_lat'],
-            th_dict=self.params['th_lat'],
-            seg_dict=self.params['seg_lat'],
-            tr_widths=tr_widths,
-            tr_spaces=tr_spaces,
+            w_dict=params['w_lat'],
+            th_dict=params['th_lat'],
+            seg_dict=params['seg_lat'],
+            tr_widths=params['tr_widths'],
+            tr_spaces=params['tr_spaces'],
             top_layer=None,
             flip_sign=False,
             but_sw=False,
@@ -209,37 +265,135 @@ class TapXSummerCell(TemplateBase):
             sch_hp_params=None,
         )
         for key in ('lch', 'ptap_w', 'ntap_w', 'fg_duml', 'fg_dumr', 'options'):
-            sum_params[key] = lat_params[key] = self.params[key]
+            sum_params[key] = lat_params[key] = params[key]
+
+        # balance number of fingers
+        lch = params['lch']
+        fg_tot_s = IntegAmp.get_amp_fg_info(grid, lch, seg_sum)[0] + fg_duml + fg_dumr
+        fg_tot_l = IntegAmp.get_amp_fg_info(grid, lch, params['seg_lat'])[0] + fg_duml + fg_dumr
+        fg_tot = max(fg_tot_s, fg_tot_l)
+        fg_inc = abs(fg_tot_s - fg_tot_l)
+        if fg_inc > 0:
+            fg_inc2 = (fg_inc // 4) * 2
+            table = lat_params if fg_tot_l < fg_tot_s else sum_params
+            table['fg_duml'] = fg_duml + fg_inc2
+            table['fg_dumr'] = fg_dumr + fg_inc - fg_inc2
+
+        return sum_params, lat_params, fg_tot
+
+    @classmethod
+    def get_cell_info(cls, template, params):
+        # type: (TemplateBase, Dict[str, Any]) -> Tuple[IntegAmp, IntegAmp, Dict[str, Any]]
+        """Create the amplifier masters of a summer cell, and returns the summer cell properties.
+
+        Only the summer and latch IntegAmp masters are created, so TapXSummer can compute
+        its floorplan in dry run mode without creating any summer cell.
+
+        Parameters
+        ----------
+        template : TemplateBase
+            the template used to create the amplifier masters.
+        params : Dict[str, Any]
+            the summer cell parameters.
+
+        Returns
+        -------
+        s_master : IntegAmp
+            the summer amplifier master.
+        l_master : IntegAmp
+            the latch amplifier master.
+        info : Dict[str, Any]
+            the summer cell properties, keyed by property name.  The latch location, the
+            bounding boxes, the supply tracks and the summer output tracks are also included.
+        """
+        grid = template.grid
+        params = dict(cls.get_default_param_values(), **params)
+        tr_widths = params['tr_widths']
+        tr_spaces = params['tr_spaces']
+
+        sum_params, lat_params, fg_tot = cls.get_amp_params(grid, params)
+        l_master = template.new_template(params=lat_params, temp_cls=IntegAmp)
+        s_master = template.new_template(params=sum_params, temp_cls=IntegAmp)
+
+        # the latch is mirrored on top of the summer
+        s_arr_box = s_master.array_box
+        y_lat = s_arr_box.top_unit + l_master.array_box.top_unit
+        l_arr_box = l_master.array_box.transform(loc=(0, y_lat), orient='MX', unit_mode=True)
+        l_bnd_box = l_master.bound_box.transform(loc=(0, y_lat), orient='MX', unit_mode=True)
+
+        hm_layer = IntegAmp.get_mos_conn_layer(grid.tech_info) + 1
+        s_tr_info = s_master.track_info
+        m_tr_info = l_master.track_info
+        s_tids = (s_tr_info['VSS'][0], s_tr_info['VDD'][0])
+        d_tids = (m_tr_info['VSS'][0], m_tr_info['VDD'][0])
+        sup_tracks = {}
+        for name in ('VSS', 'VDD'):
+            d_tidx, d_w = m_tr_info[name]
+            d_tidx = grid.transform_track(hm_layer, d_tidx, dy=y_lat, orient='MX', unit_mode=True)
+            sup_tracks[name] = [s_tr_info[name], (d_tidx, d_w)]
+
+        tr_manager = CachedTrackManager(grid, tr_widths, tr_spaces, half_space=True)
+        clk_idx, clk_w = m_tr_info['en_clk']
+        en_idx = tr_manager.get_next_track(hm_layer, clk_idx, clk_w, 1, up=False)
+        div_tr_info = dict(
+            VDD=m_tr_info['VDD'],
+            VSS=m_tr_info['VSS'],
+            q=m_tr_info['outp'],
+            qb=m_tr_info['outn'],
+            en=(en_idx, 1),
+            clkp=m_tr_info['clkp'],
+            clkn=m_tr_info['clkn'],
+            inp=m_tr_info['inp'],
+            inn=m_tr_info['inn'],
+            outp=m_tr_info['outp'],
+            outn=m_tr_info['outn'],
+            foot=m_tr_info['foot'],
+            tail=m_tr_info['tail'],
+        )
+
+        info = dict(
+            sch_params=dict(
+                flip_sign=params['flip_sign'],
+                sum_params=dict(
+                    sum_params=s_master.sch_params['gm_params'],
+                    lat_params=l_master.sch_params,
+                ),
+                load_params=s_master.sch_params['load_params'],
+            ),
+            lat_row_layout_info=l_master.row_layout_info,
+            sum_row_layout_info=s_master.row_layout_info,
+            lat_lr_edge_info=l_master.lr_edge_info,
+            lat_track_info=m_tr_info,
+            div_tr_info=div_tr_info,
+            vm_coord_info=(s_master.vm_coord_info, l_master.vm_coord_info),
+            sd_pitch_unit=s_master.sd_pitch_unit,
+            fg_tot=fg_tot,
+            row_heights=(s_master.bound_box.height_unit, l_master.bound_box.height_unit),
+            sup_tids=(s_tids, d_tids),
+            sup_y_mid=s_arr_box.top_unit,
+            y_lat=y_lat,
+            array_box=s_arr_box.merge(l_arr_box),
+            bound_box=s_master.bound_box.merge(l_bnd_box),
+            sup_tracks=sup_tracks,
+            out_tr_info=(s_tr_info['outp'][0], s_tr_info['outn'][0], s_tr_info['outp'][1]),
+        )
+        return s_master, l_master, info
+
+    def draw_layout(self):
+        # get parameters
+        show_pins = self.params['show_pins']
 
         # get masters
-        l_master = self.new_template(params=lat_params, temp_cls=IntegAmp)
-        s_master = self.new_template(params=sum_params, temp_cls=IntegAmp)
-        if l_master.fg_tot < s_master.fg_tot:
-            # update latch master
-            self._fg_tot = s_master.fg_tot
-            fg_inc = s_master.fg_tot - l_master.fg_tot
-            fg_inc2 = (fg_inc // 4) * 2
-            fg_duml2 = fg_duml + fg_inc2
-            fg_dumr2 = fg_dumr + fg_inc - fg_inc2
-            l_master = l_master.new_template_with(fg_duml=fg_duml2, fg_dumr=fg_dumr2)
-        elif s_master.fg_tot < l_master.fg_tot:
-            self._fg_tot = l_master.fg_tot
-            fg_inc = l_master.fg_tot - s_master.fg_tot
-            fg_inc2 = (fg_inc // 4) * 2
-            fg_duml2 = fg_duml + fg_inc2
-            fg_dumr2 = fg_dumr + fg_inc - fg_inc2
-            s_master = s_master.new_template_with(fg_duml=fg_duml2, fg_dumr=fg_dumr2)
-        else:
-            self._fg_tot = l_master.fg_tot
+        s_master, l_master, info = self.get_cell_info(self, self.params)
 
         # place instances
         s_inst = self.add_instance(s_master, 'XSUM', loc=(0, 0), unit_mode=True)
-        y0 = s_inst.array_box.top_unit + l_master.array_box.top_unit
-        d_inst = self.add_instance(l_master, 'XLAT', loc=(0, y0), orient='MX', unit_mode=True)
+        d_inst = self.add_instance(l_master, 'XLAT', loc=(0, info['y_lat']), orient='MX',
+                                   unit_mode=True)
 
         # set size
-        self.array_box = s_inst.array_box.merge(d_inst.array_box)
-        self.fill_box = bnd_box = s_inst.bound_box.merge(d_inst.bound_box)
+        self.array_box = info['array_box']
+        self.fill_box = bnd_box = info['bound_box']
         self.prim_top_layer = s_master.top_layer
         self.prim_bound_box = bnd_box
 
@@ -275,48 +429,19 @@ class TapXSummerCell(TemplateBase):
         self.add_pin('clkp_d', d_inst.get_pin('clkp'), label='clkp:', show=False)
         self.add_pin('clkn_d', d_inst.get_pin('clkn'), label='clkn:', show=False)
 
-        # set schematic parameters
-        self._sch_params = dict(
-            flip_sign=flip_sign,
-            sum_params=dict(
-                sum_params=s_master.sch_params['gm_params'],
-                lat_params=l_master.sch_params,
-            ),
-            load_params=s_master.sch_params['load_params'],
-        )
-        self._sum_row_layout_info = s_master.row_layout_info
-        self._lat_row_layout_info = l_master.row_layout_info
-        self._lat_lr_edge_info = l_master.lr_edge_info
-        self._lat_track_info = m_tr_info = l_master.track_info
-        self._amp_masters = s_master, l_master
-        self._sd_pitch_unit = s_master.sd_pitch_unit
-        self._row_heights = (s_master.bound_box.height_unit, l_master.bound_box.height_unit)
-        s_tids = (s_master.get_port('VSS').get_pins()[0].track_id.base_index,
-                  s_master.get_port('VDD').get_pins()[0].track_id.base_index,)
-        d_tids = (l_master.get_port('VSS').get_pins()[0].track_id.base_index,
-                  l_master.get_port('VDD').get_pins()[0].track_id.base_index,)
-        self._sup_tids = (s_tids, d_tids)
-        self._sup_y_mid = s_master.array_box.top_unit
-
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
-        tid = l_master.get_wire_id('nch', 1, 'g', wire_name='clk')
-        hm_layer = IntegAmp.get_mos_conn_layer(self.grid.tech_info) + 1
-        en_idx = tr_manager.get_next_track(hm_layer, tid.base_index, tid.width, 1, up=False)
-        self._div_tr_info = dict(
-            VDD=m_tr_info['VDD'],
-            VSS=m_tr_info['VSS'],
-            q=m_tr_info['outp'],
-            qb=m_tr_info['outn'],
-            en=(en_idx, 1),
-            clkp=m_tr_info['clkp'],
-            clkn=m_tr_info['clkn'],
-            inp=m_tr_info['inp'],
-            inn=m_tr_info['inn'],
-            outp=m_tr_info['outp'],
-            outn=m_tr_info['outn'],
-            foot=m_tr_info['foot'],
-            tail=m_tr_info['tail'],
-        )
+        # set schematic parameters and other properties
+        self._sch_params = info['sch_params']
+        self._sum_row_layout_info = info['sum_row_layout_info']
+        self._lat_row_layout_info = info['lat_row_layout_info']
+        self._lat_lr_edge_info = info['lat_lr_edge_info']
+        self._lat_track_info = info['lat_track_info']
+        self._div_tr_info = info['div_tr_info']
+        self._vm_coord_info = info['vm_coord_info']
+        self._sd_pitch_unit = info['sd_pitch_unit']
+        self._fg_tot = info['fg_tot']
+        self._row_heights = info['row_heights']
+        self._sup_tids = info['sup_tids']
+        self._sup_y_mid = info['sup_y_mid']
 
 
 class TapXSummer(TemplateBase):
@@ -356,6 +481,7 @@ class TapXSummer(TemplateBase):
         self._sup_y_mid = None
         self._row_heights = None
         self._div_grp_loc = None
+        self._out_tr_info = None
 
     @property
     def sch_params(self):
@@ -432,6 +558,20 @@ class TapXSummer(TemplateBase):
         # type: () -> Tuple[int, int]
         return self._div_grp_loc
 
+    @property
+    def out_tr_info(self):
+        # type: () -> Tuple[NumType, NumType, int]
+        return self._out_tr_info
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'ffe_track_info', 'dfe_track_info', 'fg_tot', 'fg_tot_dfe2',
+                'blockage_intvs', 'lr_edge_info', 'sum_row_info', 'lat_row_info', 'div_tr_info',
+                'vss_tids', 'vdd_tids', 'sup_tids', 'sup_y_mid', 'row_heights', 'div_grp_loc',
+                'out_tr_info']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -454,6 +594,7 @@ class TapXSummer(TemplateBase):
             options='other AnalogBase options',
             sch_hp_params='Schematic high-pass filter parameters.',
             show_pins='True to create pin labels.',
+            dry_run='True to only compute floorplan and properties, without creating cells.',
         )
 
     @classmethod
@@ -463,6 +604,7 @@ class TapXSummer(TemplateBase):
             options=None,
             sch_hp_params=None,
             show_pins=True,
+            dry_run=False,
         )
 
     def draw_layout(self):
@@ -485,6 +627,7 @@ class TapXSummer(TemplateBase):
         show_pins = self.params['show_pins']
         sch_hp_params = self.params['sch_hp_params']
         options = self.params['options']
+        dry_run = self.params['dry_run']
 
         num_sum = len(seg_sum_list)
         num_ffe = len(seg_ffe_list)
@@ -504,7 +647,7 @@ class TapXSummer(TemplateBase):
             raise ValueError('Must have at least one FFE (last FFE is main tap).')
 
         # create layout masters and place instances
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         hm_layer = IntegAmp.get_mos_conn_layer(self.grid.tech_info) + 1
         ym_layer = hm_layer + 1
         route_types = [1, 'out', 'out', 1, 'out', 'out', 1, 'out', 'out', 1]
@@ -522,20 +665,19 @@ class TapXSummer(TemplateBase):
         tmp = self._create_and_place(tr_manager, num_ffe, seg_ffe_list, seg_sum_list,
                                      flip_sign_list, ffe_sig_list, base_params, ym_layer,
                                      route_locs, place_info, vdd_list, vss_list, 'a', sig_off=0,
-                                     sum_off=0, is_end=False, left_out=True)
-        ffe_masters, self._ffe_track_info, ffe_sch_params, ffe_insts, place_info, blk_intvs = tmp
-        ffe_master0 = ffe_masters[0]
-        inst_first = ffe_insts[-1]
-        inst_first_box = inst_first.bound_box
-        inst_last_box = ffe_insts[0].bound_box
+                                     sum_off=0, is_end=False, left_out=True, dry_run=dry_run)
+        ffe_infos, self._ffe_track_info, ffe_sch_params, ffe_insts, place_info, blk_intvs = tmp
+        ffe_info0 = ffe_infos[0]
+        first_arr_box, inst_first_box = self._get_placed_boxes(ffe_infos[-1])
+        inst_last_box = self._get_placed_boxes(ffe_info0)[1]
         self._blockage_intvs = blk_intvs
-        self._lr_edge_info = ffe_master0.lat_lr_edge_info
-        self._div_tr_info = ffe_master0.div_tr_info
-        self._sum_row_info = ffe_master0.sum_row_layout_info
-        self._lat_row_info = ffe_master0.lat_row_layout_info
-        self._row_heights = ffe_master0.row_heights
-        self._sup_tids = ffe_master0.sup_tids
-        self._sup_y_mid = ffe_master0.sup_y_mid
+        self._lr_edge_info = ffe_info0['lat_lr_edge_info']
+        self._div_tr_info = ffe_info0['div_tr_info']
+        self._sum_row_info = ffe_info0['sum_row_layout_info']
+        self._lat_row_info = ffe_info0['lat_row_layout_info']
+        self._row_heights = ffe_info0['row_heights']
+        self._sup_tids = ffe_info0['sup_tids']
+        self._sup_y_mid = ffe_info0['sup_y_mid']
 
         # DFE instances
         if num_dfe > 0:
@@ -544,8 +686,9 @@ class TapXSummer(TemplateBase):
             tmp = self._create_and_place(tr_manager, num_dfe - 1, seg_dfe_list, seg_sum_list,
                                          flip_sign_list, dfe_sig_list, base_params, ym_layer,
                                          route_locs, place_info, vdd_list, vss_list, 'd', sig_off=3,
-                                         sum_off=num_ffe + 1, is_end=False, left_out=False)
-            dfe_masters, self._dfe_track_info, dfe_sch_params, dfe_insts, place_info, bintvs2 = tmp
+                                         sum_off=num_ffe + 1, is_end=False, left_out=False,
+                                         dry_run=dry_run)
+            dfe_infos, self._dfe_track_info, dfe_sch_params, dfe_insts, place_info, bintvs2 = tmp
             blk_intvs.extend(bintvs2)
 
             # DFE2 gm cell
@@ -563,30 +706,28 @@ class TapXSummer(TemplateBase):
                                tr_widths=tr_widths, tr_spaces=tr_spaces, flip_sign=fs_last,
                                end_mode=8, options=options, sch_hp_params=sch_hp_params,
                                but_sw=True, show_pins=False)
-            gm_master = self.new_template(params=base_params, temp_cls=IntegAmp)
             # NOTE: we reuse _place_master() command to place tap2 gm cell.
             # blk_idx just cannot be zero.
-            tmp = self._place_master(tr_manager, ym_layer, gm_master, self._dfe_track_info,
+            tmp = self._place_master(tr_manager, ym_layer, base_params, self._dfe_track_info,
                                      blk_intvs, fg_dum, route_locs, sig_types, sig_names, sig_right,
                                      vm_w_out, blk_idx_intv, place_info, True, 'd', 2, 0, vdd_list,
-                                     vss_list, -2)
-            gm_master, gm_inst, place_info = tmp
-            gm_arr_box = gm_inst.array_box
-            gm_bnd_box = gm_inst.bound_box
-            self._div_grp_loc = (gm_inst.location_unit[0], gm_arr_box.top_unit)
-
-            self._fg_tot += gm_master.fg_tot
-            self._fg_tot_dfe2 = gm_master.fg_tot
+                                     vss_list, -2, temp_cls=IntegAmp, dry_run=dry_run)
+            gm_info, gm_inst, place_info = tmp
+            gm_arr_box, gm_bnd_box = self._get_placed_boxes(gm_info)
+            self._div_grp_loc = (gm_info['loc_x'], gm_arr_box.top_unit)
+
+            self._fg_tot += gm_info['fg_tot']
+            self._fg_tot_dfe2 = gm_info['fg_tot']
             self.fill_box = bnd_box = inst_first_box.merge(gm_bnd_box)
-            self.array_box = inst_first.array_box.merge(gm_arr_box)
+            self.array_box = first_arr_box.merge(gm_arr_box)
 
-            dfe2_params = gm_master.sch_params.copy()
+            dfe2_params = gm_info['sch_params'].copy()
             dfe2_params['flip_sign'] = fs_last
         else:
             dfe_insts = gm_inst = None
             self._fg_tot_dfe2 = 0
-            self.fill_box = bnd_box = inst_first_box.merge(ffe_insts[0].bound_box)
-            self.array_box = inst_first.array_box.merge(ffe_insts[0].array_box)
+            self.fill_box = bnd_box = inst_first_box.merge(inst_last_box)
+            self.array_box = first_arr_box.merge(self._get_placed_boxes(ffe_info0)[0])
 
             dfe2_params = dfe_sch_params = None
 
@@ -597,7 +738,7 @@ class TapXSummer(TemplateBase):
         res = self.grid.resolution
         blk_w = self.grid.get_block_size(ym_layer, unit_mode=True)[0]
         tot_w = -(-bnd_box.width_unit // blk_w) * blk_w
-        ymid = ffe_master0.sup_y_mid + inst_first.location_unit[1]
+        ymid = ffe_info0['sup_y_mid']
         top_box = BBox(bnd_box.left_unit, ymid, inst_last_box.right_unit,
                        bnd_box.top_unit, res, unit_mode=True)
         bot_box = BBox(bnd_box.left_unit, bnd_box.bottom_unit, bnd_box.right_unit,
@@ -606,6 +747,20 @@ class TapXSummer(TemplateBase):
         self.set_size_from_bound_box(ym_layer, bnd_box)
         self.add_cell_boundary(bnd_box)
 
+        if dry_run:
+            # floorplan only, supplies and outputs come from the amplifier track information
+            vss_tids = sorted(set(vss_list))
+            vdd_tids = sorted(set(vdd_list))
+            self._vss_tids = (vss_tids[0], vss_tids[-1])
+            self._vdd_tids = (vdd_tids[0], vdd_tids[-1])
+            self._out_tr_info = ffe_info0['out_tr_info']
+            self._sch_params = dict(
+                ffe_params_list=ffe_sch_params,
+                dfe_params_list=dfe_sch_params,
+                dfe2_params=dfe2_params,
+            )
+            return
+
         # add pins
         # connect supplies
         vdd_list = self.connect_wires(vdd_list)
@@ -720,6 +875,8 @@ class TapXSummer(TemplateBase):
         self.add_pin('clkn_d', clkn_d, label='clkn:', show=False)
         self.add_pin('outp_s', outsp, show=show_pins)
         self.add_pin('outn_s', outsn, show=show_pins)
+        outp_tid = outsp[0].track_id
+        self._out_tr_info = (outp_tid.base_index, outsn[0].track_id.base_index, outp_tid.width)
 
         for idx, en_warr in enumerate(en_warrs):
             if en_warr:
@@ -813,11 +970,12 @@ class TapXSummer(TemplateBase):
 
     def _create_and_place(self, tr_manager, num_inst, seg_list, seg_sum_list, flip_sign_list,
                           sig_list, base_params, vm_layer, route_locs, place_info, vdd_list,
-                          vss_list, blk_type, sig_off=0, sum_off=0, is_end=False, left_out=True):
+                          vss_list, blk_type, sig_off=0, sum_off=0, is_end=False, left_out=True,
+                          dry_run=False):
         vm_w_out = tr_manager.get_width(vm_layer, 'out')
         fg_dum = base_params['fg_duml']
         track_info = {}
-        masters, sch_params, insts = [], [], []
+        infos, sch_params, insts = [], [], []
         inc = -1 if blk_type == 'd' else 0
         block_intvs = []
         for idx in range(num_inst - 1, -1, -1):
@@ -834,30 +992,64 @@ class TapXSummer(TemplateBase):
             cur_params['flip_sign'] = flip_sign
             if is_end and (idx == num_inst - 1):
                 cur_params['end_mode'] = 0b0100
-            cur_master = self.new_template(params=cur_params, temp_cls=TapXSummerCell)
 
-            tmp = self._place_master(tr_manager, vm_layer, cur_master, track_info, block_intvs,
+            tmp = self._place_master(tr_manager, vm_layer, cur_params, track_info, block_intvs,
                                      fg_dum, route_locs, sig_types, sig_names, sig_right, vm_w_out,
                                      blk_idx_intv, place_info, left_out, blk_type, sig_idx, inc,
-                                     vdd_list, vss_list, idx)
+                                     vdd_list, vss_list, idx, dry_run=dry_run)
 
-            cur_master, inst, place_info = tmp
-            masters.append(cur_master)
-            sch_params.append(cur_master.sch_params)
-            self._fg_tot += cur_master.fg_tot
+            cur_info, inst, place_info = tmp
+            infos.append(cur_info)
+            sch_params.append(cur_info['sch_params'])
+            self._fg_tot += cur_info['fg_tot']
 
             insts.append(inst)
 
+        infos.reverse()
         insts.reverse()
         sch_params.reverse()
-        return masters, track_info, sch_params, insts, place_info, block_intvs
+        return infos, track_info, sch_params, insts, place_info, block_intvs
+
+    @classmethod
+    def _get_placed_boxes(cls, info):
+        # type: (Dict[str, Any]) -> Tuple[BBox, BBox]
+        """Returns the array box and bounding box of a placed summer cell or amplifier."""
+        dx = info['loc_x']
+        return (info['array_box'].move_by(dx=dx, unit_mode=True),
+                info['bound_box'].move_by(dx=dx, unit_mode=True))
+
+    def _get_vm_coord_info(self, temp_cls, params, vm_width, is_out):
+        # type: (type, Dict[str, Any], int, bool) -> Tuple[int, int, int]
+        """Returns left vertical wire coordinate, array box left edge, and source/drain pitch.
+
+        For summer cells, only the summer and latch amplifiers are created.  They are
+        reused by the summer cell if no extra dummy fingers are needed.
+        """
+        if temp_cls is IntegAmp:
+            master = self.new_template(params=params, temp_cls=IntegAmp)
+            return (master.get_vm_coord(vm_width, True, 0), master.array_box.left_unit,
+                    master.sd_pitch_unit)
+
+        sum_params, lat_params, _ = TapXSummerCell.get_amp_params(self.grid, params)
+        s_master = self.new_template(params=sum_params, temp_cls=IntegAmp)
+        l_master = self.new_template(params=lat_params, temp_cls=IntegAmp)
+        vm_coord_info = s_master.vm_coord_info, l_master.vm_coord_info
+        vm_coord = TapXSummerCell.compute_vm_coord(self.grid, vm_coord_info, vm_width, True,
+                                                   is_out)
+        arr_xl = min(s_master.array_box.left_unit, l_master.array_box.left_unit)
+        return vm_coord, arr_xl, s_master.sd_pitch_unit
 
-    def _place_master(self, tr_manager, vm_layer, cur_master, track_info, block_intvs, fg_dum,
+    def _place_master(self, tr_manager, vm_layer, cur_params, track_info, block_intvs, fg_dum,
                       route_locs, sig_types, sig_names, sig_right, vm_w_out, blk_idx_intv,
                       place_info, left_out, blk_type, sig_idx, sig_inc, vdd_list, vss_list,
-                      blk_idx):
+                      blk_idx, temp_cls=TapXSummerCell, dry_run=False):
+        """Place a summer cell or amplifier, and record its routing tracks.
+
+        In dry run mode, summer cells are not created.  Their properties are computed from
+        the amplifier masters, and supply track indices are collected instead of wires.
+        """
 
-        if isinstance(cur_master, IntegAmp):
+        if temp_cls is IntegAmp:
             left_out_b = left_out = 0
         else:
             left_out_b = not left_out
@@ -865,20 +1057,37 @@ class TapXSummer(TemplateBase):
         prev_data_w, prev_data_tr, prev_type, prev_tr, xarr = place_info
         is_first = (xarr is None)
 
-        # check we can place current master without horizontal line-end spacing issues
-        xcur = 0 if is_first else xarr - cur_master.array_box.left_unit
+        # check we can place current master without horizontal line-end spacing issues.
+        # adding left dummy fingers shifts all wires to the right by the same amount, so
+        # we compute the number of extra dummy fingers before creating the master.
         if prev_data_tr is not None:
             data_xr = self.grid.get_wire_bounds(vm_layer, prev_data_tr, width=prev_data_w,
                                                 unit_mode=True)[1]
-            xcur_min = data_xr - cur_master.get_vm_coord(prev_data_w, True, left_out_b)
+            vm_coord, arr_xl, sd_pitch = self._get_vm_coord_info(temp_cls, cur_params,
+                                                                 prev_data_w, left_out_b)
+            xcur = xarr - arr_xl
+            xcur_min = data_xr - vm_coord
             if xcur_min > xcur:
                 # need to increment left dummy fingers to avoid line-end spacing issues
-                sd_pitch = cur_master.sd_pitch_unit
                 num_fg_inc = -(-(xcur_min - xcur) // (2 * sd_pitch)) * 2
-                cur_master = cur_master.new_template_with(fg_duml=fg_dum + num_fg_inc)
+                cur_params = cur_params.copy()
+                cur_params['fg_duml'] = fg_dum + num_fg_inc
+
+        if dry_run and temp_cls is TapXSummerCell:
+            cur_master = None
+            cur_info = TapXSummerCell.get_cell_info(self, cur_params)[2]
+            vm_coord = TapXSummerCell.compute_vm_coord(self.grid, cur_info['vm_coord_info'],
+                                                       vm_w_out, False, left_out)
+        else:
+            cur_master = self.new_template(params=cur_params, temp_cls=temp_cls)
+            cur_info = _get_master_info(cur_master)
+            vm_coord = cur_master.get_vm_coord(vm_w_out, False, left_out)
+        arr_box = cur_info['array_box']
+        xcur = 0 if is_first else xarr - arr_box.left_unit
+        cur_info['loc_x'] = xcur
 
         # get minimum left routing track index
-        data_xl = xcur + cur_master.get_vm_coord(vm_w_out, False, left_out)
+        data_xl = xcur + vm_coord
         ltr = self.grid.find_next_track(vm_layer, data_xl, tr_width=vm_w_out,
                                         half_track=True, mode=1, unit_mode=True)
         # get total space needed for signals
@@ -913,11 +1122,20 @@ class TapXSummer(TemplateBase):
             block_intvs.append((xl, xr))
 
         # add instance
-        inst_name = 'X%s%d' % (blk_type.upper(), sig_idx)
-        inst = self.add_instance(cur_master, inst_name, loc=(xcur, 0), unit_mode=True)
-        vdd_list.extend(inst.port_pins_iter('VDD'))
-        vss_list.extend(inst.port_pins_iter('VSS'))
-        xarr = inst.array_box.right_unit
+        if dry_run:
+            inst = None
+            if cur_master is None:
+                sup_tracks = cur_info['sup_tracks']
+            else:
+                sup_tracks = {name: [cur_info['track_info'][name]] for name in ('VDD', 'VSS')}
+            vdd_list.extend(sup_tracks['VDD'])
+            vss_list.extend(sup_tracks['VSS'])
+        else:
+            inst_name = 'X%s%d' % (blk_type.upper(), sig_idx)
+            inst = self.add_instance(cur_master, inst_name, loc=(xcur, 0), unit_mode=True)
+            vdd_list.extend(inst.port_pins_iter('VDD'))
+            vss_list.extend(inst.port_pins_iter('VSS'))
+        xarr = xcur + arr_box.right_unit
         # record routing track locations, and update placement information
         if blk_idx == 0:
             prev_data_w = tr_manager.get_width(vm_layer, sig_types[-2])
@@ -939,7 +1157,7 @@ class TapXSummer(TemplateBase):
                 _record_track(track_info, 'outn_%s%d<%d>' % (blk_type, cidx, sig_idx + sig_inc),
                               route_locs[x + 1] + offset)
 
-        return cur_master, inst, (prev_data_w, prev_data_tr, prev_type, prev_tr, xarr)
+        return cur_info, inst, (prev_data_w, prev_data_tr, prev_type, prev_tr, xarr)
 
 
 class TapXColumn(TemplateBase):
@@ -1025,6 +1243,13 @@ class TapXColumn(TemplateBase):
         # type: () -> List[int]
         return self._sup_y_list
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'row_heights', 'sup_tids', 'vss_tids', 'vdd_tids', 'out_tr_info',
+                'num_dfe', 'num_ffe', 'blockage_intvs', 'sup_y_list']
+
     def probe_range_iter(self, analog=True):
         if analog:
             yield from range(4 * (self.num_ffe + 1))
@@ -1057,6 +1282,7 @@ class TapXColumn(TemplateBase):
             sch_hp_params='Schematic high-pass filter parameters.',
             show_pins='True to create pin labels.',
             export_probe='True to export probe ports.',
+            dry_run='True to only compute floorplan and properties, without routing.',
         )
 
     @classmethod
@@ -1067,6 +1293,7 @@ class TapXColumn(TemplateBase):
             sch_hp_params=None,
             show_pins=True,
             export_probe=False,
+            dry_run=False,
         )
 
     def draw_layout(self):
@@ -1076,6 +1303,7 @@ class TapXColumn(TemplateBase):
         show_pins = self.params['show_pins']
         export_probe = self.params['export_probe']
         seg_dfe_list = self.params['seg_dfe_list']
+        dry_run = self.params['dry_run']
 
         num_ffe = len(self.params['seg_ffe_list'])
         if seg_dfe_list is None:
@@ -1085,45 +1313,67 @@ class TapXColumn(TemplateBase):
             num_dfe = len(seg_dfe_list) + 1
 
         # make masters
-        sum_master, div3_master, div2_master, div_col_master, end_row_master = self._make_masters()
+        tmp = self._make_masters(dry_run)
+        sum_master, div3_master, div2_master, div_col_master, end_row_master = tmp
         ym_layer = sum_master.top_layer
         end_row_box = end_row_master.array_box
         sum_arr_box = sum_master.array_box
 
-        # place instances
+        # compute instance locations
         blk_w = self.grid.get_block_size(ym_layer, unit_mode=True)[0]
         x0 = -(-div_col_master.array_box.right_unit // blk_w) * blk_w
         xdiv = x0 - div_col_master.array_box.right_unit
-
-        bot_row = self.add_instance(end_row_master, 'XROWB', loc=(xdiv, 0), unit_mode=True)
         y0 = end_row_box.top_unit
-        div_inst = self.add_instance(div_col_master, 'XDIV', loc=(xdiv, y0), unit_mode=True)
-        inst3 = self.add_instance(sum_master, 'X3', loc=(x0, y0), unit_mode=True)
         y1 = y0 + sum_arr_box.top_unit
         y2 = y1 + sum_arr_box.top_unit
-        inst0 = self.add_instance(sum_master, 'X0', loc=(x0, y2), orient='MX', unit_mode=True)
-        inst2 = self.add_instance(sum_master, 'X2', loc=(x0, y2), unit_mode=True)
         y3 = y2 + sum_arr_box.top_unit
         y4 = y3 + sum_arr_box.top_unit
-        inst1 = self.add_instance(sum_master, 'X1', loc=(x0, y4), orient='MX', unit_mode=True)
         y5 = y4 + end_row_box.top_unit
-        top_row = self.add_instance(end_row_master, 'XROWT', loc=(xdiv, y5), orient='MX',
-                                    unit_mode=True)
-        inst_list = [inst0, inst1, inst2, inst3]
-        sum_fill_box = inst0.fill_box.merge(inst3.fill_box)
-        self.fill_box = div_inst.fill_box.merge(sum_fill_box)
-        self._blockage_y = [0, top_row.bound_box.top_unit]
+
+        # compute bounding boxes from the masters, so dry run does not add any instance
+        end_row_bnd_box = end_row_master.bound_box
+        bot_row_box = end_row_bnd_box.move_by(dx=xdiv, unit_mode=True)
+        top_row_box = end_row_bnd_box.transform(loc=(xdiv, y5), orient='MX', unit_mode=True)
+        sum_fill_box = sum_master.fill_box
+        fill_box0 = sum_fill_box.transform(loc=(x0, y2), orient='MX', unit_mode=True)
+        fill_box3 = sum_fill_box.move_by(dx=x0, dy=y0, unit_mode=True)
+        div_fill_box = div_col_master.fill_box.move_by(dx=xdiv, dy=y0, unit_mode=True)
+        self.fill_box = div_fill_box.merge(fill_box0.merge(fill_box3))
+        self._blockage_y = [0, top_row_box.top_unit]
         sup_y_mid = sum_master.sup_y_mid
         self._sup_y_list = [y0, sup_y_mid + y0, y1, y2 - sup_y_mid, y2,
                             y2 + sup_y_mid, y3, y4 - sup_y_mid, y4]
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         vm_w_out = tr_manager.get_width(ym_layer, 'out')
 
-        # connect FFE biases/clks
         ffe_track_info = sum_master.ffe_track_info
         dfe_track_info = sum_master.dfe_track_info
         tr0 = self.grid.coord_to_track(ym_layer, x0, unit_mode=True) + 0.5
+        if num_dfe > 0:
+            vss_sh_list = list(chain(ffe_track_info['VSS'], dfe_track_info['VSS']))
+            vdd_sh_list = list(chain(ffe_track_info['VDD'], dfe_track_info['VDD']))
+        else:
+            vss_sh_list = ffe_track_info['VSS']
+            vdd_sh_list = ffe_track_info['VDD']
+
+        if dry_run:
+            # floorplan only, skip all instances and routing
+            self._set_size(ym_layer, x0, tr0, bot_row_box, top_row_box, sum_master, vdd_sh_list)
+            self._set_properties(sum_master, div_col_master, num_ffe, num_dfe, export_probe)
+            return
+
+        # place instances
+        self.add_instance(end_row_master, 'XROWB', loc=(xdiv, 0), unit_mode=True)
+        div_inst = self.add_instance(div_col_master, 'XDIV', loc=(xdiv, y0), unit_mode=True)
+        inst3 = self.add_instance(sum_master, 'X3', loc=(x0, y0), unit_mode=True)
+        inst0 = self.add_instance(sum_master, 'X0', loc=(x0, y2), orient='MX', unit_mode=True)
+        inst2 = self.add_instance(sum_master, 'X2', loc=(x0, y2), unit_mode=True)
+        inst1 = self.add_instance(sum_master, 'X1', loc=(x0, y4), orient='MX', unit_mode=True)
+        self.add_instance(end_row_master, 'XROWT', loc=(xdiv, y5), orient='MX', unit_mode=True)
+        inst_list = [inst0, inst1, inst2, inst3]
+
+        # connect FFE biases/clks
         tmp = self._connect_ffe(tr0, tr_manager, ym_layer, num_ffe, ffe_track_info,
                                 inst_list, show_pins)
         clkp_list, clkn_list, nclkp_list, nclkn_list = tmp
@@ -1172,12 +1422,6 @@ class TapXColumn(TemplateBase):
                               clkp_list,
                               clkn_list, show_pins)
 
-            vss_sh_iter = chain(ffe_track_info['VSS'], dfe_track_info['VSS'])
-            vdd_sh_iter = chain(ffe_track_info['VDD'], dfe_track_info['VDD'])
-        else:
-            vss_sh_iter = ffe_track_info['VSS']
-            vdd_sh_iter = ffe_track_info['VDD']
-
         self.add_pin('VDD', self.connect_wires(vdd_list), label='VDD', show=show_pins)
         self.add_pin('VSS', self.connect_wires(vss_list), label='VSS', show=show_pins)
 
@@ -1199,7 +1443,7 @@ class TapXColumn(TemplateBase):
         # connect shields
         sh_lower, sh_upper = None, None
         vm_vss_list, vm_vdd_list = [], []
-        for tr_idx in vss_sh_iter:
+        for tr_idx in vss_sh_list:
             cur_tidx = tr_idx + tr0
             warr = self.connect_to_tracks(vss_list, TrackID(ym_layer, cur_tidx))
             if sh_lower is None:
@@ -1207,10 +1451,7 @@ class TapXColumn(TemplateBase):
                 sh_upper = warr.upper_unit
             vm_vss_list.append(warr)
 
-        bnd_xr = 0
-        for tr_idx in vdd_sh_iter:
-            cur_xr = self.grid.track_to_coord(ym_layer, tr_idx + tr0 + 0.5, unit_mode=True)
-            bnd_xr = max(cur_xr, bnd_xr)
+        for tr_idx in vdd_sh_list:
             warr = self.connect_to_tracks(vdd_list, TrackID(ym_layer, tr_idx + tr0),
                                           track_lower=sh_lower, track_upper=sh_upper,
                                           unit_mode=True)
@@ -1218,9 +1459,28 @@ class TapXColumn(TemplateBase):
         self.add_pin('VDD', vm_vdd_list, show=show_pins)
         self.add_pin('VSS', vm_vss_list, show=show_pins)
 
-        # set size
+        self._set_size(ym_layer, x0, tr0, bot_row_box, top_row_box, sum_master, vdd_sh_list)
+
+        # connect divider column
+        clkp_list.extend(nclkp_list)
+        clkn_list.extend(nclkn_list)
+        right_vdd_tidx = self.grid.find_next_track(ym_layer, x0, half_track=True,
+                                                   mode=-1, unit_mode=True)
+        self._connect_div_column(tr_manager, ym_layer, div_inst, right_vdd_tidx, clkp_list,
+                                 clkn_list, en_list, vdd_list, vss_list, inp_warrs, inn_warrs,
+                                 sh_lower, sh_upper, show_pins, export_probe and num_dfe == 0)
+
+        self._set_properties(sum_master, div_col_master, num_ffe, num_dfe, export_probe)
+
+    def _set_size(self, ym_layer, x0, tr0, bot_row_box, top_row_box, sum_master, vdd_sh_list):
+        # make sure VDD shields are inside the bounding box
+        bnd_xr = 0
+        for tr_idx in vdd_sh_list:
+            cur_xr = self.grid.track_to_coord(ym_layer, tr_idx + tr0 + 0.5, unit_mode=True)
+            bnd_xr = max(cur_xr, bnd_xr)
+
         blk_w = self.grid.get_block_size(ym_layer, unit_mode=True)[0]
-        bnd_box = bot_row.bound_box.merge(top_row.bound_box).extend()
+        bnd_box = bot_row_box.merge(top_row_box).extend()
         bnd_xr = -(-max(bnd_box.right_unit, bnd_xr) // blk_w) * blk_w
         bnd_box = bnd_box.extend(x=bnd_xr, unit_mode=True).extend(x=0, unit_mode=True)
         self.set_size_from_bound_box(ym_layer, bnd_box)
@@ -1237,15 +1497,7 @@ class TapXColumn(TemplateBase):
             self.mark_bbox_used(ym_layer, BBox(xbl, self._blockage_y[1], xbr, bnd_box.top_unit,
                                                bnd_box.resolution, unit_mode=True))
 
-        # connect divider column
-        clkp_list.extend(nclkp_list)
-        clkn_list.extend(nclkn_list)
-        right_vdd_tidx = self.grid.find_next_track(ym_layer, x0, half_track=True,
-                                                   mode=-1, unit_mode=True)
-        self._connect_div_column(tr_manager, ym_layer, div_inst, right_vdd_tidx, clkp_list,
-                                 clkn_list, en_list, vdd_list, vss_list, inp_warrs, inn_warrs,
-                                 sh_lower, sh_upper, show_pins, export_probe and num_dfe == 0)
-
+    def _set_properties(self, sum_master, div_col_master, num_ffe, num_dfe, export_probe):
         # set schematic parameters and various properties
         self._sch_params = dict(
             div_params=div_col_master.sch_params,
@@ -1256,10 +1508,7 @@ class TapXColumn(TemplateBase):
         )
         self._vss_tids = sum_master.vss_tids
         self._vdd_tids = sum_master.vdd_tids
-        outp_s = sum_master.get_port('outp_s').get_pins()[0]
-        outn_s = sum_master.get_port('outn_s').get_pins()[0]
-        self._out_tr_info = (outp_s.track_id.base_index, outn_s.track_id.base_index,
-                             outp_s.track_id.width)
+        self._out_tr_info = sum_master.out_tr_info
         self._row_heights = sum_master.row_heights
         self._sup_tids = sum_master.sup_tids
         self._num_dfe = 0 if num_dfe == 0 else num_dfe + 1
@@ -1563,7 +1812,7 @@ class TapXColumn(TemplateBase):
 
         return inp_list, inn_list
 
-    def _make_masters(self):
+    def _make_masters(self, dry_run):
         # get parameters
         config = self.params['config']
         seg_div = self.params['seg_div_tapx']
@@ -1594,10 +1843,14 @@ class TapXColumn(TemplateBase):
             fg_min=fg_tot_dfe2,
             show_pins=False,
         )
-        div3_master = self.new_template(params=div_params, temp_cls=DividerGroup)
-        div_params['re_dummy'] = True
-        div_params['clk_inverted'] = False
-        div2_master = self.new_template(params=div_params, temp_cls=DividerGroup)
+        if dry_run:
+            # the divider groups are only placed when routing.
+            div3_master = div2_master = None
+        else:
+            div3_master = self.new_template(params=div_params, temp_cls=DividerGroup)
+            div_params['re_dummy'] = True
+            div_params['clk_inverted'] = False
+            div2_master = self.new_template(params=div_params, temp_cls=DividerGroup)
 
         div_col_params = dict(config=config, sum_row_info=sum_master.sum_row_info,
                               lat_row_info=sum_master.lat_row_info, seg_dict=seg_div,
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Dict, Any, Set, List, Tuple
 from itertools import repeat, chain, islice
 
 from bag.layout.util import BBox
-from bag.layout.routing.base import TrackID, TrackManager
+from bag.layout.routing.base import TrackID
 from bag.layout.template import TemplateBase
 
 from abs_templates_ec.analog_mos.mos import DummyFillActive
@@ -20,6 +20,9 @@ from analog_ec.layout.passives.filter.highpass import HighPassArrayClk
 
 from ..analog.passives import PassiveCTLE, TermRX
 from ..digital.buffer import BufferArray
+from ..fill import do_tiled_power_fill, add_max_space_fill, get_inst_fill_list, do_fill_list
+from ..util import CachedTrackManager
+from ..profile import profile_phase
 from .datapath import RXDatapath
 
 if TYPE_CHECKING:
@@ -54,6 +57,7 @@ class RXFrontend(TemplateBase):
         self._top_scan_names = None
         self._bias_info_list = None
         self._xm_layer = None
+        self._clk_box = None
 
     @property
     def sch_params(self):
@@ -90,12 +94,18 @@ class RXFrontend(TemplateBase):
         # type: () -> int
         return self._xm_layer
 
+    @property
+    def clk_box(self):
+        # type: () -> Tuple[int, int, int, int]
+        """The bounding box of clock routes above layer xm_layer + 1."""
+        return self._clk_box
+
     @classmethod
     def get_cache_properties(cls):
         # type: () -> List[str]
         """Returns a list of properties to cache."""
         return ['sch_params', 'buf_locs', 'retime_ncol', 'bot_scan_names', 'top_scan_names',
-                'xm_layer']
+                'xm_layer', 'clk_box']
 
     @classmethod
     def get_params_info(cls):
@@ -113,6 +123,7 @@ class RXFrontend(TemplateBase):
             tr_spaces_dig='Track spacing dictionary for digital.',
             fill_config='fill configuration dictionary.',
             bias_config='The bias configuration dictionary.',
+            defer_fill='True to draw max space fill of CTLE and datapath in this template.',
             show_pins='True to create pin labels.',
             export_probe='True to export probe ports.',
         )
@@ -121,6 +132,7 @@ class RXFrontend(TemplateBase):
     def get_default_param_values(cls):
         # type: () -> Dict[str, Any]
         return dict(
+            defer_fill=False,
             show_pins=True,
             export_probe=False,
         )
@@ -151,7 +163,7 @@ class RXFrontend(TemplateBase):
         vm_layer = ym_layer - 2
         blk_h = self.grid.get_block_size(xm_layer, unit_mode=True, half_blk_y=False)[1]
         fill_w, fill_h = self.grid.get_fill_size(top_layer, fill_config, unit_mode=True)
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
         tmp = self._compute_route_height(ym_layer - 1, blk_h, tr_manager, master_dp.num_ffe,
                                          master_dp.num_dfe, bias_config)
         clk_locs, clk_h, vss_h, vdd_h, num_vm_vss, num_vm_vdd = tmp
@@ -287,11 +299,18 @@ class RXFrontend(TemplateBase):
                                vss_wires, biasl_vdd, ctle_vss, fill_box, fill_config, show_pins)
 
         # do fill
+        if self.params['defer_fill']:
+            fill_list = get_inst_fill_list(ctle_inst)
+            fill_list.extend(get_inst_fill_list(dp_inst))
+        else:
+            fill_list = None
         core_fill_box = ctle_inst.fill_box.merge(dp_inst.fill_box)
         for layer in range(ym_layer, ym_layer + 2):
-            self.do_max_space_fill(layer, bound_box=core_fill_box, fill_pitch=2)
+            add_max_space_fill(self, fill_list, layer, core_fill_box, fill_pitch=2)
             for inst in (hpxb_inst, hpxt_inst, hp1b_inst, hp1t_inst):
-                self.do_max_space_fill(layer, bound_box=inst.fill_box, fill_pitch=2)
+                add_max_space_fill(self, fill_list, layer, inst.fill_box, fill_pitch=2)
+        if fill_list is not None:
+            do_fill_list(self, fill_list)
 
         self._sch_params = master_dp.sch_params.copy()
         self._sch_params['ctle_params'] = master_ctle.sch_params
@@ -439,6 +458,7 @@ class RXFrontend(TemplateBase):
         clkn_cur = curn_list
         clkp_tid = clkp_cur[0].track_id
         clkn_tid = clkn_cur[0].track_id
+        clk_box = None
         for lay in range(xm_layer + 1, top_layer + 1):
             tr_sp_clk = tr_manager.get_space(lay, ('clk', 'clk'))
             tr_w_clk = tr_manager.get_width(lay, 'clk')
@@ -455,10 +475,17 @@ class RXFrontend(TemplateBase):
                                                               width=tr_w_clk)
                 curp_list.append(curp)
                 curn_list.append(curn)
+                if lay > xm_layer + 1:
+                    for warr in (curp, curn):
+                        box = warr.get_bbox_array(self.grid).get_overall_bbox()
+                        clk_box = box if clk_box is None else clk_box.merge(box)
             clkp_cur = curp_list
             clkn_cur = curn_list
         clkp = self.connect_wires(clkp_cur)[0]
         clkn = self.connect_wires(clkn_cur)[0]
+        if clk_box is not None:
+            self._clk_box = (clk_box.left_unit, clk_box.bottom_unit, clk_box.right_unit,
+                             clk_box.top_unit)
 
         self.add_pin('clkp', clkp, label='clkp:', show=show_pins)
         self.add_pin('clkn', clkn, label='clkn:', show=show_pins)
@@ -850,10 +877,12 @@ class RXFrontend(TemplateBase):
         cap_h_table = self.params['cap_h_table']
         tr_widths_dig = self.params['tr_widths_dig']
         tr_spaces_dig = self.params['tr_spaces_dig']
+        defer_fill = self.params['defer_fill']
 
         ctle_params = ctle_params.copy()
         ctle_params['tr_widths'] = tr_widths
         ctle_params['tr_spaces'] = tr_spaces
+        ctle_params['defer_fill'] = defer_fill
         ctle_params['show_pins'] = False
         master_ctle = self.new_template(params=ctle_params, temp_cls=PassiveCTLE)
 
@@ -863,6 +892,7 @@ class RXFrontend(TemplateBase):
         dp_params['tr_spaces'] = tr_spaces
         dp_params['tr_widths_dig'] = tr_widths_dig
         dp_params['tr_spaces_dig'] = tr_spaces_dig
+        dp_params['defer_fill'] = defer_fill
         dp_params['show_pins'] = False
         master_dp = self.new_template(params=dp_params, temp_cls=RXDatapath)
         self._retime_ncol = master_dp.retime_ncol
@@ -885,6 +915,191 @@ class RXFrontend(TemplateBase):
         return master_ctle, master_dp, master_hpx, master_hp1
 
 
+class RXFrontendTerm(TemplateBase):
+    """The receiver frontend with input termination and its local power fill.
+
+    This block contains everything in RXTop that does not depend on the DAC, so
+    RXTop can reuse this master when only the DAC parameters change.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
+        self._sch_params = None
+        self._term_sch_params = None
+        self._buf_locs = None
+        self._retime_ncol = None
+        self._bot_scan_names = None
+        self._top_scan_names = None
+        self._xm_layer = None
+        self._x_fe = None
+        self._h_fe = None
+        self._clk_box = None
+
+    @property
+    def sch_params(self):
+        # type: () -> Dict[str, Any]
+        return self._sch_params
+
+    @property
+    def term_sch_params(self):
+        # type: () -> Dict[str, Any]
+        return self._term_sch_params
+
+    @property
+    def buf_locs(self):
+        # type: () -> Tuple[Tuple[int, int], Tuple[int, int]]
+        return self._buf_locs
+
+    @property
+    def retime_ncol(self):
+        # type: () -> int
+        return self._retime_ncol
+
+    @property
+    def bot_scan_names(self):
+        # type: () -> List[str]
+        return self._bot_scan_names
+
+    @property
+    def top_scan_names(self):
+        # type: () -> List[str]
+        return self._top_scan_names
+
+    @property
+    def xm_layer(self):
+        # type: () -> int
+        return self._xm_layer
+
+    @property
+    def x_fe(self):
+        # type: () -> int
+        return self._x_fe
+
+    @property
+    def h_fe(self):
+        # type: () -> int
+        return self._h_fe
+
+    @property
+    def clk_box(self):
+        # type: () -> Tuple[int, int, int, int]
+        """The bounding box of frontend clock routes above layer xm_layer + 1."""
+        return self._clk_box
+
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'term_sch_params', 'buf_locs', 'retime_ncol', 'bot_scan_names',
+                'top_scan_names', 'xm_layer', 'x_fe', 'h_fe', 'clk_box']
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        return dict(
+            term_params='Termination parameters.',
+            fe_params='RX frontend parameters.',
+            top_layer='Top routing layer.',
+            fill_orient_mode='fill orientation mode.',
+            show_pins='True to show pins.',
+        )
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        return dict(
+            fill_orient_mode=0,
+            show_pins=True,
+        )
+
+    def draw_layout(self):
+        top_layer = self.params['top_layer']
+        fill_orient_mode = self.params['fill_orient_mode']
+        show_pins = self.params['show_pins']
+
+        master_fe, master_term = self._make_masters()
+        box_fe = master_fe.bound_box
+        box_term = master_term.bound_box
+
+        w_term = box_term.width_unit
+        h_fe = box_fe.height_unit
+        y_term = (h_fe - box_term.height_unit) // 2
+        inst_term = self.add_instance(master_term, 'XTERM', loc=(0, y_term), unit_mode=True)
+        inst_fe = self.add_instance(master_fe, 'XFE', loc=(w_term, 0), unit_mode=True)
+
+        bnd_box = inst_fe.bound_box.merge(inst_term.bound_box)
+        self.set_size_from_bound_box(top_layer, bnd_box)
+        self.array_box = bnd_box
+
+        # connect termination to frontend
+        self.connect_wires([inst_term.get_pin('outp'), inst_fe.get_pin('inp')])
+        self.connect_wires([inst_term.get_pin('outn'), inst_fe.get_pin('inn')])
+        self.reexport(inst_term.get_port('inp'), show=show_pins)
+        self.reexport(inst_term.get_port('inn'), show=show_pins)
+        for name in inst_fe.port_names_iter():
+            if name not in ('inp', 'inn', 'VDD', 'VSS'):
+                self.reexport(inst_fe.get_port(name), show=show_pins)
+
+        # power fill the first layer above the frontend over the frontend area only.
+        xm_layer = master_fe.xm_layer
+        vdd = list(chain(inst_fe.port_pins_iter('VDD'), inst_term.port_pins_iter('VDD')))
+        vss = list(chain(inst_fe.port_pins_iter('VSS'), inst_term.port_pins_iter('VSS')))
+        if top_layer > xm_layer:
+            sp = 800
+            flip = fill_orient_mode & 1 != 0
+            vdd, vss = self.do_power_fill(xm_layer + 1, sp, sp, vdd_warrs=vdd, vss_warrs=vss,
+                                          bound_box=bnd_box, fill_width=3, fill_space=3,
+                                          flip=flip, unit_mode=True)
+        self.add_pin('VDD', vdd, label='VDD:', show=show_pins)
+        self.add_pin('VSS', vss, label='VSS:', show=show_pins)
+
+        self._sch_params = master_fe.sch_params
+        self._term_sch_params = master_term.sch_params
+        self._buf_locs = tuple((x + w_term, y) for x, y in master_fe.buf_locs)
+        self._retime_ncol = master_fe.retime_ncol
+        self._bot_scan_names = master_fe.bot_scan_names
+        self._top_scan_names = master_fe.top_scan_names
+        self._xm_layer = xm_layer
+        self._x_fe = w_term
+        self._h_fe = h_fe
+        if master_fe.clk_box is not None:
+            xl, yb, xr, yt = master_fe.clk_box
+            self._clk_box = (xl + w_term, yb, xr + w_term, yt)
+
+    def _make_masters(self):
+        term_params = self.params['term_params'].copy()
+        fe_params = self.params['fe_params'].copy()
+        top_layer = self.params['top_layer']
+
+        term_params['show_pins'] = fe_params['show_pins'] = False
+        term_params['top_layer'] = fe_params['top_layer'] = top_layer
+
+        master_fe = self.new_template(params=fe_params, temp_cls=RXFrontend)
+
+        in_tid = master_fe.get_port('inp').get_pins()[0].track_id
+        tr_off = self.grid.coord_to_track(in_tid.layer_id, master_fe.bound_box.height_unit // 2,
+                                          unit_mode=True)
+        term_params['cap_out_tid'] = (in_tid.base_index - tr_off - 0.5, in_tid.width)
+        master_term = self.new_template(params=term_params, temp_cls=TermRX)
+
+        return master_fe, master_term
+
+
 class RXTop(TemplateBase):
     """The receiver datapath.
 
@@ -925,6 +1140,12 @@ class RXTop(TemplateBase):
         # type: () -> List[str]
         return self._top_scan_names
 
+    @classmethod
+    def get_cache_properties(cls):
+        # type: () -> List[str]
+        """Returns a list of properties to cache."""
+        return ['sch_params', 'bot_scan_names', 'top_scan_names']
+
     @classmethod
     def get_params_info(cls):
         # type: () -> Dict[str, str]
@@ -937,6 +1158,7 @@ class RXTop(TemplateBase):
             fill_config='fill configuration dictionary.',
             bias_config='bias configuration dictionary.',
             fill_orient_mode='fill orientation mode.',
+            tiled_fill='True to power fill the frontend with an array of fill tiles.',
             show_pins='True to show pins.',
         )
 
@@ -946,6 +1168,7 @@ class RXTop(TemplateBase):
         return dict(
             clk_tr_info=None,
             fill_orient_mode=0,
+            tiled_fill=False,
             show_pins=True,
         )
 
@@ -956,27 +1179,21 @@ class RXTop(TemplateBase):
         bias_config = self.params['bias_config']
         show_pins = self.params['show_pins']
 
-        master_term, master_fe, master_dac, master_bufb, master_buft = self._make_masters()
-        box_term = master_term.bound_box
+        master_fe, master_dac, master_bufb, master_buft = self._make_masters()
         box_fe = master_fe.bound_box
         box_dac = master_dac.bound_box
 
         xm_layer = master_fe.xm_layer
         hm_layer = xm_layer - 2
-        w_term = box_term.width_unit
-        h_term = box_term.height_unit
         w_fe = box_fe.width_unit
-        h_fe = box_fe.height_unit
+        h_fe = master_fe.h_fe
         w_dac = box_dac.width_unit
         h_dac = box_dac.height_unit
-        w_tot = max(w_term + w_fe, w_dac)
+        w_tot = max(w_fe, w_dac)
         x_fe = w_tot - w_fe
-        x_term = x_fe - w_term
         x_dac = w_tot - w_dac
         h_tot = h_fe + h_dac
-        y_term = (h_fe - h_term) // 2
 
-        inst_term = self.add_instance(master_term, 'XTERM', loc=(x_term, y_term), unit_mode=True)
         inst_fe = self.add_instance(master_fe, 'XFE', loc=(x_fe, 0), unit_mode=True)
         inst_dac = self.add_instance(master_dac, 'XDAC', loc=(x_dac, h_tot), orient='MX',
                                      unit_mode=True)
@@ -992,7 +1209,7 @@ class RXTop(TemplateBase):
         self.add_cell_boundary(bnd_box)
 
         self._connect_fe(top_layer, inst_fe, clk_tr_info, show_pins)
-        self._connect_term(inst_term, inst_fe, show_pins)
+        self._connect_term(inst_fe, show_pins)
 
         self._bot_scan_names = bot_scan_names = master_fe.bot_scan_names
         self._top_scan_names = top_scan_names = master_fe.top_scan_names
@@ -1006,30 +1223,40 @@ class RXTop(TemplateBase):
             if name.startswith('bias_'):
                 self.reexport(inst_dac.get_port(name), show=show_pins)
 
-        self._power_fill(fill_config, top_layer, xm_layer, inst_fe, inst_term, inst_dac, show_pins)
+        self._power_fill(fill_config, top_layer, xm_layer, inst_fe, inst_dac, show_pins)
 
         self._sch_params = dict(
-            term_params=master_term.sch_params,
+            term_params=master_fe.term_sch_params,
             fe_params=master_fe.sch_params,
             dac_params=master_dac.sch_params,
             bufb_params=master_bufb.sch_params,
             buft_params=master_buft.sch_params,
         )
 
-    def _power_fill(self, fill_config, top_layer, xm_layer, inst_fe, inst_term,
-                    inst_dac, show_pins):
+    @profile_phase
+    def _power_fill(self, fill_config, top_layer, xm_layer, inst_fe, inst_dac, show_pins):
         fill_orient_mode = self.params['fill_orient_mode']
+        tiled_fill = self.params['tiled_fill']
 
-        vdd = list(chain(inst_fe.port_pins_iter('VDD'), inst_term.port_pins_iter('VDD')))
-        vss = list(chain(inst_fe.port_pins_iter('VSS'), inst_term.port_pins_iter('VSS')))
-        bnd_box = inst_fe.bound_box.merge(inst_term.bound_box)
+        # NOTE: the frontend master already power fills layer xm_layer + 1
+        vdd = inst_fe.get_all_port_pins('VDD')
+        vss = inst_fe.get_all_port_pins('VSS')
+        bnd_box = inst_fe.bound_box
 
-        if top_layer > xm_layer:
-            sp = 800
-            flip = fill_orient_mode & 1 != 0
-            vdd, vss = self.do_power_fill(xm_layer + 1, sp, sp, vdd_warrs=vdd, vss_warrs=vss,
-                                          bound_box=bnd_box, fill_width=3, fill_space=3,
-                                          flip=flip, unit_mode=True)
+        if tiled_fill and top_layer > xm_layer + 1:
+            bnd_box = bnd_box.extend(x=0, unit_mode=True)
+            # fill tiles do not avoid the frontend clock routes, so fill around them flat.
+            exclude_boxes = []
+            if inst_fe.master.clk_box is not None:
+                xl, yb, xr, yt = inst_fe.master.clk_box
+                clk_box = inst_fe.translate_master_box(BBox(xl, yb, xr, yt, self.grid.resolution,
+                                                            unit_mode=True))
+                margin = max((fill_config[lay][2] for lay in range(xm_layer + 2, top_layer + 1)))
+                exclude_boxes.append(clk_box.expand(dx=margin, dy=margin, unit_mode=True))
+            vdd, vss = do_tiled_power_fill(self, fill_config, xm_layer + 2, top_layer, bnd_box,
+                                           vdd, vss, orient_mode=fill_orient_mode,
+                                           exclude_boxes=exclude_boxes)
+        elif top_layer > xm_layer:
             bnd_box = bnd_box.extend(x=0, unit_mode=True)
             for lay in range(xm_layer + 2, top_layer + 1):
                 if (lay - xm_layer) % 2 == 0:
@@ -1070,18 +1297,18 @@ class RXTop(TemplateBase):
         self.add_pin('VDD', vdd, label='VDD:', show=show_pins)
         self.add_pin('VSS', vss, label='VSS:', show=show_pins)
 
-    def _connect_term(self, inst_term, inst_fe, show_pins):
-        inp = inst_term.get_pin('inp')
-        inn = inst_term.get_pin('inn')
+    @profile_phase
+    def _connect_term(self, inst_fe, show_pins):
+        inp = inst_fe.get_pin('inp')
+        inn = inst_fe.get_pin('inn')
         inp = self.extend_wires(inp, lower=0, unit_mode=True)
         inn = self.extend_wires(inn, lower=0, unit_mode=True)
         self.add_pin('inp', inp, show=show_pins)
         self.add_pin('inn', inn, show=show_pins)
-        self.connect_wires([inst_term.get_pin('outp'), inst_fe.get_pin('inp')])
-        self.connect_wires([inst_term.get_pin('outn'), inst_fe.get_pin('inn')])
 
+    @profile_phase
     def _connect_bias_routes(self, hm_layer, inst_fe, inst_dac, y_dac, bias_config):
-        x_fe = inst_fe.location_unit[0]
+        x_fe = inst_fe.location_unit[0] + inst_fe.master.x_fe
         x_dac = inst_dac.location_unit[0]
         master_dac = inst_dac.master
         (x_vdd, vdd_names), (x_vss, vss_names) = master_dac.bias_info
@@ -1142,6 +1369,7 @@ class RXTop(TemplateBase):
                 pin_fe = inst_fe.get_pin(name)
                 self.connect_to_track_wires(pin_dac, pin_fe)
 
+    @profile_phase
     def _connect_fe(self, top_layer, inst_fe, clk_tr_info, show_pins):
         for name in ['des_clk', 'des_clkb']:
             self.reexport(inst_fe.get_port(name), show=show_pins)
@@ -1163,6 +1391,7 @@ class RXTop(TemplateBase):
             self.reexport(inst_fe.get_port('data' + suf), show=show_pins)
             self.reexport(inst_fe.get_port('dlev' + suf), show=show_pins)
 
+    @profile_phase
     def _connect_buffers(self, hm_layer, inst_fe, inst_bufb, inst_buft, bot_names, top_names,
                          show_pins):
         # connect supplies
@@ -1189,6 +1418,7 @@ class RXTop(TemplateBase):
                                             unit_mode=True, min_len_mode=1)
                 self.add_pin(name, cur_pin, show=show_pins)
 
+    @profile_phase
     def _make_masters(self):
         term_params = self.params['term_params'].copy()
         fe_params = self.params['fe_params'].copy()
@@ -1201,10 +1431,19 @@ class RXTop(TemplateBase):
         term_params['fill_config'] = fe_params['fill_config'] = dac_params['fill_config'] = fconf
         fe_params['bias_config'] = dac_params['bias_config'] = bias_config
         dac_params['fill_orient_mode'] = fill_orient_mode ^ 2
-        term_params['show_pins'] = fe_params['show_pins'] = dac_params['show_pins'] = False
-        term_params['top_layer'] = fe_params['top_layer'] = top_layer
+        dac_params['show_pins'] = False
+
+        fe_term_params = dict(
+            term_params=term_params,
+            fe_params=fe_params,
+            top_layer=top_layer,
+            fill_orient_mode=fill_orient_mode & 1,
+            show_pins=False,
+        )
 
-        master_fe = self.new_template(params=fe_params, temp_cls=RXFrontend)
+        # the frontend does not depend on the DAC, so it is reused when only the DAC
+        # parameters change.
+        master_fe = self.new_template(params=fe_term_params, temp_cls=RXFrontendTerm)
 
         if top_layer == master_fe.xm_layer:
             dac_params['top_layer'] = top_layer
@@ -1212,12 +1451,6 @@ class RXTop(TemplateBase):
             dac_params['top_layer'] = top_layer - 1
         master_dac = self.new_template(params=dac_params, temp_cls=RDACArray)
 
-        in_tid = master_fe.get_port('inp').get_pins()[0].track_id
-        tr_off = self.grid.coord_to_track(in_tid.layer_id, master_fe.bound_box.height_unit // 2,
-                                          unit_mode=True)
-        term_params['cap_out_tid'] = (in_tid.base_index - tr_off - 0.5, in_tid.width)
-        master_term = self.new_template(params=term_params, temp_cls=TermRX)
-
         buf_params = fe_params['scan_buf_params'].copy()
         buf_params['config'] = fe_params['dp_params']['config']
         buf_params['tr_widths'] = fe_params['tr_widths_dig']
@@ -1230,4 +1463,4 @@ class RXTop(TemplateBase):
         buf_params['nbuf_list'] = nbuf_list2
         master_bufb = self.new_template(params=buf_params, temp_cls=BufferArray)
 
-        return master_term, master_fe, master_dac, master_bufb, master_buft
+        return master_fe, master_dac, master_bufb, master_buft
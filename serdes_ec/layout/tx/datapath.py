@@ -9,13 +9,16 @@ from itertools import chain
 import yaml
 
 from bag.layout.util import BBox
-from bag.layout.routing.base import TrackID, TrackManager
+from bag.layout.routing.base import TrackID
 from bag.layout.template import TemplateBase, BlackBoxTemplate
 
 from abs_templates_ec.analog_mos.mos import DummyFillActive
 
 from ..analog.cml import CMLAmpPMOS
+from ..fill import get_inst_fill_list, do_fill_list
+from ..profile import profile_phase
 from .ser import Serializer32
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -57,12 +60,14 @@ class TXDatapath(TemplateBase):
             tr_widths='Track width dictionary.',
             tr_spaces='Track spacing dictionary.',
             fill_config='fill configuration dictionary.',
+            defer_fill='True to draw max space fill of the CML amplifier in this template.',
             show_pins='True to draw pin layouts.',
         )
 
     @classmethod
     def get_default_param_values(cls):
         return dict(
+            defer_fill=False,
             show_pins=True,
         )
 
@@ -71,7 +76,7 @@ class TXDatapath(TemplateBase):
         tr_spaces = self.params['tr_spaces']
         show_pins = self.params['show_pins']
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
 
         # make masters and get information
         master_ser, master_amp, master_esd = self._make_masters()
@@ -147,6 +152,10 @@ class TXDatapath(TemplateBase):
         self.add_pin('VSS', vss, label='VSS:', show=show_pins)
         self.add_pin('VDD', sh_warrs, label='VDD:', show=show_pins)
 
+        # draw deferred fill
+        if self.params['defer_fill']:
+            do_fill_list(self, get_inst_fill_list(amp))
+
         # schematic parameters
         self._sch_params = dict(
             ser_params=master_ser.sch_params,
@@ -154,6 +163,7 @@ class TXDatapath(TemplateBase):
             esd_params=master_esd.sch_params,
         )
 
+    @profile_phase
     def _connect_ser_esd(self, amp, esdb, esdt, show_pins):
         vdd = self.connect_wires(list(chain(esdb.port_pins_iter('VDD'),
                                             esdt.port_pins_iter('VDD'))))
@@ -169,6 +179,7 @@ class TXDatapath(TemplateBase):
 
         return vdd, vss
 
+    @profile_phase
     def _connect_ser_amp(self, ym_layer, tr_manager, ser, amp, x_route, ibias_locs,
                          ym_tr_w_ibias, show_pins):
         wp = self.connect_wires([ser.get_pin('outp'), amp.get_pin('inp')])[0]
@@ -200,6 +211,7 @@ class TXDatapath(TemplateBase):
 
         return sh
 
+    @profile_phase
     def _make_masters(self):
         esd_fname = self.params['esd_fname']
         ser_params = self.params['ser_params'].copy()
@@ -214,6 +226,7 @@ class TXDatapath(TemplateBase):
         amp_params['tr_widths'] = tr_widths
         amp_params['tr_spaces'] = tr_spaces
         amp_params['ext_mode'] = 1
+        amp_params['defer_fill'] = self.params['defer_fill']
         amp_params['show_pins'] = False
         master_amp = self.new_template(params=amp_params, temp_cls=CMLAmpPMOS)
 
@@ -9,12 +9,14 @@ from itertools import chain
 import yaml
 
 from bag.layout.util import BBox
-from bag.layout.routing.base import TrackID, TrackManager
+from bag.layout.routing.base import TrackID
 from bag.layout.template import TemplateBase, BlackBoxTemplate
 
 from digital_ec.layout.analog.inv import AnaInvChain
 
+from ..profile import profile_phase
 from ..qdr_hybrid.sampler import DividerColumn
+from ..util import CachedTrackManager
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -77,7 +79,7 @@ class Serializer32(TemplateBase):
         sup_margin = self.params['sup_margin']
         show_pins = self.params['show_pins']
 
-        tr_manager = TrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
+        tr_manager = CachedTrackManager(self.grid, tr_widths, tr_spaces, half_space=True)
 
         # make masters and get information
         master_ser, master_mux, master_div, master_buf = self._make_masters()
@@ -161,6 +163,7 @@ class Serializer32(TemplateBase):
             buf_params=master_buf.sch_params,
         )
 
+    @profile_phase
     def _connect_mux_buf(self, ym_layer, tr_manager, mux, bufb, buft, vddo_list, vsso_list,
                          vddi_list, vssi_list, test_box, show_pins):
 
@@ -195,6 +198,7 @@ class Serializer32(TemplateBase):
         self.add_pin('outp', bufb.get_pin('out'), show=show_pins)
         self.add_pin('outn', buft.get_pin('out'), show=show_pins)
 
+    @profile_phase
     def _connect_supplies(self, ym_layer, vddo_list, vsso_list, vddi_list, vssi_list, sup_margin,
                           fill_config, show_pins):
         xr = self.bound_box.right_unit - sup_margin
@@ -216,6 +220,7 @@ class Serializer32(TemplateBase):
         self.add_pin('VSS', [w for w in vss if w.lower_unit == yb or w.upper_unit == yt],
                      show=show_pins)
 
+    @profile_phase
     def _connect_ser_div_mux(self, ym_layer, tr_manager, serb, sert, div, mux, x0, clk_locs,
                              vddo_list, vsso_list, vddi_list, vssi_list, test_box, show_pins):
         # get track locations
@@ -260,6 +265,7 @@ class Serializer32(TemplateBase):
         # draw en2 connections
         self.connect_to_tracks(div.get_all_port_pins('en2'), en2_tid)
 
+    @profile_phase
     def _connect_ser_div(self, ym_layer, tr_manager, serb, sert, div, x0, clk_locs,
                          test_box, sup_margin, show_pins):
         # get track locations
@@ -300,6 +306,7 @@ class Serializer32(TemplateBase):
 
         return vddo_list, vsso_list, vddi_list, vssi_list
 
+    @profile_phase
     def _connect_ser(self, serb, sert, show_pins):
         # connect reset
         if serb.has_port('rst_vm'):
@@ -322,6 +329,7 @@ class Serializer32(TemplateBase):
             self.reexport(sert.get_port(port_name), net_name='data_tx<%d>' % (idx * 2 + 1),
                           show=show_pins)
 
+    @profile_phase
     def _make_masters(self):
         ser16_fname = self.params['ser16_fname']
         mux_fname = self.params['mux_fname']
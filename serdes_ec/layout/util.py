@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines various layout generation utility classes."""
+
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Sequence
+from collections import OrderedDict
+
+from bag.layout.routing import TrackManager
+
+if TYPE_CHECKING:
+    from bag.layout.routing import RoutingGrid
+
+
+# track plan cache, in least recently used order.  Keys only contain routing grid
+# properties, so plans are shared by templates with different but identical grids.
+_track_plan_cache = OrderedDict()  # type: OrderedDict[Any, Tuple[int, Tuple[Any, ...]]]
+_track_plan_max_size = 4096
+_track_plan_stats = dict(hits=0, misses=0)
+
+
+def _freeze(obj):
+    # type: (Any) -> Any
+    """Returns a hashable version of the given object."""
+    if isinstance(obj, dict):
+        return tuple(sorted(((_freeze(k), _freeze(v)) for k, v in obj.items()), key=repr))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+class CachedTrackManager(TrackManager):
+    """A TrackManager that shares wire placement results across all instances.
+
+    place_wires() only depends on the routing grid, the track width and spacing
+    dictionaries, and its arguments, so results are memoized in a module level cache
+    keyed by all of them.  The routing grid is represented by the direction, pitch, and
+    track widths of the routing layer, as every template has its own copy of the grid.
+    The cache holds at most _track_plan_max_size plans, and the least recently used plan
+    is discarded first.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the routing grid.
+    tr_widths : Dict[str, Dict[int, int]]
+        the track width dictionary.
+    tr_spaces : Dict[Any, Dict[int, Union[float, int]]]
+        the track spacing dictionary.
+    **kwargs :
+        optional TrackManager parameters.
+    """
+
+    def __init__(self, grid, tr_widths, tr_spaces, **kwargs):
+        # type: (RoutingGrid, Dict[str, Any], Dict[Any, Any], **Any) -> None
+        TrackManager.__init__(self, grid, tr_widths, tr_spaces, **kwargs)
+        self._cache_grid = grid
+        self._cache_widths = tr_widths
+        self._plan_key = (_freeze(tr_widths), _freeze(tr_spaces), _freeze(kwargs))
+        self._layer_keys = {}  # type: Dict[int, Tuple[Any, ...]]
+
+    def _get_layer_key(self, layer_id):
+        # type: (int) -> Tuple[Any, ...]
+        """Returns the routing grid properties of the given layer used by place_wires()."""
+        ans = self._layer_keys.get(layer_id, None)
+        if ans is None:
+            grid = self._cache_grid
+            w_set = set((w_dict[layer_id] for w_dict in self._cache_widths.values()
+                         if layer_id in w_dict))
+            w_set.add(1)
+            w_list = tuple((w, grid.get_track_width(layer_id, w, unit_mode=True))
+                           for w in sorted(w_set))
+            ans = self._layer_keys[layer_id] = (grid.resolution, grid.get_direction(layer_id),
+                                                grid.get_track_pitch(layer_id, unit_mode=True),
+                                                w_list)
+        return ans
+
+    def place_wires(self, layer_id, type_list, *args, **kwargs):
+        # type: (int, Sequence[Any], *Any, **Any) -> Tuple[Any, List[Any]]
+        key = (self._get_layer_key(layer_id), self._plan_key, layer_id, _freeze(type_list),
+               _freeze(args), _freeze(kwargs))
+        ans = _track_plan_cache.get(key, None)
+        if ans is None:
+            _track_plan_stats['misses'] += 1
+            num_tr, locs = TrackManager.place_wires(self, layer_id, type_list, *args,
+                                                     **kwargs)
+            ans = _track_plan_cache[key] = (num_tr, tuple(locs))
+            if len(_track_plan_cache) > _track_plan_max_size:
+                _track_plan_cache.popitem(last=False)
+        else:
+            _track_plan_stats['hits'] += 1
+            _track_plan_cache.move_to_end(key)
+
+        # return a new list, as callers may modify it
+        return ans[0], list(ans[1])
+
+
+def get_track_plan_stats():
+    # type: () -> Dict[str, int]
+    """Returns the hit/miss statistics and size of the shared track plan cache."""
+    ans = dict(_track_plan_stats)
+    ans['size'] = len(_track_plan_cache)
+    return ans
+
+
+def clear_track_plan_cache():
+    # type: () -> None
+    """Clear the shared track plan cache and its statistics."""
+    _track_plan_cache.clear()
+    _track_plan_stats['hits'] = _track_plan_stats['misses'] = 0
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines an adaptive sweep refinement engine.
+
+The full sweep grid is the cartesian product of all sweep parameter values.  An adaptive
+sweep starts from a coarse subset of this grid, then repeatedly adds the midpoint between
+two neighboring samples whenever the simulated metrics change by more than a tolerance
+between them.  Non-numeric sweep parameters (such as thresholds) are always fully sampled.
+"""
+
+from typing import Dict, Any, List, Tuple, Sequence, Set, Callable, Iterable
+
+import itertools
+import numbers
+
+import numpy as np
+import scipy.interpolate as interp
+
+IdxType = Tuple[int, ...]
+ValType = Tuple[Any, ...]
+
+
+def _is_numeric(val_list):
+    # type: (Sequence[Any]) -> bool
+    return all(isinstance(val, numbers.Real) and not isinstance(val, bool) for val in val_list)
+
+
+class AdaptiveSweep(object):
+    """An adaptively refined sweep over a grid of sweep parameter values.
+
+    Parameters
+    ----------
+    values_list : Sequence[Sequence[Any]]
+        the sweep values of each sweep parameter.  Numeric values must be sorted.
+    levels : int
+        number of refinement levels.  The coarse grid uses every (2 ** levels)-th value of
+        each numeric sweep parameter, plus the last value.
+    """
+
+    def __init__(self, values_list, levels=2):
+        # type: (Sequence[Sequence[Any]], int) -> None
+        self._values_list = [list(vals) for vals in values_list]
+        self._numeric = [_is_numeric(vals) for vals in self._values_list]
+
+        step = 2 ** levels
+        idx_ranges = []
+        for vals, is_num in zip(self._values_list, self._numeric):
+            num = len(vals)
+            if is_num:
+                idx_ranges.append(sorted(set(range(0, num, step)) | {num - 1}))
+            else:
+                idx_ranges.append(list(range(num)))
+
+        self._samples = set(itertools.product(*idx_ranges))  # type: Set[IdxType]
+        self._done = set()  # type: Set[IdxType]
+
+    @property
+    def num_samples(self):
+        # type: () -> int
+        return len(self._samples)
+
+    @property
+    def num_total(self):
+        # type: () -> int
+        return int(np.prod([len(vals) for vals in self._values_list]))
+
+    def get_values(self, idx_list):
+        # type: (IdxType) -> ValType
+        """Returns the sweep values at the given grid indices."""
+        return tuple(vals[idx] for vals, idx in zip(self._values_list, idx_list))
+
+    def get_index(self, val_list):
+        # type: (Sequence[Any]) -> IdxType
+        """Returns the grid indices of the given sweep values."""
+        return tuple(vals.index(val) for vals, val in zip(self._values_list, val_list))
+
+    def samples_iter(self, pending_only=False):
+        # type: (bool) -> Iterable[ValType]
+        """Iterate over sample sweep values, in grid order."""
+        for idx_list in sorted(self._samples):
+            if not pending_only or idx_list not in self._done:
+                yield self.get_values(idx_list)
+
+    def refine(self, metric_fun, tol_table):
+        # type: (Callable[[ValType], Dict[str, Any]], Dict[str, float]) -> int
+        """Mark all samples as done, then refine the sample set.
+
+        Parameters
+        ----------
+        metric_fun : Callable[[ValType], Dict[str, Any]]
+            a function that returns the metric values of the given sweep values.  Each
+            metric can be a scalar or an array.
+        tol_table : Dict[str, float]
+            the maximum relative metric change between neighboring samples.  Metrics not
+            in this dictionary are not used for refinement.
+
+        Returns
+        -------
+        num_new : int
+            number of new samples.
+        """
+        metric_table = {idx_list: metric_fun(self.get_values(idx_list))
+                        for idx_list in sorted(self._samples)}
+        self._done.update(self._samples)
+
+        new_samples = set()
+        for axis, is_num in enumerate(self._numeric):
+            if not is_num:
+                continue
+            for idx0, idx1 in self._neighbors_iter(axis):
+                if idx1[axis] - idx0[axis] > 1 and \
+                        self._exceed_tol(metric_table[idx0], metric_table[idx1], tol_table):
+                    mid_idx = (idx0[axis] + idx1[axis]) // 2
+                    new_samples.add(idx0[:axis] + (mid_idx, ) + idx0[axis + 1:])
+
+        new_samples -= self._samples
+        self._samples.update(new_samples)
+        return len(new_samples)
+
+    def get_interpolator(self, metric_fun, name):
+        # type: (Callable[[ValType], Dict[str, Any]], str) -> Callable[[Sequence[Any]], Any]
+        """Returns an interpolator of the given metric over the sampled points.
+
+        Numeric sweep parameters are interpolated linearly over the irregular sample set;
+        non-numeric sweep parameters must match a sampled value exactly.
+        """
+        num_axes = [idx for idx, is_num in enumerate(self._numeric) if is_num]
+        cat_axes = [idx for idx, is_num in enumerate(self._numeric) if not is_num]
+
+        group_table = {}  # type: Dict[ValType, Tuple[List[List[float]], List[Any]]]
+        for idx_list in sorted(self._done):
+            val_list = self.get_values(idx_list)
+            key = tuple(val_list[idx] for idx in cat_axes)
+            pts, vals = group_table.setdefault(key, ([], []))
+            pts.append([val_list[idx] for idx in num_axes])
+            vals.append(np.asarray(metric_fun(val_list)[name]))
+
+        fun_table = {}
+        for key, (pts, vals) in group_table.items():
+            pts = np.array(pts, dtype=float)
+            vals = np.array(vals)
+            if not num_axes:
+                fun_table[key] = (lambda v0: lambda _: v0)(vals[0])
+            elif len(num_axes) == 1:
+                order = np.argsort(pts[:, 0])
+                fun_table[key] = interp.interp1d(pts[order, 0], vals[order], axis=0,
+                                                 assume_sorted=True)
+            else:
+                fun_table[key] = interp.LinearNDInterpolator(pts, vals)
+
+        def fun(val_list):
+            key = tuple(val_list[idx] for idx in cat_axes)
+            if key not in fun_table:
+                raise ValueError('No samples for sweep values: %s' % (key, ))
+            xval = [val_list[idx] for idx in num_axes]
+            if len(num_axes) == 1:
+                return fun_table[key](xval[0])
+            return fun_table[key](xval)[0] if num_axes else fun_table[key](xval)
+
+        return fun
+
+    def _neighbors_iter(self, axis):
+        # type: (int) -> Iterable[Tuple[IdxType, IdxType]]
+        """Iterate over pairs of consecutive samples along the given axis."""
+        line_table = {}  # type: Dict[IdxType, List[IdxType]]
+        for idx_list in self._samples:
+            key = idx_list[:axis] + idx_list[axis + 1:]
+            line_table.setdefault(key, []).append(idx_list)
+        for line in line_table.values():
+            line.sort(key=lambda x: x[axis])
+            for idx in range(len(line) - 1):
+                yield line[idx], line[idx + 1]
+
+    @classmethod
+    def _exceed_tol(cls, metrics0, metrics1, tol_table):
+        # type: (Dict[str, Any], Dict[str, Any], Dict[str, float]) -> bool
+        for name, tol in tol_table.items():
+            val0 = np.abs(np.asarray(metrics0[name]))
+            diff = np.amax(np.abs(np.asarray(metrics1[name]) - np.asarray(metrics0[name])))
+            scale = max(np.amax(val0), np.amax(np.abs(np.asarray(metrics1[name]))))
+            if scale == 0:
+                continue
+            if diff / scale > tol:
+                return True
+        return False
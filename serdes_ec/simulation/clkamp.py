@@ -23,38 +23,313 @@
 ########################################################################################################################
 
 
-from typing import TYPE_CHECKING, Optional, Tuple, Any, Dict, List
+from typing import TYPE_CHECKING, Optional, Tuple, Any, Dict, List, Callable
 import os
+import json
+import hashlib
 from copy import deepcopy
 
 import numpy as np
 import scipy.linalg as linalg
 
-from bag.io import open_file
-from bag.data.digital import de_bruijn, dig_to_pwl
+from bag.data.digital import de_bruijn
 from bag.simulation.core import SimulationManager
 
+from .store import SimResultStore, save_sim_file
+from .adaptive import AdaptiveSweep
+from .surrogate import GPSurrogate
+from .stimulus import prbs, setup_pwl_file
+
 if TYPE_CHECKING:
     from bag.core import BagProject, Testbench
+    from .store import SimResultFile
 
 
 class ClkAmpChar(SimulationManager):
+    # simulation results store shared by all instances
+    result_store = SimResultStore()
+
     def __init__(self, prj, spec_file):
         # type: (Optional[BagProject], str) -> None
+        self._rep_table = None  # type: Optional[Dict[Tuple[Any, ...], Tuple[Any, ...]]]
+        self._adaptive = None  # type: Optional[AdaptiveSweep]
+        self._dsn_only = False
         super(ClkAmpChar, self).__init__(prj, spec_file)
 
-    @classmethod
-    def _setup_pwl_input(cls, values, tper, tr, tran_fname):
-        # type: (List[float], float) -> None
+    def _is_tb_var(self, var):
+        # type: (str) -> bool
+        """Returns True if the given sweep variable is a testbench-only parameter."""
+        if var.startswith(('w_', 'th_', 'seg_')) or var in self.specs['layout_params']:
+            return False
+        return any(isinstance(val, dict) and var in val.get('tb_params', {})
+                   for val in self.specs.values())
+
+    def get_layout_hash(self, val_list):
+        # type: (Tuple[Any, ...]) -> str
+        """Returns a hash of the effective layout parameters of the given sweep values."""
+        lay_str = json.dumps(self.get_layout_params(val_list), sort_keys=True, default=repr)
+        return hashlib.sha1(lay_str.encode('utf-8')).hexdigest()
+
+    def get_representative(self, val_list):
+        # type: (Tuple[Any, ...]) -> Tuple[Any, ...]
+        """Returns the first sweep combination with the same layout as the given one.
+
+        All combinations with identical layout parameters share the design and LVS/RCX
+        results of this representative combination.
+        """
+        if self._rep_table is None:
+            self._rep_table = {}
+            hash_table = {}
+            for combo in super(ClkAmpChar, self).get_combinations_iter():
+                combo = tuple(combo)
+                rep = hash_table.setdefault(self.get_layout_hash(combo), combo)
+                self._rep_table[combo] = rep
+        return self._rep_table[tuple(val_list)]
+
+    def get_combinations_iter(self):
+        """Iterate over sweep combinations.
+
+        While create_designs() generates the designs, combinations whose layout parameters
+        are identical to an earlier one are skipped, so their designs are only generated,
+        verified, and extracted once.  Otherwise all combinations are returned, so every
+        combination gets its own testbench and simulation results.
+
+        In adaptive sweep mode, only sample combinations that are not simulated yet are
+        returned.
+        """
+        if self._adaptive is not None:
+            combo_iter = self._adaptive.samples_iter(pending_only=True)
+        else:
+            combo_iter = super(ClkAmpChar, self).get_combinations_iter()
+
+        if not self._dsn_only:
+            for combo in combo_iter:
+                yield tuple(combo)
+            return
+
+        rep_set = set()
+        for combo in combo_iter:
+            rep = self.get_representative(combo)
+            if rep not in rep_set:
+                rep_set.add(rep)
+                yield rep
+
+    def create_designs(self, tb_type='', extract=True):
+        # type: (str, bool) -> None
+        """Create the designs, and optionally the testbenches of the given type.
+
+        Each unique layout is only created once.  The testbench of every other combination
+        instantiates the design of its representative combination.
+        """
+        self._dsn_only = True
+        try:
+            super(ClkAmpChar, self).create_designs(tb_type=tb_type, extract=extract)
+        finally:
+            self._dsn_only = False
+
+        if tb_type:
+            self.create_shared_testbenches(tb_type)
+
+    def create_shared_testbenches(self, tb_type):
+        # type: (str) -> None
+        """Create testbenches of combinations that share the design of another combination."""
+        tb_specs = self.specs[tb_type]
+        impl_lib = self.specs['impl_lib']
+        dsn_name_base = self.specs['dsn_name_base']
+        tb_name_base = tb_specs['tb_name_base']
+
+        for combo in self.get_combinations_iter():
+            rep = self.get_representative(combo)
+            if rep == combo:
+                # created by create_designs()
+                continue
+            dsn_name = self.get_instance_name(dsn_name_base, rep)
+            tb_name = self.get_instance_name(tb_name_base, combo)
+            tb_sch = self.prj.create_design_module(tb_specs['tb_lib'], tb_specs['tb_cell'])
+            tb_sch.design(dut_lib=impl_lib, dut_cell=dsn_name, **tb_specs['sch_params'])
+            tb_sch.implement_design(impl_lib, top_cell_name=tb_name)
+
+    def setup_adaptive(self, levels=None):
+        # type: (Optional[int]) -> AdaptiveSweep
+        """Enable adaptive sweep mode.
+
+        Instead of the full sweep grid, create_designs() and run_simulations() only use
+        a coarse sample set, which is refined by refine_adaptive() afterwards.  The
+        adaptive sweep is configured by the 'adaptive' entry of the specification file,
+        with the following keys:
+
+        levels : int
+            number of refinement levels.  Defaults to 2.
+        tb_type : str
+            the testbench type used to compute linearity.  Defaults to 'tb_pss_dc'.
+        time_idx : int
+            the output waveform sample index.  Defaults to 0.
+        tol : Dict[str, float]
+            maximum relative change of 'gain', 'offset', and 'err' between neighboring
+            samples before refinement.
+
+        Parameters
+        ----------
+        levels : Optional[int]
+            if given, overrides the number of refinement levels in the specification file.
+
+        Returns
+        -------
+        sweep : AdaptiveSweep
+            the adaptive sweep object.
+        """
+        adapt_specs = self.specs.get('adaptive', {})
+        if levels is None:
+            levels = adapt_specs.get('levels', 2)
+
+        values_list = [self.specs['sweep_params'][var] for var in self.swp_var_list]
+        self._adaptive = AdaptiveSweep(values_list, levels=levels)
+        return self._adaptive
+
+    def get_adaptive_metrics(self, val_list):
+        # type: (Tuple[Any, ...]) -> Dict[str, np.ndarray]
+        """Returns the linearity metrics used for adaptive refinement."""
+        adapt_specs = self.specs.get('adaptive', {})
+        tb_type = adapt_specs.get('tb_type', 'tb_pss_dc')
+        time_idx = adapt_specs.get('time_idx', 0)
+
+        results = self.get_sim_results_lazy(tb_type, val_list)
+        gain, offset, err, _ = self.compute_linearity(results, time_idx)
+        return dict(gain=gain, offset=offset, err=err)
+
+    def refine_adaptive(self):
+        # type: () -> int
+        """Refine the adaptive sweep after all current samples are simulated.
+
+        Returns
+        -------
+        num_new : int
+            number of new samples.  If 0, the adaptive sweep has converged.
+        """
+        if self._adaptive is None:
+            raise ValueError('Adaptive sweep mode is not enabled.')
+
+        tol = self.specs['adaptive']['tol']
+        return self._adaptive.refine(self.get_adaptive_metrics, tol)
+
+    def get_adaptive_interpolator(self, name):
+        # type: (str) -> Callable[[Tuple[Any, ...]], np.ndarray]
+        """Returns an interpolator of the given linearity metric over all simulated samples.
+
+        The returned function takes a sweep combination, and returns the interpolated
+        'gain', 'offset', or 'err' array.
+        """
+        if self._adaptive is None:
+            raise ValueError('Adaptive sweep mode is not enabled.')
+
+        return self._adaptive.get_interpolator(self.get_adaptive_metrics, name)
+
+    def get_sim_results_lazy(self, tb_type, val_list):
+        # type: (str, Tuple[Any, ...]) -> SimResultFile
+        """Returns the simulation results without loading them.
+
+        This method returns the same results as get_sim_results(), but the result file is
+        opened lazily, so only the requested slices are read from disk.
+        """
+        fname = self.get_sim_results_fname(tb_type, val_list)
+        if not os.path.isfile(fname):
+            raise ValueError('Simulation result file %s not found.' % fname)
+        return self.result_store.open(fname)
+
+    def get_sim_results_fname(self, tb_type, val_list):
+        # type: (str, Tuple[Any, ...]) -> str
+        """Returns the simulation result file name."""
+        tb_name = self.get_instance_name(self.specs[tb_type]['tb_name_base'], val_list)
+        return os.path.join(self.specs['root_dir'], tb_type, '%s.hdf5' % tb_name)
+
+    def compress_sim_results(self, tb_type, val_list, compression='lzf'):
+        # type: (str, Tuple[Any, ...], str) -> None
+        """Rewrite the simulation result file with compressed, corner/sweep aligned chunks.
+
+        A sidecar index of the sweep axes is also written, see save_sim_file().
+        """
+        fname = self.get_sim_results_fname(tb_type, val_list)
+        results = self.result_store.open(fname)
+        data = {name: results[name] for name in results.keys()}
+        save_sim_file(data, fname, compression=compression)
+        self.result_store.clear(os.path.abspath(fname))
+
+    def get_surrogate_fname(self, tb_type):
+        # type: (str) -> str
+        """Returns the surrogate model file name of the given testbench type."""
+        return os.path.join(self.specs['root_dir'], '%s_surrogate.npz' % tb_type)
+
+    def load_surrogate(self, tb_type):
+        # type: (str) -> GPSurrogate
+        """Load the surrogate model of the given testbench type."""
+        fname = self.get_surrogate_fname(tb_type)
+        if not os.path.isfile(fname):
+            raise ValueError('Surrogate model file %s not found.' % fname)
+        return GPSurrogate.load(fname)
+
+    def update_surrogate(self, tb_type, time_idx=0, refit_ratio=2.0):
+        # type: (str, int, float) -> GPSurrogate
+        """Train the surrogate model of the linearity metrics with new simulation results.
+
+        The surrogate model maps sweep variables to the gain, offset, and err arrays
+        returned by compute_linearity().  It is saved next to the simulation data, and only
+        simulation results not yet in the saved model are loaded.  The hyperparameters are
+        refitted when the number of samples grows by refit_ratio since the last fit;
+        otherwise new samples are added incrementally.
+
+        Parameters
+        ----------
+        tb_type : str
+            the testbench type.
+        time_idx : int
+            the output waveform sample index.
+        refit_ratio : float
+            the sample count growth ratio that triggers a hyperparameter refit.
 
-        tvec, yvec = dig_to_pwl(values, tper, tr, td=0.0)
+        Returns
+        -------
+        surrogate : GPSurrogate
+            the updated surrogate model.
+        """
+        fname = self.get_surrogate_fname(tb_type)
+        surrogate = GPSurrogate.load(fname) if os.path.isfile(fname) else None
+
+        new_keys, new_metrics = [], []
+        for combo in self.get_combinations_iter():
+            key = tuple(combo)
+            if surrogate is not None and key in surrogate:
+                continue
+            if not os.path.isfile(self.get_sim_results_fname(tb_type, combo)):
+                continue
+            results = self.get_sim_results_lazy(tb_type, combo)
+            gain, offset, err, _ = self.compute_linearity(results, time_idx)
+            new_keys.append(key)
+            new_metrics.append(dict(gain=gain, offset=offset, err=err))
+
+        if surrogate is None:
+            if not new_keys:
+                raise ValueError('No simulation results found for %s.' % tb_type)
+            var_list = list(self.swp_var_list)
+            values_list = [self.specs['sweep_params'][var] for var in var_list]
+            metric_shapes = {name: np.shape(val) for name, val in new_metrics[0].items()}
+            surrogate = GPSurrogate(var_list, values_list, metric_shapes)
+        elif not new_keys:
+            return surrogate
+
+        refit = surrogate.num_samples + len(new_keys) >= refit_ratio * surrogate.num_fit
+        surrogate.add_samples(new_keys, new_metrics, refit=refit)
+        surrogate.save(fname)
+        return surrogate
+
+    @classmethod
+    def _setup_pwl_input(cls, values, tper, tr, tran_fname, **kwargs):
+        # type: (List[float], float, float, str, **Any) -> None
+        """Create the PWL input file.
 
-        tran_fname = os.path.abspath(tran_fname)
-        stimuli_dir = os.path.dirname(tran_fname)
-        os.makedirs(stimuli_dir, exist_ok=True)
-        with open_file(tran_fname, 'w') as f:
-            for t, y in zip(tvec, yvec):
-                f.write('%.8f %.8f\n' % (t,  y))
+        The file is written by the stimulus cache, so identical stimuli are never rewritten.
+        Additional keyword arguments are passed to setup_pwl_file().
+        """
+        setup_pwl_file(tran_fname, values, tper, tr, **kwargs)
 
     def setup_linearity(self):
         tb_specs = self.specs['tb_pss_dc']
@@ -63,28 +338,51 @@ class ClkAmpChar(SimulationManager):
 
         values = [1.0]
         tr = 0.2 * tper
-        self._setup_pwl_input(values, tper, tr, tran_fname)
+        self._setup_pwl_input(values, tper, tr, tran_fname,
+                              cache_dir=self.specs.get('stimuli_cache_dir', None))
 
     def setup_tran_binary(self):
+        """Create the binary data input file.
+
+        The data pattern is set by the optional 'input_pattern' entry of the testbench
+        specification, which is either 'de_bruijn' (the default, with order input_n) or
+        'prbsN', where N is the PRBS order.  The PRBS length is set by the optional
+        'input_len' entry, which defaults to 2 ** input_n, the de Bruijn sequence length.
+        The optional 'input_jitter', 'input_isi', and 'input_seed' entries add random jitter
+        and inter-symbol interference to the input.
+        """
         tb_specs = self.specs['tb_pss_tran']
         input_tr = tb_specs['input_tr']
-        input_n = tb_specs['input_n']
         tper = tb_specs['tb_params']['tper']
         tran_fname = tb_specs['sch_params']['tran_fname']
-
-        values = de_bruijn(input_n, symbols=[-1.0, 1.0])
+        pattern = tb_specs.get('input_pattern', 'de_bruijn')
+
+        if pattern == 'de_bruijn':
+            values = de_bruijn(tb_specs['input_n'], symbols=[-1.0, 1.0])
+        elif pattern.startswith('prbs'):
+            num = tb_specs.get('input_len', 2 ** tb_specs['input_n'])
+            values = prbs(int(pattern[4:]), num=num, symbols=[-1.0, 1.0])
+        else:
+            raise ValueError('Unknown input pattern: %s' % pattern)
         tb_specs['tb_params']['tper_pss'] = tper * len(values)
 
-        self._setup_pwl_input(values, tper, input_tr, tran_fname)
+        self._setup_pwl_input(values, tper, input_tr, tran_fname,
+                              jitter_rms=tb_specs.get('input_jitter', 0.0),
+                              isi=tb_specs.get('input_isi', None),
+                              seed=tb_specs.get('input_seed', 0),
+                              cache_dir=self.specs.get('stimuli_cache_dir', None))
 
     def get_layout_params(self, val_list):
         # type: (Tuple[Any, ...]) -> Dict[str, Any]
         """Returns the layout dictionary from the given sweep parameter values.
 
         This method is over-ridden so user can set width/threshold/segment too.
+        Testbench-only sweep variables are ignored.
         """
         lay_params = deepcopy(self.specs['layout_params'])
         for var, val in zip(self.swp_var_list, val_list):
+            if self._is_tb_var(var):
+                continue
             # handle width/threshold/segment settings
             special_var = False
             for prefix in ('w_', 'th_', 'seg_'):
@@ -114,11 +412,17 @@ class ClkAmpChar(SimulationManager):
         dsn_name_base = self.specs['dsn_name_base']
 
         tb_params = tb_specs['tb_params']
-        dsn_name = self.get_instance_name(dsn_name_base, val_list)
+        dsn_name = self.get_instance_name(dsn_name_base, self.get_representative(val_list))
 
         tb.set_simulation_environments(sim_envs)
         tb.set_simulation_view(impl_lib, dsn_name, view_name)
 
+        # testbench-only sweep variables are set to the values of this combination.
+        tb_params = tb_params.copy()
+        for var, val in zip(self.swp_var_list, val_list):
+            if self._is_tb_var(var):
+                tb_params[var] = val
+
         for key, val in tb_params.items():
             if isinstance(val, list):
                 tb.set_sweep_parameter(key, values=val)
@@ -160,8 +464,56 @@ class ClkAmpChar(SimulationManager):
         swp_var_list : List[str]
             list of swept parameter names of each dimension of the return result.
         """
+        vin, vod, swp_var_list = cls._get_linearity_data(results)
+        x, err = cls._fit_linear(vin, vod[..., time_idx])
+        return x[0, ...], x[1, ...], err, swp_var_list[:-1]
+
+    @classmethod
+    def compute_linearity_vs_time(cls, results):
+        # type: (Dict[str, Any]) -> Tuple[np.array, ...]
+        """Given a PSS simulation with DC input, compute linearity spec at all time samples.
+
+        This function is equivalent to calling compute_linearity() at every time index, but
+        performs all least-square fits at once.
+
+        Parameters
+        ----------
+        results : Dict[str, Any]
+            the simulation result dictionary.
+
+        Returns
+        -------
+        gain : np.array
+            A (N1, N2, ..., NT) numpy array representing the linear gain across
+            swept parameters and time.
+        offset : np.array
+            A (N1, N2, ..., NT) numpy array representing the differential output
+            offset across swept parameters and time.
+        err : np.array
+            A (N1, N2, ..., NT) numpy array of least-square fit residues across swept
+            parameters and time.
+        gain_idx : np.array
+            A (N1, N2, ...) numpy array of time indices with maximum gain.
+        err_idx : np.array
+            A (N1, N2, ...) numpy array of time indices with minimum residue.
+        swp_var_list : List[str]
+            list of swept parameter names of each dimension of the gain, offset, and err.
+            The last one is always 'time'.
+        """
+        vin, vod, swp_var_list = cls._get_linearity_data(results)
+        x, err = cls._fit_linear(vin, vod)
+        gain = x[0, ...]
+        return (gain, x[1, ...], err, np.argmax(gain, axis=-1), np.argmin(err, axis=-1),
+                swp_var_list)
+
+    @classmethod
+    def _get_linearity_data(cls, results):
+        # type: (Dict[str, Any]) -> Tuple[np.array, np.array, List[str]]
+        """Returns the input, and the output with gain as the first and time as the last axis.
+
+        The returned sweep parameter list does not include gain.
+        """
         swp_var_list = list(results['sweep_params']['vod'])
-        vod = results['vod']
 
         # error checking
         if 'gain' not in swp_var_list:
@@ -169,24 +521,17 @@ class ClkAmpChar(SimulationManager):
         if 'time' not in swp_var_list:
             raise ValueError('time is not swept, something is wrong.')
 
-        # remove time
-        num_dim = len(swp_var_list)
-        ax_idx = swp_var_list.index('time')
-        if ax_idx != num_dim - 1:
-            vod = np.swapaxes(vod, ax_idx, num_dim - 1)
-            swp_var_list[ax_idx] = swp_var_list[num_dim - 1]
-        vod = vod[..., time_idx]
-        swp_var_list = swp_var_list[:-1]
-
-        # move gain to first dimension
-        ax_idx = swp_var_list.index('gain')
-        if ax_idx != 0:
-            vod = np.swapaxes(vod, 0, ax_idx)
-            swp_var_list[ax_idx] = swp_var_list[0]
-        swp_var_list = swp_var_list[1:]
-
-        # perform least square linear fit
-        vin = results['gain']
+        gain_idx = swp_var_list.index('gain')
+        time_idx = swp_var_list.index('time')
+        vod = np.moveaxis(results['vod'], (gain_idx, time_idx), (0, -1))
+        swp_var_list = [var for var in swp_var_list if var != 'gain' and var != 'time']
+        swp_var_list.append('time')
+        return results['gain'], vod, swp_var_list
+
+    @classmethod
+    def _fit_linear(cls, vin, vod):
+        # type: (np.array, np.array) -> Tuple[np.array, np.array]
+        """Perform least square linear fit on the first axis of vod."""
         num_in = vin.size
         swp_shape = vod.shape[1:]
         b = vod.reshape((num_in, -1))
@@ -197,4 +542,4 @@ class ClkAmpChar(SimulationManager):
         x = x.reshape((2, ) + swp_shape)
         err = err.reshape(swp_shape)
 
-        return x[0, ...], x[1, ...], err, swp_var_list
+        return x, err
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines streaming PWL stimulus generation with content-addressed caching.
+
+Long data patterns, such as PRBS31 or high order de Bruijn sequences, produce PWL files with
+millions of points.  This module generates the pattern and the PWL points with numpy, and
+writes them chunk by chunk with a single format operation per chunk.  Generated files are
+stored in a cache directory under the hash of all stimulus parameters, so an identical
+stimulus is only ever written once.
+"""
+
+from typing import Optional, Sequence, Iterable, Tuple
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+# PRBS feedback taps.  The sequence satisfies s[i] = s[i - k] ^ s[i - n], where
+# n is the PRBS order and k is the tap listed here.
+_prbs_taps = {
+    7: 6,
+    9: 5,
+    11: 9,
+    15: 14,
+    20: 3,
+    23: 18,
+    31: 28,
+}
+
+# stimulus file format version, part of the cache key.
+_pwl_version = 2
+
+
+def prbs(order, num=None, symbols=None):
+    # type: (int, Optional[int], Optional[Sequence[float]]) -> np.ndarray
+    """Generate a pseudo-random binary sequence.
+
+    The sequence is computed with repeated squaring of the feedback polynomial, so
+    each step extends the sequence by an exponentially growing block with one numpy
+    operation.
+
+    Parameters
+    ----------
+    order : int
+        the PRBS order.  Supported orders are 7, 9, 11, 15, 20, 23, and 31.
+    num : Optional[int]
+        the sequence length.  Defaults to one full period, 2 ** order - 1.
+    symbols : Optional[Sequence[float]]
+        the values of the 0 and 1 bits.  Defaults to [0, 1].
+
+    Returns
+    -------
+    seq : np.ndarray
+        the PRBS sequence.
+    """
+    if order not in _prbs_taps:
+        raise ValueError('Unsupported PRBS order: %d' % order)
+    if num is None:
+        num = 2 ** order - 1
+
+    bits = np.ones(max(num, order), dtype=np.uint8)
+    lag_k, lag_n = _prbs_taps[order], order
+    cur = order
+    while cur < num:
+        if cur >= 2 * lag_n:
+            # s[i] = s[i - 2k] ^ s[i - 2n] also holds, so we can extend by larger blocks.
+            lag_k *= 2
+            lag_n *= 2
+        else:
+            step = min(lag_k, num - cur)
+            bits[cur:cur + step] = (bits[cur - lag_k:cur - lag_k + step] ^
+                                    bits[cur - lag_n:cur - lag_n + step])
+            cur += step
+
+    bits = bits[:num]
+    if symbols is None:
+        return bits
+    return np.array(symbols, dtype=float)[bits]
+
+
+def apply_isi(values, taps):
+    # type: (Sequence[float], Sequence[float]) -> np.ndarray
+    """Apply inter-symbol interference to a periodic symbol sequence.
+
+    Parameters
+    ----------
+    values : Sequence[float]
+        the symbol sequence.  It is treated as periodic.
+    taps : Sequence[float]
+        the channel pulse response, sampled once per symbol.  taps[0] is the main cursor,
+        taps[k] is the k-th post-cursor.
+
+    Returns
+    -------
+    values : np.ndarray
+        the symbol values with ISI.
+    """
+    values = np.asarray(values, dtype=float)
+    ans = np.zeros(values.shape)
+    for idx, tap in enumerate(taps):
+        if tap != 0:
+            ans += tap * np.roll(values, idx)
+    return ans
+
+
+def pwl_iter(values, tper, tr, td=0.0, jitter_rms=0.0, seed=0, chunk_size=1 << 16):
+    # type: (Sequence[float], float, float, float, float, int, int) -> Iterable[np.ndarray]
+    """Iterate over PWL points of the given symbol sequence, chunk by chunk.
+
+    The output starts at values[0].  Whenever the symbol value changes at the start of a
+    symbol, the output ramps linearly from the old value to the new value in tr seconds.
+    The last point is at the end of the last symbol.
+
+    Parameters
+    ----------
+    values : Sequence[float]
+        the symbol values.
+    tper : float
+        the symbol period.
+    tr : float
+        the transition time.
+    td : float
+        the delay of the first symbol.
+    jitter_rms : float
+        RMS of the random Gaussian jitter added to each transition.  Jitter is clipped so
+        that transitions never overlap.
+    seed : int
+        the random number generator seed.
+    chunk_size : int
+        number of symbols per chunk.
+
+    Yields
+    ------
+    points : np.ndarray
+        a (N, 2) array of time and value pairs.
+    """
+    values = np.asarray(values, dtype=float)
+    num = values.size
+    if num == 0:
+        raise ValueError('Cannot generate PWL of an empty sequence.')
+
+    rng = np.random.RandomState(seed) if jitter_rms > 0 else None
+    max_jitter = max(0.0, (tper - tr) / 2)
+
+    yield np.array([[0.0, values[0]]] if td <= 0 else [[0.0, values[0]], [td, values[0]]])
+    for start in range(1, num, chunk_size):
+        stop = min(start + chunk_size, num)
+        prev = values[start - 1:stop - 1]
+        cur = values[start:stop]
+        idx = np.nonzero(cur != prev)[0]
+        tvec = td + (idx + start) * tper
+        if rng is not None:
+            tvec = tvec + np.clip(rng.normal(scale=jitter_rms, size=idx.size),
+                                  -max_jitter, max_jitter)
+
+        points = np.empty((2 * idx.size, 2))
+        points[0::2, 0] = tvec
+        points[0::2, 1] = prev[idx]
+        points[1::2, 0] = tvec + tr
+        points[1::2, 1] = cur[idx]
+        yield points
+
+    yield np.array([[td + num * tper, values[-1]]])
+
+
+def write_pwl(fname, points_iter, fmt='%.15g %.8f\n'):
+    # type: (str, Iterable[np.ndarray], str) -> None
+    """Write PWL points to the given file.
+
+    Each chunk is formatted with a single string format operation.  The default format
+    keeps full double precision of the time points, so long stimuli do not lose the
+    transition edges to rounding.
+    """
+    dir_name = os.path.dirname(fname)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    tmp_fname = fname + '.tmp'
+    with open(tmp_fname, 'w') as f:
+        for points in points_iter:
+            if points.size:
+                f.write((fmt * points.shape[0]) % tuple(points.ravel().tolist()))
+    os.replace(tmp_fname, fname)
+
+
+def get_pwl_hash(values, tper, tr, **kwargs):
+    # type: (Sequence[float], float, float, **object) -> str
+    """Returns the content hash of the given stimulus."""
+    hasher = hashlib.sha1()
+    hasher.update(np.asarray(values, dtype=float).tobytes())
+    info = dict(tper=tper, tr=tr, version=_pwl_version)
+    info.update(kwargs)
+    hasher.update(json.dumps(info, sort_keys=True).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def setup_pwl_file(fname, values, tper, tr, td=0.0, jitter_rms=0.0, isi=None, seed=0,
+                   cache_dir=None):
+    # type: (str, Sequence[float], float, float, float, float, Optional[Sequence[float]], int, Optional[str]) -> Tuple[str, bool]
+    """Create a PWL stimulus file, reusing a cached file with the same content if possible.
+
+    The stimulus is written to the cache directory under its content hash, and fname is
+    created as a symbolic link to the cached file.
+
+    Parameters
+    ----------
+    fname : str
+        the stimulus file name.
+    values : Sequence[float]
+        the symbol values.
+    tper : float
+        the symbol period.
+    tr : float
+        the transition time.
+    td : float
+        the delay of the first symbol.
+    jitter_rms : float
+        RMS of the random transition jitter.
+    isi : Optional[Sequence[float]]
+        if given, the pulse response used to add inter-symbol interference.
+    seed : int
+        the jitter random number generator seed.
+    cache_dir : Optional[str]
+        the cache directory.  Defaults to the pwl_cache directory next to fname.
+
+    Returns
+    -------
+    cache_fname : str
+        the cached stimulus file name.
+    created : bool
+        True if a new stimulus file is written.
+    """
+    fname = os.path.abspath(fname)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(fname), 'pwl_cache')
+
+    isi = None if isi is None else [float(v) for v in isi]
+    pwl_hash = get_pwl_hash(values, tper, tr, td=td, jitter_rms=jitter_rms, isi=isi,
+                            seed=seed)
+    cache_fname = os.path.join(os.path.abspath(cache_dir), '%s.pwl' % pwl_hash)
+
+    created = not os.path.isfile(cache_fname)
+    if created:
+        if isi is not None:
+            values = apply_isi(values, isi)
+        write_pwl(cache_fname, pwl_iter(values, tper, tr, td=td, jitter_rms=jitter_rms,
+                                        seed=seed))
+
+    if not os.path.islink(fname) or os.readlink(fname) != cache_fname:
+        if os.path.lexists(fname):
+            os.remove(fname)
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        os.symlink(cache_fname, fname)
+
+    return cache_fname, created
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines a lazily loaded simulation result store.
+
+Simulation result files saved by BAG can be very large.  Instead of loading the whole
+file, this store only reads the sweep parameters when a file is opened, then reads the
+requested hyperslab of an output on demand.  Uncompressed contiguous datasets are
+memory-mapped directly; other datasets are read chunk by chunk through h5py.  Recently
+used slices are kept in a LRU cache with a bounded total size.
+
+This module also defines a result writer that stores outputs compressed, with one chunk
+per corner and sweep slice, and writes a sidecar index of the sweep axes so readers can
+locate slices without scanning the file.
+"""
+
+from typing import Dict, Any, List, Tuple, Optional
+
+import os
+import json
+from collections import OrderedDict
+
+import numpy as np
+import h5py
+
+
+def _decode_array(arr):
+    # type: (np.ndarray) -> np.ndarray
+    if arr.dtype.kind == 'S':
+        return np.char.decode(arr, 'utf-8')
+    return arr
+
+
+class SimResultFile(object):
+    """A lazily loaded simulation result file.
+
+    This class supports the dictionary interface of the results returned by load_sim_file,
+    so existing code can use it directly.  Accessing an output through the dictionary
+    interface reads the whole array; use get_slice() to read only a part of it.
+
+    Parameters
+    ----------
+    fname : str
+        the simulation result file name.
+    store : SimResultStore
+        the result store that caches data of this file.
+    """
+
+    def __init__(self, fname, store):
+        # type: (str, SimResultStore) -> None
+        self._fname = fname
+        self._store = store
+        self._sweep_params = {}  # type: Dict[str, List[str]]
+        self._info = OrderedDict()  # type: Dict[str, Tuple[Tuple[int, ...], np.dtype, int]]
+        self._values = {}  # type: Dict[str, np.ndarray]
+
+        index = _read_index(fname)
+        if index is not None:
+            for name, info in index['outputs'].items():
+                self._sweep_params[name] = info['sweep_params']
+                self._info[name] = (tuple(info['shape']), np.dtype(info['dtype']), -1)
+            for name, info in index['sweeps'].items():
+                self._values[name] = np.array(info['values'], dtype=info['dtype'])
+                self._info[name] = (self._values[name].shape, self._values[name].dtype, -1)
+            return
+
+        with h5py.File(fname, 'r') as f:
+            for name in f:
+                dset = f[name]
+                if 'sweep_params' in dset.attrs:
+                    self._sweep_params[name] = [var.decode() if isinstance(var, bytes) else var
+                                                for var in dset.attrs['sweep_params']]
+                # memory map offset, -1 if this dataset cannot be memory-mapped.
+                offset = dset.id.get_offset()
+                if offset is None or dset.chunks is not None or dset.dtype.kind not in 'biufc':
+                    offset = -1
+                self._info[name] = (dset.shape, dset.dtype, offset)
+
+    @property
+    def fname(self):
+        # type: () -> str
+        return self._fname
+
+    @property
+    def sweep_params(self):
+        # type: () -> Dict[str, List[str]]
+        return self._sweep_params
+
+    def keys(self):
+        return list(self._info.keys()) + ['sweep_params']
+
+    def __contains__(self, item):
+        # type: (str) -> bool
+        return item == 'sweep_params' or item in self._info
+
+    def __getitem__(self, item):
+        # type: (str) -> Any
+        if item == 'sweep_params':
+            return self._sweep_params
+        if item in self._sweep_params:
+            return self.get_slice(item)[0]
+        if item not in self._info:
+            raise KeyError(item)
+
+        # sweep values are small, keep them in this object.
+        ans = self._values.get(item, None)
+        if ans is None:
+            ans = self._values[item] = _decode_array(self._read(item, ()))
+        return ans
+
+    def get(self, item, default=None):
+        # type: (str, Any) -> Any
+        return self[item] if item in self else default
+
+    def get_index(self, var, val):
+        # type: (str, Any) -> int
+        """Returns the index of the given sweep parameter value."""
+        idx_arr = np.argwhere(self[var] == val)
+        if idx_arr.size == 0:
+            raise ValueError('Cannot find %s = %s in %s' % (var, val, self._fname))
+        return int(idx_arr[0][0])
+
+    def get_slice(self, name, **kwargs):
+        # type: (str, **Any) -> Tuple[np.ndarray, List[str]]
+        """Read a hyperslab of the given output.
+
+        Parameters
+        ----------
+        name : str
+            the output name.
+        **kwargs :
+            sweep parameter values to select.  For example, corner='tt'.
+
+        Returns
+        -------
+        data : np.ndarray
+            the output data.  Selected sweep parameter dimensions are removed.
+        swp_pars : List[str]
+            the sweep parameters of the remaining dimensions.
+        """
+        swp_pars = self._sweep_params[name]
+        for var in kwargs:
+            if var not in swp_pars:
+                raise ValueError('%s is not swept in output %s' % (var, name))
+
+        idx_list = tuple(self.get_index(var, kwargs[var]) if var in kwargs else None
+                         for var in swp_pars)
+        key = (self._fname, name, idx_list)
+        data = self._store.get_cached(key)
+        if data is None:
+            slices = tuple(slice(None) if idx is None else idx for idx in idx_list)
+            data = self._store.set_cached(key, self._read(name, slices))
+        return data, [var for var in swp_pars if var not in kwargs]
+
+    def _read(self, name, idx_list):
+        # type: (str, Tuple[Any, ...]) -> np.ndarray
+        shape, dtype, offset = self._info[name]
+        if offset >= 0 and shape:
+            mmap = np.memmap(self._fname, dtype=dtype, mode='r', offset=offset, shape=shape)
+            return np.array(mmap[idx_list])
+        with h5py.File(self._fname, 'r') as f:
+            # outputs without sweep axes are read as numpy scalars
+            return np.asarray(f[name][idx_list])
+
+
+class SimResultStore(object):
+    """A simulation result store with a bounded LRU slice cache.
+
+    Parameters
+    ----------
+    max_bytes : int
+        maximum total size of cached slices, in bytes.
+    """
+
+    def __init__(self, max_bytes=1 << 28):
+        # type: (int) -> None
+        self._max_bytes = max_bytes
+        self._cur_bytes = 0
+        self._cache = OrderedDict()  # type: Dict[Any, np.ndarray]
+        self._files = {}  # type: Dict[Tuple[str, float], SimResultFile]
+
+    def open(self, fname):
+        # type: (str) -> SimResultFile
+        """Returns the lazily loaded result file with the given name."""
+        fname = os.path.abspath(fname)
+        key = (fname, os.path.getmtime(fname))
+        ans = self._files.get(key, None)
+        if ans is None:
+            # drop cached data of old versions of this file
+            for old_key in [k for k in self._files if k[0] == fname]:
+                del self._files[old_key]
+            self.clear(fname)
+            ans = self._files[key] = SimResultFile(fname, self)
+        return ans
+
+    def get_cached(self, key):
+        # type: (Any) -> Optional[np.ndarray]
+        data = self._cache.get(key, None)
+        if data is not None:
+            self._cache.move_to_end(key)
+        return data
+
+    def set_cached(self, key, data):
+        # type: (Any, np.ndarray) -> np.ndarray
+        # cached arrays are shared, so make them read-only
+        data = np.asarray(data)
+        data.flags.writeable = False
+        if data.nbytes > self._max_bytes:
+            return data
+        self._cache[key] = data
+        self._cur_bytes += data.nbytes
+        while self._cur_bytes > self._max_bytes:
+            _, old_data = self._cache.popitem(last=False)
+            self._cur_bytes -= old_data.nbytes
+        return data
+
+    def clear(self, fname=None):
+        # type: (Optional[str]) -> None
+        """Remove cached slices of the given file, or all cached slices if fname is None."""
+        if fname is None:
+            self._cache.clear()
+            self._cur_bytes = 0
+        else:
+            for key in [k for k in self._cache if k[0] == fname]:
+                self._cur_bytes -= self._cache.pop(key).nbytes
+
+
+# the default result store
+_default_store = SimResultStore()
+
+
+def open_sim_file(fname):
+    # type: (str) -> SimResultFile
+    """Open the given simulation result file lazily, using the default result store."""
+    return _default_store.open(fname)
+
+
+def get_index_fname(fname):
+    # type: (str) -> str
+    """Returns the sidecar index file name of the given result file."""
+    return fname + '.index.json'
+
+
+def _read_index(fname):
+    # type: (str) -> Optional[Dict[str, Any]]
+    """Returns the sidecar index of the given result file, or None if it is not valid."""
+    index_fname = get_index_fname(fname)
+    if not os.path.isfile(index_fname) or \
+            os.path.getmtime(index_fname) < os.path.getmtime(fname):
+        return None
+    with open(index_fname, 'r') as f:
+        return json.load(f)
+
+
+def get_chunk_shape(shape, swp_vars, itemsize, chunk_bytes):
+    # type: (Tuple[int, ...], List[str], int, int) -> Tuple[int, ...]
+    """Compute the chunk shape of an output.
+
+    Each chunk covers a single corner.  Sweep dimensions are filled from the innermost one
+    outwards; the first dimension that does not fit within chunk_bytes gets as many entries
+    as fit, and all outer dimensions get one entry.
+    """
+    corner_idx = swp_vars.index('corner') if 'corner' in swp_vars else -1
+    max_size = max(1, chunk_bytes // itemsize)
+    chunks = [1] * len(shape)
+    size = 1
+    for idx in range(len(shape) - 1, -1, -1):
+        if idx != corner_idx:
+            num = min(shape[idx], max_size // size)
+            if num < 1:
+                break
+            chunks[idx] = num
+            size *= num
+            if num < shape[idx]:
+                break
+    return tuple(chunks)
+
+
+def save_sim_file(results, fname, compression='lzf', chunk_bytes=1 << 20):
+    # type: (Dict[str, Any], str, str, int) -> None
+    """Save simulation results with compressed, corner/sweep aligned chunks.
+
+    The file uses the same format as BAG's save_sim_results(), so it can be read by
+    load_sim_file().  A sidecar index of the outputs and sweep axes is also written.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        the simulation results dictionary.
+    fname : str
+        the output file name.
+    compression : str
+        the HDF5 compression filter.  lzf is fast and always available in h5py.
+    chunk_bytes : int
+        the maximum chunk size, in bytes.
+    """
+    fname = os.path.abspath(fname)
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+
+    outputs = OrderedDict()
+    sweeps = OrderedDict()
+    with h5py.File(fname, 'w') as f:
+        for name, swp_vars in results['sweep_params'].items():
+            data = np.asarray(results[name])
+            if not data.shape:
+                dset = f.create_dataset(name, data=data)
+            else:
+                chunks = get_chunk_shape(data.shape, swp_vars, data.dtype.itemsize, chunk_bytes)
+                dset = f.create_dataset(name, data=data, chunks=chunks, compression=compression)
+            dset.attrs['sweep_params'] = [var.encode() for var in swp_vars]
+            outputs[name] = dict(sweep_params=list(swp_vars), shape=list(data.shape),
+                                 dtype=data.dtype.str, chunks=dset.chunks and list(dset.chunks))
+
+            # store sweep parameter values
+            for var in swp_vars:
+                if var not in f:
+                    swp_data = np.asarray(results[var])
+                    if swp_data.dtype.kind == 'U':
+                        f.create_dataset(var, data=np.char.encode(swp_data, 'utf-8'))
+                    else:
+                        f.create_dataset(var, data=swp_data)
+                    sweeps[var] = dict(values=swp_data.tolist(), dtype=swp_data.dtype.str)
+
+    with open(get_index_fname(fname), 'w') as f:
+        json.dump(dict(outputs=outputs, sweeps=sweeps), f, indent=2)
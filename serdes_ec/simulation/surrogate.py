@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines a Gaussian process surrogate model of characterization results.
+
+The surrogate maps sweep parameter values to metric arrays, such as the gain, offset, and
+non-linearity computed from each simulation.  Numeric sweep parameters are scaled to [0, 1],
+and non-numeric ones (such as thresholds) are one-hot encoded.  All metric entries share a
+squared exponential kernel with one length scale per input dimension, so a prediction is a
+single kernel evaluation followed by a matrix product, and new samples can be added with a
+Cholesky update instead of a full refit.
+"""
+
+from typing import Dict, Any, List, Tuple, Sequence, Optional
+
+import json
+import numbers
+
+import numpy as np
+import scipy.linalg as linalg
+import scipy.optimize as sciopt
+
+
+class GPSurrogate(object):
+    """A Gaussian process regression surrogate model.
+
+    Parameters
+    ----------
+    var_list : Sequence[str]
+        the input sweep parameter names.
+    values_list : Sequence[Sequence[Any]]
+        all possible values of each input sweep parameter.
+    metric_shapes : Dict[str, Tuple[int, ...]]
+        the shape of each metric array.
+    noise : float
+        the noise variance of the normalized metrics.
+    """
+
+    def __init__(self, var_list, values_list, metric_shapes, noise=1e-6):
+        # type: (Sequence[str], Sequence[Sequence[Any]], Dict[str, Tuple[int, ...]], float) -> None
+        self._var_list = list(var_list)
+        self._values_list = [list(vals) for vals in values_list]
+        self._metric_shapes = {key: tuple(val) for key, val in metric_shapes.items()}
+        self._metric_names = sorted(self._metric_shapes.keys())
+        self._noise = noise
+
+        self._num_in = 0
+        for vals in self._values_list:
+            self._num_in += 1 if self._is_numeric(vals) else len(vals)
+
+        self._keys = []  # type: List[Tuple[Any, ...]]
+        self._xmat = np.empty((0, self._num_in))
+        self._ymat = np.empty((0, self.num_out))
+        self._ymean = None  # type: Optional[np.ndarray]
+        self._ystd = None  # type: Optional[np.ndarray]
+        self._log_scale = np.zeros(self._num_in)
+        self._chol = None  # type: Optional[np.ndarray]
+        self._alpha = None  # type: Optional[np.ndarray]
+        # number of samples at the last hyperparameter fit
+        self._num_fit = 0
+
+    @classmethod
+    def _is_numeric(cls, val_list):
+        # type: (Sequence[Any]) -> bool
+        return all(isinstance(val, numbers.Real) and not isinstance(val, bool)
+                   for val in val_list)
+
+    @property
+    def num_out(self):
+        # type: () -> int
+        return sum((int(np.prod(self._metric_shapes[name])) for name in self._metric_names))
+
+    @property
+    def num_samples(self):
+        # type: () -> int
+        return len(self._keys)
+
+    @property
+    def num_fit(self):
+        # type: () -> int
+        return self._num_fit
+
+    def __contains__(self, val_list):
+        # type: (Sequence[Any]) -> bool
+        return tuple(val_list) in self._keys
+
+    def encode(self, val_list):
+        # type: (Sequence[Any]) -> np.ndarray
+        """Returns the normalized input vector of the given sweep parameter values."""
+        ans = []
+        for vals, val in zip(self._values_list, val_list):
+            if self._is_numeric(vals):
+                vmin, vmax = min(vals), max(vals)
+                ans.append(0.0 if vmax == vmin else (val - vmin) / (vmax - vmin))
+            else:
+                if val not in vals:
+                    raise ValueError('Unknown sweep parameter value: %s' % val)
+                ans.extend((1.0 if v == val else 0.0 for v in vals))
+        return np.array(ans)
+
+    def _kernel(self, xmat0, xmat1):
+        # type: (np.ndarray, np.ndarray) -> np.ndarray
+        scale = np.exp(self._log_scale)
+        x0 = xmat0 / scale
+        x1 = xmat1 / scale
+        dist = np.sum(x0**2, axis=1)[:, np.newaxis] + np.sum(x1**2, axis=1)[np.newaxis, :] - \
+            2 * np.dot(x0, x1.T)
+        return np.exp(-0.5 * np.maximum(dist, 0))
+
+    def _flatten(self, metrics):
+        # type: (Dict[str, Any]) -> np.ndarray
+        return np.concatenate([np.asarray(metrics[name], dtype=float).reshape(-1)
+                               for name in self._metric_names])
+
+    def _unflatten(self, yvec):
+        # type: (np.ndarray) -> Dict[str, np.ndarray]
+        ans = {}
+        idx = 0
+        for name in self._metric_names:
+            shape = self._metric_shapes[name]
+            size = int(np.prod(shape))
+            ans[name] = yvec[..., idx:idx + size].reshape(yvec.shape[:-1] + shape)
+            idx += size
+        return ans
+
+    def add_samples(self, val_list_list, metrics_list, refit=False):
+        # type: (Sequence[Sequence[Any]], Sequence[Dict[str, Any]], bool) -> None
+        """Add new samples to this surrogate model.
+
+        If the hyperparameters are fitted, and refit is False, the new samples are added
+        with a Cholesky update.  Otherwise, the hyperparameters are refitted on all samples.
+
+        Parameters
+        ----------
+        val_list_list : Sequence[Sequence[Any]]
+            the sweep parameter values of each new sample.
+        metrics_list : Sequence[Dict[str, Any]]
+            the metric arrays of each new sample.
+        refit : bool
+            True to refit the hyperparameters.
+        """
+        new_keys = [tuple(val_list) for val_list in val_list_list]
+        for key in new_keys:
+            if key in self._keys:
+                raise ValueError('Sample %s already exists.' % (key, ))
+        if not new_keys:
+            return
+
+        xnew = np.array([self.encode(key) for key in new_keys])
+        ynew = np.array([self._flatten(metrics) for metrics in metrics_list])
+        self._keys.extend(new_keys)
+        self._xmat = np.vstack((self._xmat, xnew))
+        self._ymat = np.vstack((self._ymat, ynew))
+
+        if refit or self._chol is None:
+            self.fit()
+            return
+
+        # Cholesky update: [[L, 0], [B.T, C]]
+        knew = self._kernel(xnew, xnew) + self._noise * np.eye(xnew.shape[0])
+        bmat = linalg.solve_triangular(self._chol, self._kernel(self._xmat[:-len(new_keys)],
+                                                                xnew), lower=True)
+        cmat = linalg.cholesky(knew - np.dot(bmat.T, bmat), lower=True)
+        num_old = self._chol.shape[0]
+        num_tot = num_old + xnew.shape[0]
+        chol = np.zeros((num_tot, num_tot))
+        chol[:num_old, :num_old] = self._chol
+        chol[num_old:, :num_old] = bmat.T
+        chol[num_old:, num_old:] = cmat
+        self._chol = chol
+        self._alpha = linalg.cho_solve((chol, True), self._normalize(self._ymat))
+
+    def _normalize(self, ymat):
+        # type: (np.ndarray) -> np.ndarray
+        return (ymat - self._ymean) / self._ystd
+
+    def _neg_log_likelihood(self, log_scale, ynorm):
+        # type: (np.ndarray, np.ndarray) -> float
+        self._log_scale = log_scale
+        kmat = self._kernel(self._xmat, self._xmat) + self._noise * np.eye(self._xmat.shape[0])
+        try:
+            chol = linalg.cholesky(kmat, lower=True)
+        except linalg.LinAlgError:
+            return np.inf
+        alpha = linalg.cho_solve((chol, True), ynorm)
+        return 0.5 * np.sum(ynorm * alpha) + ynorm.shape[1] * np.sum(np.log(np.diag(chol)))
+
+    def fit(self):
+        # type: () -> None
+        """Fit the hyperparameters by maximizing the marginal likelihood of all samples."""
+        if not self._keys:
+            raise ValueError('Cannot fit surrogate model without samples.')
+
+        self._ymean = np.mean(self._ymat, axis=0)
+        ystd = np.std(self._ymat, axis=0)
+        self._ystd = np.where(ystd > 0, ystd, 1.0)
+        ynorm = self._normalize(self._ymat)
+
+        # length scales between 0.05 and 20 times the normalized input range
+        bounds = [(np.log(0.05), np.log(20.0))] * self._num_in
+        opt = sciopt.minimize(self._neg_log_likelihood, np.zeros(self._num_in), args=(ynorm, ),
+                              method='L-BFGS-B', bounds=bounds)
+        self._log_scale = opt.x
+        kmat = self._kernel(self._xmat, self._xmat) + self._noise * np.eye(self._xmat.shape[0])
+        self._chol = linalg.cholesky(kmat, lower=True)
+        self._alpha = linalg.cho_solve((self._chol, True), ynorm)
+        self._num_fit = len(self._keys)
+
+    def predict(self, val_list_list, return_std=False):
+        # type: (Sequence[Sequence[Any]], bool) -> Any
+        """Predict metrics at the given sweep parameter values.
+
+        Parameters
+        ----------
+        val_list_list : Sequence[Sequence[Any]]
+            list of sweep parameter values.
+        return_std : bool
+            True to also return the standard deviation of the predictions.
+
+        Returns
+        -------
+        mean : Dict[str, np.ndarray]
+            the predicted metrics.  The first dimension is the query index.
+        std : Dict[str, np.ndarray]
+            the standard deviation of the predicted metrics.  Only returned if return_std
+            is True.
+        """
+        if self._alpha is None:
+            raise ValueError('Surrogate model is not fitted.')
+
+        xmat = np.array([self.encode(val_list) for val_list in val_list_list])
+        kmat = self._kernel(xmat, self._xmat)
+        mean = self._unflatten(np.dot(kmat, self._alpha) * self._ystd + self._ymean)
+        if not return_std:
+            return mean
+
+        vmat = linalg.solve_triangular(self._chol, kmat.T, lower=True)
+        var = np.maximum(1.0 + self._noise - np.sum(vmat**2, axis=0), 0)
+        std = np.sqrt(var)[:, np.newaxis] * self._ystd
+        return mean, self._unflatten(std)
+
+    def save(self, fname):
+        # type: (str) -> None
+        """Save this surrogate model to the given .npz file."""
+        if self._chol is None:
+            raise ValueError('Surrogate model is not fitted.')
+        info = dict(var_list=self._var_list, values_list=self._values_list,
+                    metric_shapes=self._metric_shapes, noise=self._noise,
+                    keys=self._keys, num_fit=self._num_fit)
+        np.savez(fname, info=json.dumps(info), xmat=self._xmat, ymat=self._ymat,
+                 ymean=self._ymean, ystd=self._ystd, log_scale=self._log_scale,
+                 chol=self._chol)
+
+    @classmethod
+    def load(cls, fname):
+        # type: (str) -> GPSurrogate
+        """Load a surrogate model saved by save()."""
+        with np.load(fname) as data:
+            info = json.loads(str(data['info']))
+            ans = GPSurrogate(info['var_list'], info['values_list'], info['metric_shapes'],
+                              noise=info['noise'])
+            ans._keys = [tuple(key) for key in info['keys']]
+            ans._num_fit = info['num_fit']
+            ans._xmat = data['xmat']
+            ans._ymat = data['ymat']
+            ans._ymean = data['ymean']
+            ans._ystd = data['ystd']
+            ans._log_scale = data['log_scale']
+            ans._chol = data['chol']
+            ans._alpha = linalg.cho_solve((ans._chol, True), ans._normalize(ans._ymat))
+        return ans